@@ -1,6 +1,7 @@
 import { OpenRouterHandler } from "../../src/api/providers/openrouter"
 import { OpenAiNativeHandler } from "../../src/api/providers/openai-native"
 import { Anthropic } from "@anthropic-ai/sdk"
+import { performance } from "perf_hooks"
 
 import {
 	parseAssistantMessageV2,
@@ -236,7 +237,9 @@ export async function runSingleEvaluation(input: TestInput): Promise<TestResult>
 		}
 
 		// process the assistant message into its constituent tool calls & text blocks
+		const parseStart = performance.now()
 		const assistantContentBlocks: AssistantMessageContent[] = parseAssistantMessage(streamResult.assistantMessage)
+		const parseTimeMs = performance.now() - parseStart
 
 		const detectedToolCalls: ExtractedToolCall[] = []
 
@@ -255,6 +258,7 @@ export async function runSingleEvaluation(input: TestInput): Promise<TestResult>
 				success: false,
 				streamResult: streamResult,
 				toolCalls: detectedToolCalls,
+				parseTimeMs: parseTimeMs,
 				error: "no_tool_calls",
 			}
 		}
@@ -265,6 +269,7 @@ export async function runSingleEvaluation(input: TestInput): Promise<TestResult>
 				success: false,
 				streamResult: streamResult,
 				toolCalls: detectedToolCalls,
+				parseTimeMs: parseTimeMs,
 				error: "multi_tool_calls",
 			}
 		}
@@ -275,6 +280,7 @@ export async function runSingleEvaluation(input: TestInput): Promise<TestResult>
 				success: false,
 				streamResult: streamResult,
 				toolCalls: detectedToolCalls,
+				parseTimeMs: parseTimeMs,
 				error: "wrong_tool_call",
 			}
 		}
@@ -288,6 +294,7 @@ export async function runSingleEvaluation(input: TestInput): Promise<TestResult>
 				success: false,
 				streamResult: streamResult,
 				toolCalls: detectedToolCalls,
+				parseTimeMs: parseTimeMs,
 				error: "tool_call_params_undefined",
 			}
 		}
@@ -313,6 +320,7 @@ export async function runSingleEvaluation(input: TestInput): Promise<TestResult>
 				success: false,
 				streamResult: streamResult,
 				toolCalls: detectedToolCalls,
+				parseTimeMs: parseTimeMs,
 				error: "wrong_file_edited",
 			}
 		}
@@ -320,6 +328,7 @@ export async function runSingleEvaluation(input: TestInput): Promise<TestResult>
 		// checking if the diff edit succeeds, if it failed it will throw an error
 		let diffSuccess = true
 		let replacementData: any = undefined
+		const applyStart = performance.now()
 		try {
 			const result = await constructNewFileContent(diffToolContent, originalFile, true)
 			
@@ -332,6 +341,8 @@ export async function runSingleEvaluation(input: TestInput): Promise<TestResult>
 			diffSuccess = false
 			log(input.isVerbose, `ERROR: ${error}`)
 		}
+		// Includes the time to throw on failure, which is when fallback matching costs the most
+		const applyTimeMs = performance.now() - applyStart
 
 		return {
 			success: true,
@@ -340,6 +351,8 @@ export async function runSingleEvaluation(input: TestInput): Promise<TestResult>
 			diffEdit: diffToolContent,
 			diffEditSuccess: diffSuccess,
 			replacementData: replacementData,
+			parseTimeMs: parseTimeMs,
+			applyTimeMs: applyTimeMs,
 		}
 	} catch (error: any) {
 		return {
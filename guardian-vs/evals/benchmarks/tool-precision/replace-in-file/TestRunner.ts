@@ -11,6 +11,7 @@ import { formatResponse, log } from "./helpers"
 import { Anthropic } from "@anthropic-ai/sdk"
 import * as fs from "fs"
 import * as path from "path"
+import { performance } from "perf_hooks"
 import { Command } from "commander"
 import { InputMessage, ProcessedTestCase, TestCase, TestConfig, SystemPromptDetails, ConstructSystemPromptFn } from "./types"
 import { loadOpenRouterModelData, EvalOpenRouterModelInfo } from "./openRouterModelsHelper" // Added import
@@ -259,7 +260,10 @@ class NodeTestRunner {
 				// Use original model output (since we're replaying)
 				raw_model_output: originalResult.raw_model_output,
 				file_edited_hash: fileEditedHash || originalResult.file_edited_hash,
-				parsed_tool_call_json: replayResult.toolCalls ? JSON.stringify(replayResult.toolCalls) : originalResult.parsed_tool_call_json
+				parsed_tool_call_json: replayResult.toolCalls ? JSON.stringify(replayResult.toolCalls) : originalResult.parsed_tool_call_json,
+				// Parsing and applying did run again, so these are measured for the replay
+				parse_time_ms: replayResult.parseTimeMs,
+				apply_time_ms: replayResult.applyTimeMs
 			};
 
 			await insertResult(resultInput);
@@ -333,7 +337,9 @@ class NodeTestRunner {
 				completion_tokens: result.streamResult?.usage?.outputTokens,
 				raw_model_output: result.streamResult?.assistantMessage,
 				file_edited_hash: fileEditedHash,
-				parsed_tool_call_json: result.toolCalls ? JSON.stringify(result.toolCalls) : undefined
+				parsed_tool_call_json: result.toolCalls ? JSON.stringify(result.toolCalls) : undefined,
+				parse_time_ms: result.parseTimeMs,
+				apply_time_ms: result.applyTimeMs
 			};
 
 			await insertResult(resultInput);
@@ -563,6 +569,8 @@ class NodeTestRunner {
 				run_id: this.currentRunId,
 				case_id: newCaseId,
 				processing_functions_hash: this.processingFunctionsHash,
+				// The original apply time belongs to the original algorithm; only re-applied attempts get one
+				apply_time_ms: undefined,
 			}
 			delete (newResultInput as any).result_id
 
@@ -580,6 +588,7 @@ class NodeTestRunner {
 
 					if (originalFile && diffContent) {
 						let diffSuccess = false
+						const applyStart = performance.now()
 						try {
 							await constructNewFileContent(diffContent, originalFile.content, true)
 							diffSuccess = true
@@ -588,6 +597,7 @@ class NodeTestRunner {
 							diffSuccess = false
 							log(isVerbose, `  [FAIL] Replay for task ${originalCase.task_id}: New diff algorithm failed.`)
 						}
+						newResultInput.apply_time_ms = performance.now() - applyStart
 						newResultInput.succeeded = diffSuccess
 						newResultInput.error_enum = diffSuccess ? undefined : 3 // 3 = diff_edit_error
 					} else {
@@ -934,6 +944,8 @@ async function main() {
 		.option("-n, --valid-attempts-per-case <number>", "Number of valid attempts per test case per model (will retry until this many valid attempts are collected)", "1")
 		.option("--max-attempts-per-case <number>", "Maximum total attempts per test case (default: 10x valid attempts)")
 		.option("--max-cases <number>", "Maximum number of test cases to run (limits total cases loaded)")
+		.option("--case-list <path>", "JSON case list (e.g. from dashboard/case_subset.py); only these test IDs are run")
+		.option("--attempt-plan <path>", "JSON per-case valid attempts (from dashboard/attempt_planner.py); overrides --valid-attempts-per-case where listed")
 		.option("--parsing-function <name>", "The parsing function to use", "parseAssistantMessageV2")
 		.option("--diff-edit-function <name>", "The diff editing function to use", "diff-06-26-25")
 		.option("--thinking-budget <tokens>", "Set the thinking tokens budget", "0")
@@ -992,6 +1004,18 @@ async function main() {
 
 		const runner = new NodeTestRunner(options.replay, options.provider)
 		let allLoadedTestCases = runner.loadTestCases(testPath, isVerbose) // Pass isVerbose
+
+		// Restrict to a representative subset, if one was given
+		if (options.caseList) {
+			const caseList = JSON.parse(fs.readFileSync(options.caseList, "utf8"))
+			const wantedIds = new Set<string>(Array.isArray(caseList) ? caseList : caseList.task_ids)
+			const missingIds = Array.from(wantedIds).filter((id) => !allLoadedTestCases.some((tc) => tc.test_id === id))
+			allLoadedTestCases = allLoadedTestCases.filter((tc) => wantedIds.has(tc.test_id))
+			log(isVerbose, `-Case list ${options.caseList}: running ${allLoadedTestCases.length} of ${wantedIds.size} listed cases.`)
+			if (missingIds.length > 0) {
+				console.warn(`Warning: ${missingIds.length} case(s) from ${options.caseList} not found in ${testPath}: ${missingIds.join(", ")}`)
+			}
+		}
 		
 		const allProcessedTestCasesGlobal: ProcessedTestCase[] = allLoadedTestCases.map((tc) => ({
 			...tc,
@@ -1062,9 +1086,18 @@ async function main() {
 		}));
 
 		// Initialize ONE database run for ALL models using the commonly eligible cases
-		const runDescription = `Models: ${modelIds.join(', ')}, Common Cases: ${processedEligibleCasesForRun.length}, Valid attempts per case: ${validAttemptsPerCase}`;
+		const runDescription = `Models: ${modelIds.join(', ')}, Common Cases: ${processedEligibleCasesForRun.length}, Valid attempts per case: ${options.attemptPlan ? `planned (${path.basename(options.attemptPlan)})` : validAttemptsPerCase}`;
 		await runner.initializeMultiModelRun(processedEligibleCasesForRun, options.systemPromptName, options.parsingFunction, options.diffEditFunction, runDescription, isVerbose);
 
+		// Per-case valid attempts: from the attempt plan if given, otherwise the global setting
+		const attemptPlan: Record<string, Record<string, number>> = options.attemptPlan
+			? JSON.parse(fs.readFileSync(options.attemptPlan, "utf8")).attempts
+			: {}
+		const plannedAttempts = (modelId: string, testId: string): number => attemptPlan[modelId]?.[testId] ?? validAttemptsPerCase
+		if (options.attemptPlan) {
+			log(isVerbose, `-Using attempt plan ${options.attemptPlan} (cases not in the plan get ${validAttemptsPerCase} valid attempts)`)
+		}
+
 		// Create a global task queue
 		const globalTaskQueue: EvaluationTask[] = modelIds.flatMap(modelId => 
 			processedEligibleCasesForRun.map(testCase => ({
@@ -1073,8 +1106,10 @@ async function main() {
 				testConfig: {
 					model_id: modelId,
 					system_prompt_name: options.systemPromptName,
-					number_of_runs: validAttemptsPerCase,
-					max_attempts_per_case: maxAttemptsPerCase,
+					number_of_runs: plannedAttempts(modelId, testCase.test_id),
+					max_attempts_per_case: options.maxAttemptsPerCase
+						? maxAttemptsPerCase
+						: plannedAttempts(modelId, testCase.test_id) * 10,
 					parsing_function: options.parsingFunction,
 					diff_edit_function: options.diffEditFunction,
 					thinking_tokens_budget: parseInt(options.thinkingBudget, 10),
@@ -1101,7 +1136,7 @@ async function main() {
 			for (const task of remainingTasks) {
 				if (batch.length >= maxConcurrency) break;
 				const taskId = `${task.modelId}-${task.testCase.test_id}`;
-				if ((taskStates[taskId].valid + taskStates[taskId].pending) < validAttemptsPerCase) {
+				if ((taskStates[taskId].valid + taskStates[taskId].pending) < task.testConfig.number_of_runs) {
 					batch.push(task);
 					taskStates[taskId].pending++;
 				}
@@ -1132,7 +1167,7 @@ async function main() {
 
 				if (runner.isValidAttempt(result)) {
 					taskStates[taskId].valid++;
-					log(isVerbose, `  ✓ Valid attempt ${taskStates[taskId].valid}/${validAttemptsPerCase} for ${result.test_id} with ${result.modelId} completed (${result.success ? 'SUCCESS' : 'FAILED'})`);
+					log(isVerbose, `  ✓ Valid attempt ${taskStates[taskId].valid}/${plannedAttempts(result.modelId, result.test_id)} for ${result.test_id} with ${result.modelId} completed (${result.success ? 'SUCCESS' : 'FAILED'})`);
 				} else {
 					log(isVerbose, `  ✗ Invalid attempt for ${result.test_id} with ${result.modelId} (error: ${result.error || 'unknown'})`);
 				}
@@ -1146,7 +1181,7 @@ async function main() {
 					log(isVerbose, `  ⚠️ Reached maximum attempts for ${task.testCase.test_id} with ${task.modelId}.`);
 					return false;
 				}
-				return taskStates[taskId].valid < validAttemptsPerCase;
+				return taskStates[taskId].valid < task.testConfig.number_of_runs;
 			});
 
 			const batchCost = batchResults.reduce((total, result) => total + (result.streamResult?.usage?.totalCost || 0), 0);
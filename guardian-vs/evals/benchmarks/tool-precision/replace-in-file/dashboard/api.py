@@ -0,0 +1,298 @@
+"""
+Read-only JSON HTTP API over evals.db aggregates, for tooling that shouldn't scrape the dashboard.
+
+Answers come from the same rollup tables the dashboard pages use (rollups.py). Every
+response carries an ETag derived from the database version (size and mtime of evals.db
+and its WAL file), so a client polling with If-None-Match gets a 304 without a single
+query while nothing has been written. Bodies are kept in an in-process LRU cache that
+is invalidated when the version changes.
+
+Endpoints:
+    GET /runs                                   runs, newest first
+    GET /runs/<run_id>/models                   per-model attempts, success rate, cost and latency
+    GET /runs/<run_id>/percentiles?q=50,95,99   per-model round-trip percentiles (valid attempts)
+    GET /cases?run_id=<run_id>&limit=50         case health, least healthy first (all runs if no run_id)
+
+Usage (from the dashboard directory):
+    python api.py --port 8765
+    curl -i localhost:8765/runs/<run_id>/models
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+import traceback
+import threading
+import collections
+import pandas as pd
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils import get_database_path
+from rollups import refresh_rollups, histogram_quantiles
+
+DEFAULT_PERCENTILES = [50, 90, 95, 99]
+MAX_CASES = 1000
+
+class NotFound(Exception):
+    pass
+
+class BadRequest(Exception):
+    pass
+
+def log(message):
+    print(message, file=sys.stderr)
+
+def database_version(db_path):
+    """Changes whenever anything is committed: WAL writes touch evals.db-wal, checkpoints touch evals.db"""
+    parts = []
+    for path in (db_path, db_path + '-wal'):
+        try:
+            stat = os.stat(path)
+            parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+        except FileNotFoundError:
+            parts.append('-')
+    return '|'.join(parts)
+
+def records(frame):
+    """DataFrame -> list of dicts with NaN as null"""
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+# --- Queries ---
+
+def query_runs(conn):
+    runs_df = pd.read_sql_query("""
+    SELECT r.run_id, r.description, r.created_at, r.system_prompt_hash, ru.num_results
+    FROM runs r
+    LEFT JOIN rollup_runs ru ON r.run_id = ru.run_id
+    ORDER BY r.created_at DESC
+    """, conn)
+    return records(runs_df)
+
+def require_run(conn, run_id):
+    if conn.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone() is None:
+        raise NotFound(f"Run {run_id} not found")
+
+def query_model_summary(conn, run_id):
+    require_run(conn, run_id)
+    summary_df = pd.read_sql_query("""
+    SELECT
+        model_id,
+        SUM(attempts) AS attempts,
+        SUM(CASE WHEN is_valid = 1 THEN attempts ELSE 0 END) AS valid_attempts,
+        SUM(CASE WHEN is_valid = 1 THEN successes ELSE 0 END) AS successes,
+        SUM(total_cost_usd) AS total_cost_usd,
+        SUM(CASE WHEN is_valid = 1 THEN total_round_trip_ms ELSE 0 END) AS valid_round_trip_ms
+    FROM result_rollups
+    WHERE run_id = ?
+    GROUP BY model_id
+    """, conn, params=(run_id,))
+    valid = summary_df['valid_attempts'].where(summary_df['valid_attempts'] > 0)
+    summary_df['success_rate'] = summary_df['successes'] / valid
+    summary_df['avg_round_trip_ms'] = summary_df['valid_round_trip_ms'] / valid
+    summary_df['cost_per_success'] = summary_df['total_cost_usd'] / summary_df['successes'].where(summary_df['successes'] > 0)
+    summary_df = summary_df.drop(columns='valid_round_trip_ms').sort_values('success_rate', ascending=False)
+    return records(summary_df)
+
+def query_percentiles(conn, run_id, percentiles):
+    require_run(conn, run_id)
+    histogram_df = pd.read_sql_query("""
+    SELECT model_id, bucket, SUM(attempts) AS attempts
+    FROM latency_rollups
+    WHERE run_id = ?
+    GROUP BY model_id, bucket
+    """, conn, params=(run_id,))
+    if histogram_df.empty:
+        return []
+    percentiles_df = pd.DataFrame({
+        f"p{percentile:g}_round_trip_ms": histogram_quantiles(histogram_df, ['model_id'], percentile / 100.0)
+        for percentile in percentiles
+    })
+    percentiles_df['valid_attempts'] = histogram_df.groupby('model_id')['attempts'].sum()
+    return records(percentiles_df.reset_index())
+
+def query_case_health(conn, run_id, limit):
+    """Same measures as the Case Health Inspector page, from the rollups"""
+    where, params = "", []
+    if run_id:
+        require_run(conn, run_id)
+        where, params = "WHERE run_id = ?", [run_id]
+    health_df = pd.read_sql_query(f"""
+    SELECT
+        task_id,
+        COUNT(DISTINCT run_id) AS num_benchmark_runs,
+        SUM(attempts) AS total_attempts,
+        SUM(CASE WHEN is_valid = 1 THEN attempts ELSE 0 END) AS total_valid_attempts,
+        SUM(CASE WHEN is_valid = 1 THEN successes ELSE 0 END) AS total_successful_valid_attempts
+    FROM result_rollups
+    {where}
+    GROUP BY task_id
+    """, conn, params=params)
+    health_df['percent_valid_attempts'] = health_df['total_valid_attempts'] * 100.0 / health_df['total_attempts']
+    health_df['success_rate_on_valid'] = (
+        health_df['total_successful_valid_attempts'] * 100.0 / health_df['total_valid_attempts'].where(health_df['total_valid_attempts'] > 0)
+    ).fillna(0.0)
+    health_df = health_df.sort_values(['percent_valid_attempts', 'success_rate_on_valid']).head(limit)
+    return records(health_df.drop(columns='total_successful_valid_attempts'))
+
+def parse_percentiles(values):
+    if not values:
+        return DEFAULT_PERCENTILES
+    try:
+        percentiles = [float(value) for value in ','.join(values).split(',') if value]
+    except ValueError:
+        raise BadRequest("q must be a comma-separated list of numbers")
+    if not percentiles or any(not 0 < percentile <= 100 for percentile in percentiles):
+        raise BadRequest("q values must be in (0, 100]")
+    return percentiles
+
+def route(conn, path, params):
+    """Dispatch a GET path to its query; returns a JSON-serializable payload"""
+    parts = [part for part in path.split('/') if part]
+    if parts == ['runs']:
+        return query_runs(conn)
+    if len(parts) == 3 and parts[0] == 'runs' and parts[2] == 'models':
+        return query_model_summary(conn, parts[1])
+    if len(parts) == 3 and parts[0] == 'runs' and parts[2] == 'percentiles':
+        return query_percentiles(conn, parts[1], parse_percentiles(params.get('q')))
+    if parts == ['cases']:
+        try:
+            limit = min(int(params.get('limit', ['50'])[0]), MAX_CASES)
+        except ValueError:
+            raise BadRequest("limit must be an integer")
+        if limit < 1:
+            raise BadRequest("limit must be at least 1")
+        return query_case_health(conn, params.get('run_id', [None])[0], limit)
+    raise NotFound(f"No endpoint for {path}")
+
+# --- Caching ---
+
+class ResponseCache:
+    """LRU of encoded response bodies; entries from an older database version are misses"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, version):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, version, body):
+        with self.lock:
+            self.entries[key] = (version, body)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, db_path, cache_entries):
+        super().__init__(address, ApiHandler)
+        self.db_path = db_path
+        self.cache = ResponseCache(cache_entries)
+        self.local = threading.local()
+        self.refresh_lock = threading.Lock()
+        self.refreshed_version = None
+
+    def connection(self):
+        """One connection per handler thread"""
+        if not hasattr(self.local, 'conn'):
+            self.local.conn = sqlite3.connect(self.db_path)
+        return self.local.conn
+
+    def current_version(self):
+        """Database version, after bringing the rollups up to date for it"""
+        version = database_version(self.db_path)
+        if version == self.refreshed_version:
+            return version
+        with self.refresh_lock:
+            version = database_version(self.db_path)
+            if version != self.refreshed_version:
+                refresh_rollups(self.connection())
+                # Refreshing may itself write; the version after it is the one responses are keyed on
+                version = database_version(self.db_path)
+                self.refreshed_version = version
+        return version
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = 'EvalsAPI/1.0'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        key = url.path + ('?' + url.query if url.query else '')
+        try:
+            version = self.server.current_version()
+        except sqlite3.Error as error:
+            return self.send_json(503, {'error': f"database unavailable: {error}"})
+        etag = '"' + hashlib.sha1(f"{version}|{key}".encode('utf-8')).hexdigest()[:20] + '"'
+
+        if etag in (self.headers.get('If-None-Match') or ''):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        body = self.server.cache.get(key, version)
+        if body is None:
+            try:
+                payload = route(self.server.connection(), url.path, parse_qs(url.query))
+            except NotFound as error:
+                return self.send_json(404, {'error': str(error)})
+            except BadRequest as error:
+                return self.send_json(400, {'error': str(error)})
+            except (sqlite3.Error, pd.errors.DatabaseError) as error:
+                return self.send_json(503, {'error': f"database unavailable: {error}"})
+            except Exception as error:
+                log(traceback.format_exc().rstrip())
+                return self.send_json(500, {'error': f"internal error: {type(error).__name__}"})
+            body = json.dumps(payload, default=str).encode('utf-8')
+            self.server.cache.put(key, version, body)
+        self.send_body(200, body, etag)
+
+    def send_json(self, status, payload):
+        self.send_body(status, json.dumps(payload).encode('utf-8'))
+
+    def send_body(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+            # Clients may keep the body but must revalidate; a 304 costs nothing here
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log(f"{self.address_string()} {format % args}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve evals.db aggregates as JSON')
+    parser.add_argument('--db', default=get_database_path(), help='Path to evals.db (default: %(default)s)')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=8765, help='Port (default: %(default)s)')
+    parser.add_argument('--cache-entries', type=int, default=256, help='Responses kept in memory (default: %(default)s)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        raise SystemExit(f"Database not found: {args.db}")
+    server = ApiServer((args.host, args.port), os.path.abspath(args.db), args.cache_entries)
+    log(f"Serving {args.db} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Compare diff-apply algorithms on success and execution time.
+
+results.apply_time_ms and parse_time_ms are written by the benchmark (ClineWrapper.ts,
+TestRunner.ts replays and replay.py via replay-worker.ts). Only attempts that reached
+the apply step count: error_enum NULL (applied) or 3 (diff_edit_error). Older results
+have no timing; they still count towards success rates.
+
+load_apply_timings_sample and the *_sampled summaries are the approximate-mode
+counterparts, estimating the same numbers from a stratified sample (sampling.py).
+"""
+
+import numpy as np
+import pandas as pd
+from utils import get_database_connection
+from frame_cache import cached_frame
+from sampling import strata_cte, SAMPLED_FROM, add_weights, weighted_rates, weighted_quantiles
+
+# Attempts that got as far as applying the diff
+APPLIED_FILTER = "(res.error_enum IS NULL OR res.error_enum = 3)"
+
+# Line counts are computed once per distinct file, not once per attempt
+FILE_SIZES_CTE = """
+    file_sizes AS (
+        SELECT f.hash, f.tokens, LENGTH(f.content) - LENGTH(REPLACE(f.content, char(10), '')) + 1 AS file_lines
+        FROM files f
+        WHERE f.hash IN (SELECT DISTINCT file_hash FROM cases WHERE run_id IN ({placeholders}))
+    )"""
+
+TIMING_COLUMNS = """
+        res.processing_functions_hash,
+        COALESCE(pf.name, substr(res.processing_functions_hash, 1, 12)) AS processing_functions_name,
+        res.model_id,
+        res.succeeded,
+        res.apply_time_ms,
+        res.parse_time_ms,
+        fs.file_lines,
+        fs.tokens AS file_tokens"""
+
+def categorize(timings_df):
+    for column in ('processing_functions_hash', 'processing_functions_name', 'model_id'):
+        timings_df[column] = timings_df[column].astype('category')
+    return timings_df
+
+def has_timing_columns():
+    conn = get_database_connection()
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(results)").fetchall()}
+    return {'apply_time_ms', 'parse_time_ms'} <= columns
+
+@cached_frame
+def load_apply_timings(run_ids):
+    """One row per applied attempt: processing functions, outcome, timings and original file size"""
+    conn = get_database_connection()
+    placeholders = ', '.join('?' for _ in run_ids)
+    query = f"""
+    WITH {FILE_SIZES_CTE.format(placeholders=placeholders)}
+    SELECT {TIMING_COLUMNS}
+    FROM results res
+    JOIN cases c ON res.case_id = c.case_id
+    LEFT JOIN processing_functions pf ON res.processing_functions_hash = pf.hash
+    LEFT JOIN file_sizes fs ON c.file_hash = fs.hash
+    WHERE res.run_id IN ({placeholders}) AND {APPLIED_FILTER}
+    """
+    return categorize(pd.read_sql_query(query, conn, params=list(run_ids) * 2))
+
+@cached_frame
+def load_apply_timings_sample(run_ids, fraction, rollup_version):
+    """load_apply_timings over a stratified sample, with a weight per attempt; rollup_version keys the cache"""
+    conn = get_database_connection()
+    placeholders = ', '.join('?' for _ in run_ids)
+    query = f"""
+    WITH {strata_cte(placeholders)},
+    {FILE_SIZES_CTE.format(placeholders=placeholders)}
+    SELECT {TIMING_COLUMNS},
+        s.threshold,
+        {APPLIED_FILTER} AS applied
+    {SAMPLED_FROM}
+    LEFT JOIN processing_functions pf ON res.processing_functions_hash = pf.hash
+    LEFT JOIN file_sizes fs ON c.file_hash = fs.hash
+    WHERE c.run_id IN ({placeholders})
+    """
+    sample_df = add_weights(pd.read_sql_query(query, conn, params=[fraction, *run_ids, *run_ids, *run_ids]))
+    applied = sample_df[sample_df['applied'] == 1].drop(columns='applied')
+    return categorize(applied.reset_index(drop=True))
+
+def summarize_algorithms(timings_df):
+    """Per processing_functions_hash: apply success rate and apply/parse time percentiles"""
+    grouped = timings_df.groupby('processing_functions_hash', observed=True)
+    summary = grouped.agg(
+        processing_functions_name=('processing_functions_name', 'first'),
+        applied_attempts=('succeeded', 'size'),
+        apply_success_rate=('succeeded', 'mean'),
+        timed_attempts=('apply_time_ms', 'count'),
+        parse_p50_ms=('parse_time_ms', 'median'),
+    )
+    quantiles = grouped['apply_time_ms'].quantile([0.5, 0.9, 0.99]).unstack()
+    quantiles.columns = ['apply_p50_ms', 'apply_p90_ms', 'apply_p99_ms']
+    # Failures are where fallback matching runs longest, so report them separately
+    failed = timings_df[timings_df['succeeded'] == 0]
+    summary['failed_apply_p90_ms'] = failed.groupby('processing_functions_hash', observed=True)['apply_time_ms'].quantile(0.9)
+    return summary.join(quantiles).reset_index().sort_values('apply_success_rate', ascending=False)
+
+def size_bin_edges(file_lines, num_bins):
+    """Log-spaced bin edges over the observed file sizes"""
+    lines = file_lines[~np.isnan(file_lines)]
+    if not len(lines):
+        return np.array([])
+    low, high = max(lines.min(), 1.0), max(lines.max(), 2.0)
+    return np.unique(np.round(np.geomspace(low, high * 1.0001, num_bins + 1)))
+
+def assign_size_bins(timings_df, num_bins):
+    """Rows with a known file size and their size_bin; returns (binned rows, bin edges)"""
+    file_lines = timings_df['file_lines'].to_numpy(dtype=float)
+    edges = size_bin_edges(file_lines, num_bins)
+    if len(edges) < 2:
+        return timings_df.iloc[:0], edges
+    bins = np.clip(np.searchsorted(edges, file_lines, side='right') - 1, 0, len(edges) - 2)
+    binned = timings_df.assign(size_bin=np.where(np.isnan(file_lines), -1, bins))
+    return binned[binned['size_bin'] >= 0], edges
+
+def by_file_size(timings_df, num_bins=8):
+    """Per (algorithm, file-size bin): success rate and apply-time percentiles"""
+    binned, edges = assign_size_bins(timings_df, num_bins)
+    if binned.empty:
+        return pd.DataFrame()
+
+    grouped = binned.groupby(['processing_functions_hash', 'size_bin'], observed=True)
+    summary = grouped.agg(
+        processing_functions_name=('processing_functions_name', 'first'),
+        file_lines=('file_lines', 'median'),
+        attempts=('succeeded', 'size'),
+        apply_success_rate=('succeeded', 'mean'),
+    )
+    quantiles = grouped['apply_time_ms'].quantile([0.5, 0.95]).unstack()
+    quantiles.columns = ['apply_p50_ms', 'apply_p95_ms']
+    summary = summary.join(quantiles).reset_index()
+    summary['size_range'] = [f"{edges[b]:,.0f}–{edges[b + 1]:,.0f} lines" for b in summary['size_bin']]
+    return summary
+
+def algorithm_names(timings_df):
+    return timings_df.groupby('processing_functions_hash', observed=True)['processing_functions_name'].first()
+
+def summarize_algorithms_sampled(sample_df):
+    """summarize_algorithms estimated from a weighted sample, with 95% bounds.
+
+    Attempt counts are estimates for the full runs; sampled_attempts is how many were read.
+    """
+    keys = ['processing_functions_hash']
+    rates = weighted_rates(sample_df, keys, 'succeeded')
+    timed = weighted_rates(sample_df.assign(timed=sample_df['apply_time_ms'].notna()), keys, 'timed')
+    apply = weighted_quantiles(sample_df, keys, 'apply_time_ms', [0.5, 0.9, 0.99])
+    parse = weighted_quantiles(sample_df, keys, 'parse_time_ms', [0.5])
+    failed = weighted_quantiles(sample_df[sample_df['succeeded'] == 0], keys, 'apply_time_ms', [0.9])
+
+    summary = pd.DataFrame({
+        'processing_functions_hash': rates['processing_functions_hash'],
+        'processing_functions_name': rates['processing_functions_hash'].map(algorithm_names(sample_df)),
+        'applied_attempts': rates['estimated_attempts'],
+        'sampled_attempts': rates['sampled_attempts'],
+        'apply_success_rate': rates['estimate'],
+        'apply_success_margin': rates['margin'],
+        'timed_attempts': timed['estimated_attempts'] * timed['estimate'],
+    })
+    summary = summary.merge(parse[keys + ['p50']].rename(columns={'p50': 'parse_p50_ms'}), on=keys, how='left')
+    summary = summary.merge(failed[keys + ['p90']].rename(columns={'p90': 'failed_apply_p90_ms'}), on=keys, how='left')
+    summary = summary.merge(apply.rename(columns=lambda column: column if column in keys else f"apply_{column}_ms"), on=keys, how='left')
+    summary = summary.drop(columns=['apply_p50_low_ms', 'apply_p50_high_ms'])
+    return summary.sort_values('apply_success_rate', ascending=False)
+
+def by_file_size_sampled(sample_df, num_bins=8):
+    """by_file_size estimated from a weighted sample; success rates get a 95% margin"""
+    binned, edges = assign_size_bins(sample_df, num_bins)
+    if binned.empty:
+        return pd.DataFrame()
+
+    keys = ['processing_functions_hash', 'size_bin']
+    rates = weighted_rates(binned, keys, 'succeeded')
+    lines = weighted_quantiles(binned, keys, 'file_lines', [0.5])
+    apply = weighted_quantiles(binned, keys, 'apply_time_ms', [0.5, 0.95])
+    summary = rates.rename(columns={
+        'estimated_attempts': 'attempts', 'estimate': 'apply_success_rate', 'margin': 'apply_success_margin'
+    })
+    summary['processing_functions_name'] = summary['processing_functions_hash'].map(algorithm_names(binned))
+    summary['file_lines'] = lines['p50']
+    summary['apply_p50_ms'] = apply['p50']
+    summary['apply_p95_ms'] = apply['p95']
+    summary['size_range'] = [f"{edges[b]:,.0f}–{edges[b + 1]:,.0f} lines" for b in summary['size_bin']]
+    return summary
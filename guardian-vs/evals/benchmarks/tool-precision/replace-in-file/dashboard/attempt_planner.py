@@ -0,0 +1,175 @@
+"""
+Plan valid attempts per (case, model) from past outcome variance.
+
+A model's benchmark score is the mean of its per-case success rates, so the noise in
+that score is sum(p_t * (1 - p_t) / n_t) / T^2 over cases t. Cases a model always
+passes or always fails contribute almost nothing and need a single attempt; cases that
+flip need several. For a target confidence-interval width this allocates attempts
+Neyman-style (n_t proportional to the case's standard deviation over the square root
+of its expected API calls per valid attempt), which minimizes total calls.
+
+The plan is a JSON file for `TestRunner.ts --attempt-plan`, with the expected number
+of API calls, runtime and cost next to the uniform `--valid-attempts-per-case` that
+would reach the same precision.
+
+Usage (from the dashboard directory):
+    python attempt_planner.py --ci-width 0.05 --output ../attempt-plan.json
+    python attempt_planner.py --runs <run_id> --models anthropic/claude-sonnet-4 --ci-width 0.08
+"""
+
+import sys
+import json
+import math
+import sqlite3
+import argparse
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from utils import get_database_path
+
+# Two-sided normal quantile for the 95% interval
+Z_95 = 1.959964
+
+def log(message):
+    print(message, file=sys.stderr)
+
+def load_cell_history(conn, run_ids, model_ids):
+    """Per (task_id, model_id): total and valid attempts, valid successes, mean latency and cost per attempt"""
+    where = []
+    params = []
+    if run_ids:
+        where.append(f"c.run_id IN ({', '.join('?' for _ in run_ids)})")
+        params += run_ids
+    if model_ids:
+        where.append(f"res.model_id IN ({', '.join('?' for _ in model_ids)})")
+        params += model_ids
+    query = f"""
+    SELECT
+        c.task_id,
+        res.model_id,
+        COUNT(*) AS attempts,
+        SUM(CASE WHEN res.error_enum NOT IN (1, 6, 7) OR res.error_enum IS NULL THEN 1 ELSE 0 END) AS valid_attempts,
+        SUM(CASE WHEN (res.error_enum NOT IN (1, 6, 7) OR res.error_enum IS NULL) AND res.succeeded THEN 1 ELSE 0 END) AS successes,
+        AVG(res.time_round_trip_ms) AS latency_ms,
+        AVG(res.cost_usd) AS cost_usd
+    FROM results res
+    JOIN cases c ON res.case_id = c.case_id
+    {'WHERE ' + ' AND '.join(where) if where else ''}
+    GROUP BY c.task_id, res.model_id
+    """
+    return pd.read_sql_query(query, conn, params=params)
+
+def plan_attempts(cells_df, ci_width, min_attempts=1, max_attempts=20):
+    """Add `planned_attempts` (valid attempts) and `expected_calls` columns to the per-cell history"""
+    cells_df = cells_df.copy()
+    # Jeffreys-smoothed success probability, so 3/3 is not treated as certain
+    p = (cells_df['successes'] + 0.5) / (cells_df['valid_attempts'] + 1.0)
+    cells_df['variance'] = p * (1 - p)
+    # Expected API calls per valid attempt: TestRunner re-rolls invalid ones
+    valid_share = ((cells_df['valid_attempts'] + 0.5) / (cells_df['attempts'] + 1.0)).clip(lower=0.05)
+    cells_df['calls_per_valid'] = 1.0 / valid_share
+
+    target_variance = (ci_width / (2 * Z_95)) ** 2
+    cells_df['planned_attempts'] = min_attempts
+    for model_id, model_cells in cells_df.groupby('model_id'):
+        num_cases = len(model_cells)
+        sigma = np.sqrt(model_cells['variance'].to_numpy())
+        cost = model_cells['calls_per_valid'].to_numpy()
+        # Neyman allocation: minimize sum(n_t * c_t) s.t. sum(sigma_t^2 / n_t) <= T^2 * V
+        scale = (sigma * np.sqrt(cost)).sum() / (num_cases ** 2 * target_variance)
+        planned = np.clip(np.floor(sigma / np.sqrt(cost) * scale), min_attempts, max_attempts)
+        # Round up one attempt at a time where it buys the most variance per API call
+        while (sigma ** 2 / planned).sum() > num_cases ** 2 * target_variance:
+            gain = np.where(planned < max_attempts, sigma ** 2 / (planned * (planned + 1)) / cost, -1.0)
+            best = int(np.argmax(gain))
+            if gain[best] < 0:
+                break
+            planned[best] += 1
+        cells_df.loc[model_cells.index, 'planned_attempts'] = planned.astype(int)
+
+    cells_df['expected_calls'] = cells_df['planned_attempts'] * cells_df['calls_per_valid']
+    return cells_df
+
+def uniform_attempts(model_cells, ci_width):
+    """Single --valid-attempts-per-case that reaches the same precision for one model"""
+    target_variance = (ci_width / (2 * Z_95)) ** 2
+    return max(1, math.ceil(model_cells['variance'].sum() / (len(model_cells) ** 2 * target_variance)))
+
+def summarize_plan(cells_df, ci_width, max_concurrency):
+    rows = []
+    for model_id, model_cells in cells_df.groupby('model_id'):
+        planned = model_cells['planned_attempts']
+        # Achieved half-width with the (clipped) plan
+        half_width = Z_95 * math.sqrt((model_cells['variance'] / planned).sum()) / len(model_cells)
+        uniform = uniform_attempts(model_cells, ci_width)
+        latency_ms = model_cells['latency_ms'].fillna(model_cells['latency_ms'].mean())
+        cost_usd = model_cells['cost_usd'].fillna(model_cells['cost_usd'].mean()).fillna(0.0)
+        rows.append({
+            'model_id': model_id,
+            'cases': len(model_cells),
+            'planned_valid_attempts': int(planned.sum()),
+            'expected_calls': float(model_cells['expected_calls'].sum()),
+            'uniform_attempts_per_case': uniform,
+            'uniform_expected_calls': float((uniform * model_cells['calls_per_valid']).sum()),
+            'ci_half_width': half_width,
+            'expected_model_hours': float((model_cells['expected_calls'] * latency_ms).sum() / 3.6e6),
+            'expected_cost_usd': float((model_cells['expected_calls'] * cost_usd).sum()),
+        })
+    summary = pd.DataFrame(rows)
+    total_model_hours = summary['expected_model_hours'].sum()
+    # Every model shares one pool of --max-concurrency request slots
+    expected_runtime_hours = total_model_hours / max_concurrency
+    return summary, expected_runtime_hours
+
+def main():
+    parser = argparse.ArgumentParser(description='Plan per-case valid attempts from historical outcome variance')
+    parser.add_argument('--db', default=get_database_path(), help='Path to evals.db (default: %(default)s)')
+    parser.add_argument('--runs', nargs='*', help='Runs to learn from (default: all runs)')
+    parser.add_argument('--models', nargs='*', help='Models to plan for (default: every model in those runs)')
+    parser.add_argument('--ci-width', type=float, default=0.05,
+                        help='Target full width of the 95%% interval on each model\'s success rate (default: %(default)s)')
+    parser.add_argument('--min-attempts', type=int, default=1, help='Fewest valid attempts per case (default: %(default)s)')
+    parser.add_argument('--max-attempts', type=int, default=20, help='Most valid attempts per case (default: %(default)s)')
+    parser.add_argument('--max-concurrency', type=int, default=80,
+                        help='TestRunner --max-concurrency, for the runtime estimate (default: %(default)s)')
+    parser.add_argument('--output', help='Write the plan JSON here (default: stdout)')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    cells_df = load_cell_history(conn, args.runs, args.models)
+    if cells_df.empty:
+        raise SystemExit("No results found for the given runs/models")
+
+    cells_df = plan_attempts(cells_df, args.ci_width, args.min_attempts, args.max_attempts)
+    summary, runtime_hours = summarize_plan(cells_df, args.ci_width, args.max_concurrency)
+
+    log(summary.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    log(f"Expected: {summary['expected_calls'].sum():.0f} API calls "
+        f"(uniform: {summary['uniform_expected_calls'].sum():.0f}), "
+        f"~{runtime_hours * 60:.0f} min at concurrency {args.max_concurrency}, "
+        f"~${summary['expected_cost_usd'].sum():.2f}")
+    if (summary['ci_half_width'] * 2 > args.ci_width + 1e-9).any():
+        log(f"Warning: --max-attempts {args.max_attempts} keeps some models above the target width")
+
+    plan = {
+        'attempts': {
+            model_id: dict(zip(model_cells['task_id'], model_cells['planned_attempts'].astype(int).tolist()))
+            for model_id, model_cells in cells_df.groupby('model_id')
+        },
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'source_runs': args.runs or 'all',
+        'ci_width': args.ci_width,
+        'expected_calls': float(summary['expected_calls'].sum()),
+        'expected_runtime_minutes': runtime_hours * 60,
+        'expected_cost_usd': float(summary['expected_cost_usd'].sum()),
+    }
+    output = json.dumps(plan, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        log(f"Wrote {args.output}")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
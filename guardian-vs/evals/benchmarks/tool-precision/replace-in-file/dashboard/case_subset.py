@@ -0,0 +1,189 @@
+"""
+Pick a small set of task_ids that reproduces the full benchmark's verdict.
+
+Uses the historical case x model success-rate matrix (valid attempts only) over the
+chosen runs. Tasks are added greedily, each time taking the one that brings the
+subset's per-model success rates closest to the full set's while keeping the model
+ranking intact; once both hold, tasks that are no longer needed are dropped again.
+The result is a JSON case list for `TestRunner.ts --case-list`.
+
+Usage (from the dashboard directory):
+    python case_subset.py --output ../case-subset.json
+    python case_subset.py --runs <run_id> <run_id> --tolerance 0.02 --output ../case-subset.json
+"""
+
+import sys
+import json
+import sqlite3
+import argparse
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from utils import get_database_path
+from outcome_matrix import build_outcome_matrix
+
+# Models whose full-set success rates are closer than this are treated as tied
+RANK_TIE_EPSILON = 0.005
+
+def log(message):
+    print(message, file=sys.stderr)
+
+def load_outcomes(conn, run_ids, model_ids):
+    """Valid attempts (task_id, model_id, succeeded, latency, cost) for the given runs and models"""
+    where = ["(res.error_enum NOT IN (1, 6, 7) OR res.error_enum IS NULL)"]
+    params = []
+    if run_ids:
+        where.append(f"c.run_id IN ({', '.join('?' for _ in run_ids)})")
+        params += run_ids
+    if model_ids:
+        where.append(f"res.model_id IN ({', '.join('?' for _ in model_ids)})")
+        params += model_ids
+    query = f"""
+    SELECT c.task_id, res.model_id, res.succeeded, res.time_round_trip_ms, res.cost_usd
+    FROM results res
+    JOIN cases c ON res.case_id = c.case_id
+    WHERE {' AND '.join(where)}
+    """
+    return pd.read_sql_query(query, conn, params=params)
+
+def complete_rate_matrix(matrix):
+    """Dense (tasks x models) success rates, keeping only tasks every model has attempted"""
+    rates = matrix.to_dense(matrix.success_rate())
+    complete = ~np.isnan(rates).any(axis=1)
+    return rates[complete], matrix.task_ids[complete], complete
+
+def ranking_pairs(target):
+    """Model index pairs (i, j) with target[i] clearly above target[j]"""
+    i, j = np.triu_indices(len(target), k=1)
+    gap = target[i] - target[j]
+    keep = np.abs(gap) > RANK_TIE_EPSILON
+    # Orient every pair so that the first model is the better one
+    better = np.where(gap[keep] > 0, i[keep], j[keep])
+    worse = np.where(gap[keep] > 0, j[keep], i[keep])
+    return better, worse
+
+def subset_error(means, target, better, worse):
+    """(max abs success-rate deviation, number of ranking inversions) for rows of candidate means"""
+    deviation = np.abs(means - target).max(axis=-1)
+    inversions = (means[..., better] < means[..., worse]).sum(axis=-1)
+    return deviation, inversions
+
+def select_cases(rates, tolerance, min_cases=1, max_cases=None):
+    """Greedy forward selection, then backward pruning. Returns selected row indices."""
+    num_tasks = rates.shape[0]
+    target = rates.mean(axis=0)
+    better, worse = ranking_pairs(target)
+    max_cases = num_tasks if max_cases is None else min(max_cases, num_tasks)
+
+    selected = []
+    available = np.ones(num_tasks, dtype=bool)
+    sums = np.zeros(rates.shape[1])
+
+    def satisfied(deviation, inversions):
+        return deviation <= tolerance and inversions == 0
+
+    while len(selected) < max_cases:
+        # Evaluate adding every remaining task at once
+        candidate_means = (sums + rates) / (len(selected) + 1)
+        deviation, inversions = subset_error(candidate_means, target, better, worse)
+        # Ranking inversions dominate; deviation breaks ties
+        score = np.where(available, inversions + deviation, np.inf)
+        best = int(np.argmin(score))
+        selected.append(best)
+        available[best] = False
+        sums += rates[best]
+        if len(selected) >= min_cases and satisfied(deviation[best], inversions[best]):
+            break
+
+    # Drop tasks the subset no longer needs, most redundant first
+    pruned = True
+    while pruned and len(selected) > min_cases:
+        pruned = False
+        subset = rates[selected]
+        without = (subset.sum(axis=0) - subset) / (len(selected) - 1)
+        deviation, inversions = subset_error(without, target, better, worse)
+        ok = (deviation <= tolerance) & (inversions == 0)
+        if ok.any():
+            drop = int(np.argmin(np.where(ok, deviation, np.inf)))
+            del selected[drop]
+            pruned = True
+
+    return np.array(selected, dtype=int)
+
+def summarize(rates, selected, model_ids):
+    full = rates.mean(axis=0)
+    subset = rates[selected].mean(axis=0)
+    return pd.DataFrame({
+        'model_id': model_ids,
+        'full_success_rate': full,
+        'subset_success_rate': subset,
+        'delta': subset - full,
+        'full_rank': pd.Series(-full).rank(method='min').astype(int).to_numpy(),
+        'subset_rank': pd.Series(-subset).rank(method='min').astype(int).to_numpy(),
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description='Select a minimal representative subset of benchmark cases')
+    parser.add_argument('--db', default=get_database_path(), help='Path to evals.db (default: %(default)s)')
+    parser.add_argument('--runs', nargs='*', help='Runs to learn from (default: all runs)')
+    parser.add_argument('--models', nargs='*', help='Models to preserve (default: every model in those runs)')
+    parser.add_argument('--tolerance', type=float, default=0.03,
+                        help='Max absolute per-model success-rate difference (default: %(default)s)')
+    parser.add_argument('--min-cases', type=int, default=5, help='Smallest subset to return (default: %(default)s)')
+    parser.add_argument('--max-cases', type=int, help='Give up growing the subset at this size')
+    parser.add_argument('--output', help='Write the case list JSON here (default: stdout)')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    outcomes_df = load_outcomes(conn, args.runs, args.models)
+    if outcomes_df.empty:
+        raise SystemExit("No valid results found for the given runs/models")
+
+    matrix = build_outcome_matrix(outcomes_df)
+    rates, task_ids, complete = complete_rate_matrix(matrix)
+    model_ids = list(matrix.model_ids)
+    log(f"{len(task_ids)} of {matrix.shape[0]} tasks have results for all {len(model_ids)} models")
+    if len(task_ids) == 0:
+        raise SystemExit("No task has results for every model; narrow --models or --runs")
+
+    selected = select_cases(rates, args.tolerance, args.min_cases, args.max_cases)
+    summary = summarize(rates, selected, model_ids)
+    max_deviation = summary['delta'].abs().max()
+    # Same notion of order as the selector: near-ties (within RANK_TIE_EPSILON) may swap
+    better, worse = ranking_pairs(summary['full_success_rate'].to_numpy())
+    _, inversions = subset_error(summary['subset_success_rate'].to_numpy(), summary['full_success_rate'].to_numpy(), better, worse)
+    rank_preserved = inversions == 0
+
+    # Historical cost/time of the chosen tasks, as a share of all complete tasks
+    costs = matrix.to_dense(matrix.total_cost_usd, fill_value=0.0)[complete]
+    attempts = matrix.to_dense(matrix.attempts, fill_value=0.0)[complete]
+    latencies = matrix.to_dense(matrix.median_latency_ms, fill_value=0.0)[complete] * attempts
+    cost_share = costs[selected].sum() / costs.sum() if costs.sum() else len(selected) / len(task_ids)
+    time_share = latencies[selected].sum() / latencies.sum() if latencies.sum() else len(selected) / len(task_ids)
+
+    log(summary.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    log(f"Selected {len(selected)} of {len(task_ids)} tasks "
+        f"(max deviation {max_deviation:.3f}, ranking {'preserved' if rank_preserved else 'NOT preserved'}, "
+        f"~{cost_share:.0%} of the cost, ~{time_share:.0%} of the model time)")
+    if max_deviation > args.tolerance or not rank_preserved:
+        log("Warning: tolerance not reached; the subset is the best found within --max-cases")
+
+    case_list = {
+        'task_ids': sorted(task_ids[selected].tolist()),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'source_runs': args.runs or 'all',
+        'models': model_ids,
+        'tolerance': args.tolerance,
+        'max_deviation': float(max_deviation),
+        'rank_preserved': bool(rank_preserved),
+    }
+    output = json.dumps(case_list, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        log(f"Wrote {args.output}")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
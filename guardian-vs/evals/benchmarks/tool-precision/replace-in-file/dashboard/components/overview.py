@@ -0,0 +1,393 @@
+import streamlit as st
+import pandas as pd
+from data import HISTOGRAM_COLUMNS, SCATTER_COLUMNS, load_metric_histogram, load_result_points
+
+# Plotting libraries are imported inside the render functions that use them, so
+# pages that never draw a chart don't pay for importing plotly.
+
+def get_performance_grade(success_rate):
+    """Get performance grade based on success rate"""
+    if success_rate >= 0.9:
+        return "A+", "excellent"
+    elif success_rate >= 0.8:
+        return "A", "excellent"
+    elif success_rate >= 0.7:
+        return "B+", "good"
+    elif success_rate >= 0.6:
+        return "B", "good"
+    elif success_rate >= 0.5:
+        return "C+", "good"
+    else:
+        return "C", "poor"
+
+def render_hero_section(current_run, model_performance):
+    """Render the hero section with key metrics"""
+    run_title = current_run['description'] if current_run['description'] else f"Run {current_run['run_id'][:8]}..."
+    st.markdown(f"""
+    <div class="hero-container">
+        <div class="hero-title">Diff Edit Evaluation Results</div>
+        <div class="hero-subtitle">A comprehensive analysis of model performance on code editing tasks.</div>
+        <div class="hero-subtitle" style="font-size: 0.9rem; margin-top: 10px;">
+            <strong>Current Run:</strong> {run_title} • {current_run['created_at']}
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Key metrics row
+    col1, col2, col3, col4 = st.columns(4)
+    
+    total_results = model_performance['total_results'].sum()
+    overall_success = model_performance['success_rate'].mean()
+    total_cost = model_performance['total_cost'].sum()
+    avg_latency = model_performance['avg_round_trip_ms'].mean()
+    
+    with col1:
+        st.markdown(f"""
+        <div class="custom-metric">
+            <div class="custom-metric-value">{len(model_performance)}</div>
+            <div class="custom-metric-label">Models Tested</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="custom-metric">
+            <div class="custom-metric-value">{total_results}</div>
+            <div class="custom-metric-label">Valid Results</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        success_color = "#10b981" if overall_success > 0.8 else "#f59e0b" if overall_success > 0.6 else "#ef4444"
+        st.markdown(f"""
+        <div class="custom-metric">
+            <div class="custom-metric-value" style="color: {success_color}">{overall_success:.1%}</div>
+            <div class="custom-metric-label">Avg Success Rate</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown(f"""
+        <div class="custom-metric">
+            <div class="custom-metric-value">${total_cost:.3f}</div>
+            <div class="custom-metric-label">Total Cost</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+def render_model_comparison_cards(model_performance):
+    """Render beautiful model comparison cards"""
+    st.markdown("## Model Leaderboard")
+    
+    # Find best performer
+    best_model = model_performance.iloc[0]['model_id']
+    
+    for idx, model in model_performance.iterrows():
+        is_best = model['model_id'] == best_model
+        grade, grade_class = get_performance_grade(model['success_rate'])
+        
+        # Create a container for each model
+        with st.container():
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                # Use Streamlit's native components instead of raw HTML
+                if is_best:
+                    st.success(f"**{model['model_id']}** - Best Performer")
+                else:
+                    st.info(f"**{model['model_id']}**")
+                
+                # Success rate with color coding
+                success_rate = model['success_rate']
+                if success_rate >= 0.8:
+                    st.success(f"**Success Rate:** {success_rate:.1%} ({grade})")
+                elif success_rate >= 0.6:
+                    st.warning(f"**Success Rate:** {success_rate:.1%} ({grade})")
+                else:
+                    st.error(f"**Success Rate:** {success_rate:.1%} ({grade})")
+                
+                # Metrics in columns
+                metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
+                
+                with metric_col1:
+                    if pd.notna(model['avg_round_trip_ms']):
+                        st.metric("Avg Latency", f"{model['avg_round_trip_ms']:.0f}ms")
+                    else:
+                        st.metric("Avg Latency", "N/A")
+                
+                with metric_col2:
+                    if pd.notna(model['avg_cost']):
+                        st.metric("Avg Cost", f"${model['avg_cost']:.4f}")
+                    else:
+                        st.metric("Avg Cost", "N/A")
+                
+                with metric_col3:
+                    st.metric("Valid Results", f"{model['total_results']}")
+                
+                with metric_col4:
+                    if pd.notna(model['avg_first_token_ms']):
+                        st.metric("First Token", f"{model['avg_first_token_ms']:.0f}ms")
+                    else:
+                        st.metric("First Token", "N/A")
+            
+            with col2:
+                st.write("")  # Add some spacing
+                if st.button(f"Drill Down", key=f"drill_{model['model_id']}", use_container_width=True):
+                    st.session_state.drill_down_model = model['model_id']
+                    # Update URL with model_id for drill down
+                    st.query_params["model_id"] = model['model_id']
+                    st.rerun()
+            
+            st.divider()  # Add a divider between models
+
+def render_histogram_chart(run_id, column, title, log_scale=False):
+    """Render a pre-binned per-model distribution as step lines"""
+    model_ids, edges, counts = load_metric_histogram(run_id, column, log_scale=log_scale)
+
+    if not model_ids:
+        st.info(f"No {HISTOGRAM_COLUMNS[column].lower()} data for this run.")
+        return
+
+    st.plotly_chart(histogram_figure(model_ids, edges, counts, column, title, log_scale), use_container_width=True)
+
+def histogram_figure(model_ids, edges, counts, column, title, log_scale=False):
+    import numpy as np
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    for model_id, model_counts in zip(model_ids, counts):
+        # Repeat the last count so the final step spans the last bin edge
+        fig.add_trace(go.Scatter(
+            x=edges,
+            y=np.append(model_counts, model_counts[-1]),
+            mode='lines',
+            line_shape='hv',
+            name=model_id
+        ))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title=HISTOGRAM_COLUMNS[column],
+        yaxis_title='Results',
+        xaxis_type='log' if log_scale else 'linear',
+        template='plotly_dark',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Azeret Mono, monospace"),
+        legend=dict(orientation='h', y=-0.25),
+        margin=dict(t=50)
+    )
+    return fig
+
+def downsample_points(x, y, max_points, ordered, log_x, log_y):
+    """Indices and weights of the points to draw; ordered series use LTTB, everything else the grid"""
+    import numpy as np
+    from scatter_sampling import grid_downsample, lttb
+
+    if ordered:
+        indices = lttb(x, y, max_points)
+        return indices, np.ones(len(indices), dtype=np.int64)
+    # Grid in the plotted scale so cells are evenly sized on screen
+    grid_x = np.log10(np.maximum(x, 1e-9)) if log_x else x
+    grid_y = np.log10(np.maximum(y, 1e-9)) if log_y else y
+    return grid_downsample(grid_x, grid_y, max_points)
+
+def render_result_scatter(run_id):
+    """Per-result scatter, downsampled server-side so at most MAX_SCATTER_POINTS reach the browser"""
+    import numpy as np
+    from scatter_sampling import MAX_SCATTER_POINTS, allocate_budget, scatter_trace_class
+
+    st.markdown("### Per-Result Scatter")
+    x_options = ['result_order'] + list(SCATTER_COLUMNS)
+    x_labels = {'result_order': 'Result Order', **SCATTER_COLUMNS}
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        x_column = st.selectbox("X axis:", x_options, index=x_options.index('time_round_trip_ms'),
+                                format_func=lambda column: x_labels[column], key="result_scatter_x")
+    with col2:
+        y_column = st.selectbox("Y axis:", list(SCATTER_COLUMNS), index=list(SCATTER_COLUMNS).index('cost_usd'),
+                                format_func=lambda column: SCATTER_COLUMNS[column], key="result_scatter_y")
+    with col3:
+        log_axes = st.checkbox("Log axes", value=False, key="result_scatter_log")
+        valid_only = st.checkbox("Valid only", value=True, key="result_scatter_valid")
+
+    points_df = load_result_points(run_id)
+    if valid_only:
+        points_df = points_df[points_df['is_valid'] == 1]
+    ordered = x_column == 'result_order'
+    if ordered:
+        points_df = points_df.assign(result_order=np.arange(len(points_df)))
+    points_df = points_df[points_df[x_column].notna() & points_df[y_column].notna()]
+    if log_axes:
+        positive = points_df[y_column] > 0
+        if not ordered:
+            positive &= points_df[x_column] > 0
+        points_df = points_df[positive]
+    if points_df.empty:
+        st.info("No results with both values for this run.")
+        return
+
+    model_codes, model_ids = pd.factorize(points_df['model_id'], sort=True)
+    budgets = allocate_budget(np.bincount(model_codes, minlength=len(model_ids)), MAX_SCATTER_POINTS)
+    x_all = points_df[x_column].to_numpy(dtype=np.float64)
+    y_all = points_df[y_column].to_numpy(dtype=np.float64)
+    succeeded_all = points_df['succeeded'].to_numpy()
+
+    sampled = []
+    for code, model_id in enumerate(model_ids):
+        rows = np.flatnonzero(model_codes == code)
+        indices, weights = downsample_points(x_all[rows], y_all[rows], budgets[code], ordered, log_axes and not ordered, log_axes)
+        sampled.append((model_id, rows[indices], weights))
+
+    import plotly.graph_objects as go
+
+    num_drawn = sum(len(rows) for _, rows, _ in sampled)
+    trace_class = scatter_trace_class(num_drawn)
+
+    fig = go.Figure()
+    for model_id, rows, weights in sampled:
+        fig.add_trace(trace_class(
+            x=x_all[rows],
+            y=y_all[rows],
+            mode='markers',
+            name=str(model_id),
+            marker=dict(
+                size=6,
+                opacity=0.7,
+                # Failed attempts are drawn as crosses
+                symbol=np.where(succeeded_all[rows] == 1, 'circle', 'x'),
+            ),
+            customdata=weights,
+            hovertemplate=f"{model_id}<br>%{{x}}, %{{y}}<br>%{{customdata}} result(s)<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title=f"{SCATTER_COLUMNS[y_column]} vs {x_labels[x_column]}",
+        xaxis_title=x_labels[x_column],
+        yaxis_title=SCATTER_COLUMNS[y_column],
+        xaxis_type='log' if log_axes and not ordered else 'linear',
+        yaxis_type='log' if log_axes else 'linear',
+        template='plotly_dark',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Azeret Mono, monospace"),
+        legend=dict(orientation='h', y=-0.25),
+        margin=dict(t=50)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    renderer = "WebGL" if trace_class is go.Scattergl else "SVG"
+    if num_drawn < len(points_df):
+        method = ("LTTB, which keeps the peaks of the series" if ordered
+                  else "one point per grid cell plus outliers; hover shows how many results each point stands for")
+        st.caption(f"Showing {num_drawn:,} of {len(points_df):,} results ({method}, {renderer}). Crosses are failed attempts.")
+    else:
+        st.caption(f"All {num_drawn:,} results ({renderer}). Crosses are failed attempts.")
+
+def render_success_rate_chart(model_performance):
+    """Render the success rate bar chart"""
+    st.plotly_chart(success_rate_figure(model_performance), use_container_width=True)
+
+def success_rate_figure(model_performance):
+    import plotly.express as px
+
+    fig_success = px.bar(
+        model_performance,
+        x='model_id',
+        y='success_rate',
+        title="Success Rate by Model",
+        labels={'success_rate': 'Success Rate', 'model_id': 'Model'},
+        color='success_rate',
+        color_continuous_scale='RdYlGn',
+        text='success_rate',
+        template='plotly_dark'
+    )
+    fig_success.update_traces(texttemplate='%{text:.1%}', textposition='outside')
+    fig_success.update_layout(
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Azeret Mono, monospace"),
+        yaxis_range=[0,1],  # Set y-axis from 0% to 100%
+        margin=dict(t=50)  # Add top margin to prevent clipping
+    )
+    return fig_success
+
+def first_edit_figure(model_performance):
+    import plotly.express as px
+
+    fig_first_edit = px.bar(
+        model_performance,
+        x='model_id',
+        y='avg_first_edit_ms',
+        title="Time to First Edit",
+        labels={'avg_first_edit_ms': 'Time to First Edit (ms)', 'model_id': 'Model'},
+        color='avg_first_edit_ms',
+        color_continuous_scale='bluered',
+        text='avg_first_edit_ms',
+        template='plotly_dark'
+    )
+    fig_first_edit.update_traces(texttemplate='%{text:.0f}ms', textposition='outside')
+    fig_first_edit.update_layout(
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Azeret Mono, monospace"),
+        margin=dict(t=50)
+    )
+    return fig_first_edit
+
+def latency_cost_figure(model_performance):
+    import plotly.express as px
+
+    fig_scatter = px.scatter(
+        model_performance,
+        x='avg_round_trip_ms',
+        y='avg_cost',
+        size='total_results',
+        color='success_rate',
+        hover_name='model_id',
+        title="Latency vs Cost Analysis",
+        labels={
+            'avg_round_trip_ms': 'Avg Round Trip (ms)',
+            'avg_cost': 'Avg Cost ($)',
+            'success_rate': 'Success Rate',
+            'total_results': 'Valid Results'
+        },
+        color_continuous_scale='RdYlGn',
+        template='plotly_dark'
+    )
+    fig_scatter.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Azeret Mono, monospace")
+    )
+    return fig_scatter
+
+def render_comparison_charts(model_performance, run_id):
+    """Render interactive comparison charts"""
+    st.markdown("## Performance Analysis")
+    
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Time to First Edit
+        st.plotly_chart(first_edit_figure(model_performance), use_container_width=True)
+
+    with col2:
+        # Latency vs Cost Scatter
+        st.plotly_chart(latency_cost_figure(model_performance), use_container_width=True)
+
+    # Distributions are binned server-side; only edges and counts reach the browser
+    st.markdown("### Distributions")
+    log_latency = st.checkbox("Log-scale latency bins", value=True, key="log_latency_bins")
+
+    col3, col4 = st.columns(2)
+
+    with col3:
+        render_histogram_chart(run_id, 'time_round_trip_ms', "Round Trip Latency Distribution", log_scale=log_latency)
+
+    with col4:
+        render_histogram_chart(run_id, 'completion_tokens', "Completion Tokens Distribution")
+
+    render_result_scatter(run_id)
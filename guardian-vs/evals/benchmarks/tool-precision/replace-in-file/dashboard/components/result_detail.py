@@ -0,0 +1,451 @@
+import streamlit as st
+import pandas as pd
+from utils import guess_language_from_filepath
+from data import load_detailed_results
+from search_locator import load_search_diagnostics, MISMATCH_KINDS
+
+def get_error_description(error_enum, error_string=None):
+    """Map error enum values to user-friendly descriptions"""
+    error_map = {
+        1: "No tool calls - Model didn't use the replace_in_file tool",
+        2: "Multiple tool calls - Model called multiple tools instead of one", 
+        3: "Wrong tool call - Model used wrong tool (not replace_in_file)",
+        4: "Missing parameters - Tool call missing required path or diff",
+        5: "Wrong file edited - Model edited different file than expected",
+        6: "Wrong tool call - Model used wrong tool type",
+        7: "Wrong file edited - Model targeted incorrect file path",
+        8: "API/Stream error - Problem with model API connection",
+        9: "Configuration error - Invalid evaluation parameters",
+        10: "Function error - Invalid parsing/diff functions",
+        11: "Other error - Unexpected failure"
+    }
+    
+    base_description = error_map.get(error_enum, f"Unknown error (code: {error_enum})")
+    
+    if error_string:
+        return f"{base_description}: {error_string}"
+    return base_description
+
+def get_error_guidance(error_enum):
+    """Provide specific guidance based on error type"""
+    guidance_map = {
+        1: "💡 The model provided a response but didn't use the replace_in_file tool. Check the raw output to see what the model actually said.",
+        2: "💡 The model called multiple tools when it should only call replace_in_file once. Check the parsed tool call section.",
+        3: "💡 The model used a different tool instead of replace_in_file. This might indicate confusion about the task.",
+        4: "💡 The model called replace_in_file but didn't provide the required 'path' or 'diff' parameters.",
+        5: "💡 The model tried to edit a different file than expected. Check the parsed tool call to see which file it targeted.",
+        6: "💡 The model used the wrong tool type. Check the raw output to see what tool it attempted to use.",
+        7: "💡 The model tried to edit a different file path than expected. This could indicate path confusion or hallucination.",
+    }
+    
+    return guidance_map.get(error_enum, "")
+
+def render_detailed_analysis(run_id, model_id):
+    """Render detailed drill-down analysis"""
+    st.markdown(f"## Detailed Analysis: {model_id}")
+    
+    # Load all results (including invalid attempts)
+    detailed_results = load_detailed_results(run_id, model_id)
+    
+    # Also load only valid results for metrics
+    valid_results = load_detailed_results(run_id, model_id, valid_only=True)
+    
+    if detailed_results.empty:
+        st.warning("No detailed results found.")
+        return
+    
+    # Show total vs valid results
+    st.info(f"Showing all {len(detailed_results)} results ({len(valid_results)} valid, {len(detailed_results) - len(valid_results)} invalid)")
+    
+    # Results overview
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        success_count = valid_results['succeeded'].sum()
+        total_count = len(valid_results)
+        st.metric("Success Rate", f"{success_count}/{total_count} ({success_count/total_count:.1%} of valid results)")
+    
+    with col2:
+        avg_latency = detailed_results['time_round_trip_ms'].mean()
+        st.metric("Avg Latency", f"{avg_latency:.0f}ms")
+    
+    with col3:
+        total_cost = detailed_results['cost_usd'].sum()
+        st.metric("Total Cost", f"${total_cost:.4f}")
+    
+    render_search_mismatch_summary(run_id, model_id)
+
+    # Interactive results table
+    st.markdown("### 📋 Individual Results")
+    
+    # Add result selector with indicators for valid/invalid attempts
+    result_options = []
+    for idx, row in detailed_results.iterrows():
+        # Check if this is a valid result
+        is_valid = (row['error_enum'] not in [1, 6, 7]) if not pd.isna(row['error_enum']) else True
+        
+        # Create status indicator
+        if is_valid:
+            status = "✅" if row['succeeded'] else "❌"
+        else:
+            status = "⚠️"  # Warning symbol for invalid results
+            
+        # Add validity indicator to the option text
+        validity_text = "" if is_valid else " [INVALID RESULT]"
+        result_options.append(f"{status} {row['task_id']} - {row['time_round_trip_ms']:.0f}ms{validity_text}")
+    
+    selected_result_idx = st.selectbox(
+        "Select a result to analyze:",
+        range(len(result_options)),
+        format_func=lambda x: result_options[x]
+    )
+    
+    if selected_result_idx is not None:
+        render_result_detail(detailed_results.iloc[selected_result_idx])
+
+def render_result_detail(result):
+    """Render detailed view of a single result"""
+    st.markdown("### 🔬 Result Deep Dive")
+    
+    # Check if this is a valid result (only invalid if no tool calls or wrong file)
+    is_valid = True
+    if not pd.isna(result['error_enum']):
+        # Only these specific errors make a result "invalid" for the benchmark:
+        # 1 = no_tool_calls, 5 = wrong_file_edited, 7 = wrong_file_edited
+        is_valid = result['error_enum'] not in [1, 5, 7]
+    
+    # Show validity warning if needed
+    if not is_valid:
+        st.warning("⚠️ **This is an invalid result** - The model didn't call the replace_in_file tool or edited the wrong file. This result is excluded from success rate calculations.")
+    
+    # Result metadata
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        status_icon = "✅" if result['succeeded'] else "❌"
+        st.markdown(f"**Status:** {status_icon} {'Success' if result['succeeded'] else 'Failed'}")
+    
+    with col2:
+        st.markdown(f"**Task ID:** {result['task_id']}")
+    
+    with col3:
+        st.markdown(f"**Round Trip:** {result['time_round_trip_ms']:.0f}ms")
+    
+    with col4:
+        if pd.notna(result['cost_usd']) and result['cost_usd'] is not None:
+            st.markdown(f"**Cost:** ${result['cost_usd']:.4f}")
+        else:
+            st.markdown(f"**Cost:** Free")
+    
+    # Tabbed interface for different views
+    tab1, tab2, tab3, tab4 = st.tabs(["📄 File & Edits", "🤖 Raw Output", "🔧 Parsed Tool Call", "📊 Metrics"])
+    
+    with tab1:
+        render_file_and_edits_view(result)
+    
+    with tab2:
+        render_raw_output_view(result)
+    
+    with tab3:
+        render_parsed_tool_call_view(result)
+    
+    with tab4:
+        render_metrics_view(result)
+
+def render_search_mismatch_summary(run_id, model_id):
+    """Breakdown of how this model's failed SEARCH blocks missed the original file"""
+    diagnostics = load_search_diagnostics(run_id)
+    diagnostics = diagnostics[diagnostics['model_id'] == model_id]
+    if diagnostics.empty:
+        return
+
+    with st.expander(f"🔎 SEARCH Mismatch Triage ({diagnostics['result_id'].nunique()} failed results)"):
+        summary = diagnostics.groupby('mismatch').agg(
+            blocks=('block_index', 'size'),
+            results=('result_id', 'nunique'),
+            median_similarity=('similarity', 'median'),
+        ).reindex(list(MISMATCH_KINDS)).dropna(subset=['blocks'])
+        summary.index = summary.index.map(MISMATCH_KINDS)
+        st.dataframe(summary.style.format({'blocks': "{:.0f}", 'results': "{:.0f}", 'median_similarity': "{:.1%}"}), use_container_width=True)
+        st.caption("Each SEARCH block of a failed valid attempt is matched against the closest region of the original file.")
+
+def render_search_block_diagnostics(result):
+    """Closest region of the original file for each SEARCH block of a failed edit"""
+    diagnostics = load_search_diagnostics(result['run_id'])
+    diagnostics = diagnostics[diagnostics['result_id'] == result['result_id']]
+    if diagnostics.empty:
+        return
+
+    st.markdown("**Closest match per SEARCH block:**")
+    for block in diagnostics.itertuples(index=False):
+        if block.mismatch == 'not found':
+            st.markdown(f"- Block {block.block_index + 1} ({block.search_lines} lines): {MISMATCH_KINDS[block.mismatch]}")
+            continue
+        st.markdown(
+            f"- Block {block.block_index + 1} ({block.search_lines} lines): {MISMATCH_KINDS[block.mismatch]}, "
+            f"{block.similarity:.0%} similar to lines {block.line_start:.0f}-{block.line_end:.0f}"
+        )
+        if pd.notna(block.first_mismatch_line):
+            st.code(
+                f"line {block.first_mismatch_line:.0f}\n"
+                f"- file:   {block.file_text if block.file_text is not None else '<end of file>'}\n"
+                f"+ search: {block.search_text}",
+                language='diff'
+            )
+
+def render_file_and_edits_view(result):
+    """Render side-by-side file and edits view"""
+    st.markdown("#### 📄 File Content & Edit Analysis")
+    
+    # Check if we have original file content
+    has_original = not pd.isna(result['original_file_content']) and result['original_file_content']
+    has_edited = not pd.isna(result['edited_file_content']) and result['edited_file_content']
+    
+    if not has_original and not has_edited:
+        st.warning("No file content available for this result.")
+        return
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("**Original File:**")
+        if has_original:
+            filepath = result['original_filepath'] if not pd.isna(result['original_filepath']) else 'Unknown file'
+            st.markdown(f"📁 `{filepath}`")
+            
+            # Display full original file content in a scrollable code block
+            with st.expander("View Original File Content", expanded=True):
+                # Prepare content for the copy button (needs JS-specific escaping)
+                raw_content_for_copy = result['original_file_content']
+                # Escape for JavaScript template literal: backticks, backslashes, newlines
+                js_escaped_content = raw_content_for_copy.replace('\\', '\\\\') \
+                                                       .replace('`', '\\`') \
+                                                       .replace('\r\n', '\\n') \
+                                                       .replace('\n', '\\n') \
+                                                       .replace('\r', '\\n')
+
+                unique_suffix = str(result.name if hasattr(result, 'name') else result['task_id']).replace('-', '_').replace('.', '_')
+                button_id = f"copyBtnOriginal_{unique_suffix}"
+                
+                copy_button_html = f"""
+                    <button id="{button_id}" onclick="copyOriginalToClipboard(`{js_escaped_content}`, '{button_id}')" style="margin-bottom: 10px; padding: 5px 10px; border-radius: 5px; border: 1px solid #ccc; cursor: pointer;">Copy Original File</button>
+                    <script>
+                        if (!window.copyOriginalToClipboard) {{
+                            window.copyOriginalToClipboard = async function(text, buttonId) {{
+                                try {{
+                                    await navigator.clipboard.writeText(text);
+                                    const button = document.getElementById(buttonId);
+                                    button.innerText = 'Copied!';
+                                    button.style.backgroundColor = '#d4edda'; // Optional: success feedback
+                                    setTimeout(() => {{ 
+                                        button.innerText = 'Copy Original File'; 
+                                        button.style.backgroundColor = '';
+                                    }}, 2000);
+                                }} catch (err) {{
+                                    console.error('Failed to copy original: ', err);
+                                    const button = document.getElementById(buttonId);
+                                    button.innerText = 'Copy Failed!';
+                                    button.style.backgroundColor = '#f8d7da'; // Optional: error feedback
+                                    setTimeout(() => {{ 
+                                        button.innerText = 'Copy Original File'; 
+                                        button.style.backgroundColor = '';
+                                    }}, 2000);
+                                }}
+                            }}
+                        }}
+                    </script>
+                    """
+                st.components.v1.html(copy_button_html, height=50)
+
+                # Prepare content for st.code (needs actual newlines)
+                content_for_display = result['original_file_content']
+                # Iteratively replace common escaped newline sequences with actual newlines
+                # This handles cases like "\\n" -> "\n" and then "\n" (if it was literally "\n")
+                # Order might matter if there are multiple levels of escaping, but this covers common ones.
+                content_for_display = content_for_display.replace('\\\\r\\\\n', '\r\n').replace('\\\\n', '\n') # Double escaped
+                content_for_display = content_for_display.replace('\\r\\n', '\r\n').replace('\\n', '\n')     # Single escaped
+
+                language = guess_language_from_filepath(filepath)
+                st.code(content_for_display, language=language, line_numbers=False)
+
+        else:
+            st.warning("Original file content not available")
+    
+    with col2:
+        st.markdown("**Edit Analysis:**")
+        
+        if not result['succeeded']:
+            # Show error information
+            st.error("❌ **Edit Failed**")
+            
+            # Show detailed error reason
+            if not pd.isna(result['error_enum']):
+                error_description = get_error_description(
+                    result['error_enum'], 
+                    result.get('error_string')
+                )
+                st.markdown(f"**Reason:** {error_description}")
+                
+                # Show specific guidance based on error type
+                guidance = get_error_guidance(result['error_enum'])
+                if guidance:
+                    st.info(guidance)
+            
+            # For valid results that failed, check for diff application failures
+            elif not result['succeeded']:
+                # This is a valid result that failed - likely due to diff application issues
+                raw_output = result.get('raw_model_output', '')
+                
+                # Check if we have specific error information in the raw output
+                if 'does not match anything in the file' in str(raw_output).lower():
+                    st.warning("⚠️ **Diff Application Failed**")
+                    st.info("💡 The SEARCH block in the diff didn't match any content in the original file. This usually means the model hallucinated code that doesn't exist.")
+                elif 'malformatted' in str(raw_output).lower() or 'malformed' in str(raw_output).lower():
+                    st.warning("⚠️ **Diff Format Error**")
+                    st.info("💡 The diff format was incorrect. Check the raw tool call to see the formatting issues.")
+                elif 'error:' in str(raw_output).lower():
+                    # Try to extract the specific error message
+                    lines = str(raw_output).split('\n')
+                    error_lines = [line for line in lines if 'error:' in line.lower()]
+                    if error_lines:
+                        error_msg = error_lines[0].strip()
+                        st.warning("⚠️ **Diff Application Failed**")
+                        st.info(f"💡 {error_msg}")
+                    else:
+                        st.warning("⚠️ **Diff Application Failed**")
+                        st.info("💡 The diff couldn't be applied to the original file. Check the raw output and parsed tool call for more details.")
+                else:
+                    # Generic diff application failure
+                    st.warning("⚠️ **Diff Application Failed**")
+                    st.info("💡 The model made a valid tool call but the diff couldn't be applied to the original file. This usually indicates a mismatch between the expected and actual file content.")
+
+            if pd.isna(result['error_enum']) or result['error_enum'] not in [1, 6, 7]:
+                render_search_block_diagnostics(result)
+        else:
+            # Show successful edit information
+            st.success("✅ **Edit Successful**")
+            
+            # Show edit metrics
+            metric_col1, metric_col2, metric_col3 = st.columns(3)
+            
+            with metric_col1:
+                if not pd.isna(result['num_edits']):
+                    st.metric("Edits", int(result['num_edits']))
+            
+            with metric_col2:
+                if not pd.isna(result['num_lines_added']):
+                    st.metric("Added", int(result['num_lines_added']))
+            
+            with metric_col3:
+                if not pd.isna(result['num_lines_deleted']):
+                    st.metric("Deleted", int(result['num_lines_deleted']))
+            
+            # Show edited file if available
+            if has_edited:
+                st.markdown("**Edited File:**")
+                with st.expander("View Edited File Content"):
+                    edited_lines = result['edited_file_content'].split('\n')
+                    for i, line in enumerate(edited_lines[:50], 1):
+                        st.text(f"{i:3d} | {line}")
+                    
+                    if len(edited_lines) > 50:
+                        st.text(f"... ({len(edited_lines) - 50} more lines)")
+        
+        # Show raw and parsed tool calls if available
+        if not pd.isna(result['parsed_tool_call_json']):
+            import json
+
+            with st.expander("View Raw Tool Call"):
+                # Extract the raw tool call text from the model output
+                raw_output = result['raw_model_output'] if not pd.isna(result['raw_model_output']) else ""
+                
+                # Try to extract just the tool call portion
+                if raw_output and '<replace_in_file>' in raw_output:
+                    # Find the tool call block
+                    start_idx = raw_output.find('<replace_in_file>')
+                    end_idx = raw_output.find('</replace_in_file>') + len('</replace_in_file>')
+                    if start_idx != -1 and end_idx != -1:
+                        raw_tool_call = raw_output[start_idx:end_idx]
+                        st.code(raw_tool_call, language='xml')
+                    else:
+                        st.text("Tool call not found in raw output")
+                else:
+                    st.text("No raw tool call available")
+            
+            with st.expander("View Parsed Tool Call"):
+                try:
+                    parsed_call = json.loads(result['parsed_tool_call_json'])
+                    st.json(parsed_call)
+                except:
+                    st.text(result['parsed_tool_call_json'])
+
+def render_raw_output_view(result):
+    """Render raw model output"""
+    st.markdown("#### 🤖 Raw Model Output")
+    
+    if pd.isna(result['raw_model_output']) or not result['raw_model_output']:
+        st.warning("No raw output available for this result.")
+        return
+    
+    st.markdown("""
+    <div class="file-viewer">
+    """, unsafe_allow_html=True)
+    
+    st.text(result['raw_model_output'])
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+
+def render_parsed_tool_call_view(result):
+    """Render parsed tool call analysis"""
+    st.markdown("#### 🔧 Parsed Tool Call Analysis")
+    
+    if pd.isna(result['parsed_tool_call_json']) or not result['parsed_tool_call_json']:
+        st.warning("No parsed tool call available for this result.")
+        return
+
+    import json
+    
+    try:
+        parsed_call = json.loads(result['parsed_tool_call_json'])
+        
+        # Pretty print the JSON
+        st.json(parsed_call)
+        
+        # If it's a replace_in_file call, show the diff blocks
+        if isinstance(parsed_call, dict) and 'diff' in parsed_call:
+            st.markdown("**Diff Blocks:**")
+            st.code(parsed_call['diff'], language='diff')
+            
+    except json.JSONDecodeError:
+        st.markdown("**Raw Parsed Call (Invalid JSON):**")
+        st.text(result['parsed_tool_call_json'])
+
+def render_metrics_view(result):
+    """Render detailed metrics for the result"""
+    st.markdown("#### 📊 Detailed Metrics")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("**Timing Metrics:**")
+        if not pd.isna(result['time_to_first_token_ms']):
+            st.metric("Time to First Token", f"{result['time_to_first_token_ms']:.0f}ms")
+        
+        if not pd.isna(result['time_to_first_edit_ms']):
+            st.metric("Time to First Edit", f"{result['time_to_first_edit_ms']:.0f}ms")
+        
+        if not pd.isna(result['time_round_trip_ms']):
+            st.metric("Round Trip Time", f"{result['time_round_trip_ms']:.0f}ms")
+    
+    with col2:
+        st.markdown("**Token & Cost Metrics:**")
+        if not pd.isna(result['completion_tokens']):
+            st.metric("Completion Tokens", int(result['completion_tokens']))
+        
+        if pd.notna(result['cost_usd']) and result['cost_usd'] is not None:
+            st.metric("Cost", f"${result['cost_usd']:.4f}")
+        else:
+            st.metric("Cost", "Free")
+        
+        if not pd.isna(result['tokens_in_context']):
+            st.metric("Context Tokens", int(result['tokens_in_context']))
@@ -0,0 +1,45 @@
+import streamlit as st
+from rollups import ensure_rollups_fresh
+from sampling import SAMPLE_SIZES, DEFAULT_SAMPLE_SIZE, load_population, sample_fraction
+
+def show_exact():
+    st.session_state.approximate_stats = False
+
+def render_sampling_toggle(run_ids):
+    """Approximate/exact switch, shared by every page that offers it.
+
+    Returns (sample fraction, rollup version); the fraction is None when exact numbers are wanted.
+    """
+    rollup_version = ensure_rollups_fresh()
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        # Kept in a plain session key (not a widget key) so the choice carries over between pages
+        approximate = st.toggle(
+            "Approximate statistics",
+            value=st.session_state.get('approximate_stats', False),
+            help="Aggregate a stratified sample (by task and model) instead of every result, with 95% bounds"
+        )
+        st.session_state.approximate_stats = approximate
+    if not approximate:
+        return None, rollup_version
+
+    population = load_population(tuple(run_ids), rollup_version)
+    with col2:
+        target_size = st.select_slider(
+            "Sample size:", options=SAMPLE_SIZES,
+            value=st.session_state.get('sample_size', DEFAULT_SAMPLE_SIZE),
+            format_func=lambda size: f"~{size:,} attempts"
+        )
+        st.session_state.sample_size = target_size
+    fraction = sample_fraction(target_size, population['attempts'])
+    if fraction >= 1.0:
+        st.caption(f"The selected runs have {population['attempts']:,} attempts, within the sample size; numbers are exact.")
+        return None, rollup_version
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.caption(f"≈ Approximate: {fraction:.2%} of {population['attempts']:,} attempts, stratified over "
+                   f"{population['strata']:,} task × model pairs (small ones sampled more). ± and ranges are 95% bounds.")
+    with col2:
+        st.button("Show exact numbers", on_click=show_exact)
+    return fraction, rollup_version
@@ -0,0 +1,143 @@
+import streamlit as st
+from frame_cache import get_frame_cache
+from prefetch import get_prefetcher
+
+def render_run_sidebar(all_runs):
+    """Render the run selector, share link and cache stats; keeps st.session_state.selected_run_id in sync"""
+    with st.sidebar:
+        st.markdown("## 📊 Evaluation Runs")
+        st.markdown("Select a run to analyze:")
+        
+        # Create run options with nice formatting
+        run_options = []
+        run_ids = []
+        
+        for idx, run in all_runs.iterrows():
+            # Format the run description nicely
+            date_str = run['created_at'][:10]  # Get just the date part
+            time_str = run['created_at'][11:16]  # Get just the time part
+            
+            if run['description']:
+                display_name = f"🚀 {run['description']}"
+            else:
+                display_name = f"📅 Run {run['run_id'][:8]}..."
+            
+            run_options.append(f"{display_name}\n📅 {date_str} {time_str}")
+            run_ids.append(run['run_id'])
+        
+        # Default to latest run if no selection
+        if st.session_state.selected_run_id is None:
+            default_index = 0  # Latest run is first
+            st.session_state.selected_run_id = run_ids[0]
+        else:
+            try:
+                default_index = run_ids.index(st.session_state.selected_run_id)
+            except ValueError:
+                default_index = 0
+                st.session_state.selected_run_id = run_ids[0]
+        
+        selected_run_idx = st.selectbox(
+            "Choose run:",
+            range(len(run_options)),
+            format_func=lambda x: run_options[x],
+            index=default_index,
+            key="run_selector"
+        )
+        
+        # Update selected run if changed
+        if run_ids[selected_run_idx] != st.session_state.selected_run_id:
+            st.session_state.selected_run_id = run_ids[selected_run_idx]
+            st.session_state.drill_down_model = None  # Reset drill down when changing runs
+            # Update URL with new run_id
+            st.query_params["run_id"] = st.session_state.selected_run_id
+            if "model_id" in st.query_params:
+                del st.query_params["model_id"]  # Clear model_id when changing runs
+            st.rerun()
+        
+        # Show run details in sidebar
+        selected_run = all_runs.iloc[selected_run_idx]
+        st.markdown("---")
+        st.markdown("### 📋 Run Details")
+        st.markdown(f"**Run ID:** `{selected_run['run_id'][:12]}...`")
+        st.markdown(f"**Created:** {selected_run['created_at']}")
+        if selected_run['description']:
+            st.markdown(f"**Description:** {selected_run['description']}")
+        
+        # Show shareable URL
+        st.markdown("---")
+        st.markdown("### 🔗 Share This View")
+        
+        # Build current URL
+        # Dynamically derive the base URL
+        try:
+            # For older Streamlit versions
+            server_address = st.server.server_address
+            server_port = st.server.server_port
+        except AttributeError:
+            # Fallback for newer Streamlit versions where st.server is removed
+            # We can't reliably get the server address/port from within the script anymore.
+            # We'll default to localhost and the default port.
+            # The user can see the correct network URL in the terminal.
+            server_address = "localhost"
+            server_port = 8501
+        
+        base_url = f"http://{server_address}:{server_port}"
+        current_url = f"{base_url}/?run_id={st.session_state.selected_run_id}"
+        if st.session_state.drill_down_model:
+            current_url += f"&model_id={st.session_state.drill_down_model}"
+        
+        st.markdown("**Current URL:**")
+        st.code(current_url, language=None)
+        
+        # Copy button using HTML/JS
+        copy_button_html = f"""
+        <button onclick="copyToClipboard('{current_url}')" style="
+            padding: 8px 16px; 
+            border-radius: 5px; 
+            border: 1px solid #ccc; 
+            background: #f0f2f6;
+            cursor: pointer;
+            font-size: 14px;
+            margin-top: 5px;
+        ">📋 Copy Link</button>
+        <script>
+            function copyToClipboard(text) {{
+                navigator.clipboard.writeText(text).then(function() {{
+                    // Success feedback
+                    event.target.innerText = '✅ Copied!';
+                    event.target.style.backgroundColor = '#d4edda';
+                    setTimeout(() => {{ 
+                        event.target.innerText = '📋 Copy Link'; 
+                        event.target.style.backgroundColor = '#f0f2f6';
+                    }}, 2000);
+                }}, function(err) {{
+                    // Error feedback
+                    event.target.innerText = '❌ Failed';
+                    event.target.style.backgroundColor = '#f8d7da';
+                    setTimeout(() => {{ 
+                        event.target.innerText = '📋 Copy Link'; 
+                        event.target.style.backgroundColor = '#f0f2f6';
+                    }}, 2000);
+                }});
+            }}
+        </script>
+        """
+        st.components.v1.html(copy_button_html, height=50)
+        st.caption("To share results without a running server, export a static snapshot: `python static_site.py --out site`")
+
+        # Memory-bounded result cache usage
+        st.markdown("---")
+        with st.expander("🧠 Cache Stats"):
+            cache_stats = get_frame_cache().stats()
+            st.markdown(f"**Memory:** {cache_stats['bytes'] / 1024**2:.1f} / {cache_stats['max_bytes'] / 1024**2:.0f} MB")
+            st.markdown(f"**Entries:** {cache_stats['entries']}")
+            st.markdown(f"**Hits / Misses:** {cache_stats['hits']} / {cache_stats['misses']} ({cache_stats['hit_rate']:.0%} hit rate)")
+            st.markdown(f"**Evictions:** {cache_stats['evictions']}")
+            prefetcher = get_prefetcher()
+            if prefetcher:
+                prefetch_stats = prefetcher.stats
+                st.markdown(f"**Prefetched drill-downs:** {prefetch_stats['loaded']} loaded, "
+                            f"{prefetch_stats['over_budget']} skipped for memory, {prefetch_stats['cancelled']} cancelled")
+            if st.button("Clear cache", key="clear_frame_cache"):
+                get_frame_cache().clear()
+                st.rerun()
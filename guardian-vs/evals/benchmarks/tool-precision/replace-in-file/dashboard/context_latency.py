@@ -0,0 +1,234 @@
+"""
+Relate prompt size to latency.
+
+Each model gets a linear fit of time-to-first-token on context tokens, and of round-trip
+time on context tokens plus completion tokens (output length dominates round trip, so
+leaving it out would credit context with time spent generating). All models are fitted
+in one pass: per-model normal equations are accumulated with np.add.at and solved as a
+stacked batch.
+
+In approximate mode the same fits run over a stratified sample (sampling.py) as
+weighted least squares, and slopes get a 95% margin from the sandwich variance.
+"""
+
+import numpy as np
+import pandas as pd
+from utils import get_database_connection
+from frame_cache import cached_frame
+from sampling import Z_95, strata_cte, SAMPLED_FROM, add_weights, weighted_quantiles
+
+# Context size sources the page can fit against
+CONTEXT_COLUMNS = {
+    'tokens_in_context': 'Prompt tokens (cases.tokens_in_context)',
+    'file_tokens': 'File tokens (files.tokens)',
+}
+
+LATENCY_COLUMNS = """
+        res.model_id,
+        c.tokens_in_context,
+        f.tokens AS file_tokens,
+        c.system_prompt_hash,
+        sp.name AS system_prompt_name,
+        LENGTH(sp.content) AS system_prompt_chars,
+        res.time_to_first_token_ms,
+        res.time_round_trip_ms,
+        res.completion_tokens"""
+
+# API errors (error_enum 5) fail fast or time out, either way their latency says nothing about the prompt
+HAS_LATENCY = "((res.error_enum != 5 OR res.error_enum IS NULL) AND res.time_round_trip_ms IS NOT NULL)"
+
+@cached_frame
+def load_context_latency(run_ids):
+    """One row per attempt with a latency: model, context sizes, system prompt, TTFT and round trip"""
+    conn = get_database_connection()
+    placeholders = ', '.join('?' for _ in run_ids)
+    query = f"""
+    SELECT {LATENCY_COLUMNS}
+    FROM results res
+    JOIN cases c ON res.case_id = c.case_id
+    LEFT JOIN files f ON c.file_hash = f.hash
+    LEFT JOIN system_prompts sp ON c.system_prompt_hash = sp.hash
+    WHERE res.run_id IN ({placeholders}) AND {HAS_LATENCY}
+    """
+    latency_df = pd.read_sql_query(query, conn, params=list(run_ids))
+    latency_df['model_id'] = latency_df['model_id'].astype('category')
+    return latency_df
+
+@cached_frame
+def load_context_latency_sample(run_ids, fraction, rollup_version):
+    """load_context_latency over a stratified sample, with a weight per attempt; rollup_version keys the cache"""
+    conn = get_database_connection()
+    placeholders = ', '.join('?' for _ in run_ids)
+    query = f"""
+    WITH {strata_cte(placeholders)}
+    SELECT {LATENCY_COLUMNS},
+        s.threshold,
+        {HAS_LATENCY} AS has_latency
+    {SAMPLED_FROM}
+    LEFT JOIN files f ON c.file_hash = f.hash
+    LEFT JOIN system_prompts sp ON c.system_prompt_hash = sp.hash
+    WHERE c.run_id IN ({placeholders})
+    """
+    sample_df = add_weights(pd.read_sql_query(query, conn, params=[fraction, *run_ids, *run_ids]))
+    latency_df = sample_df[sample_df['has_latency'] == 1].drop(columns='has_latency').reset_index(drop=True)
+    latency_df['model_id'] = latency_df['model_id'].astype('category')
+    return latency_df
+
+def fit_per_group(groups, X, y, num_groups, weights=None):
+    """Least squares of y on X separately for every group code, weighted if weights are given.
+
+    groups: int codes 0..num_groups-1, X: (n, k) design matrix (include a ones column for an
+    intercept), y: (n,). Returns (coefficients (num_groups, k), r_squared, counts, standard
+    errors (num_groups, k)); standard errors are heteroskedasticity-robust (sandwich).
+    Groups with fewer than k points get NaN coefficients.
+    """
+    k = X.shape[1]
+    w = np.ones(len(y)) if weights is None else weights
+    xtx = np.zeros((num_groups, k, k))
+    xty = np.zeros((num_groups, k))
+    np.add.at(xtx, groups, w[:, None, None] * X[:, :, None] * X[:, None, :])
+    np.add.at(xty, groups, (w * y)[:, None] * X)
+    counts = np.bincount(groups, minlength=num_groups)
+
+    # pinv handles the stacked batch and degenerate groups (e.g. every case the same size)
+    bread = np.linalg.pinv(xtx)
+    coefficients = np.einsum('gij,gj->gi', bread, xty)
+    coefficients[counts < k] = np.nan
+
+    residuals = y - np.einsum('nk,nk->n', X, coefficients[groups])
+    meat = np.zeros((num_groups, k, k))
+    scores = X * (w * residuals)[:, None]
+    np.add.at(meat, groups, scores[:, :, None] * scores[:, None, :])
+    covariance = np.einsum('gij,gjk,gkl->gil', bread, meat, bread)
+    standard_errors = np.sqrt(np.maximum(np.diagonal(covariance, axis1=1, axis2=2), 0.0))
+
+    total_w = np.bincount(groups, weights=w, minlength=num_groups)
+    ss_res = np.bincount(groups, weights=w * residuals ** 2, minlength=num_groups)
+    means = np.bincount(groups, weights=w * y, minlength=num_groups) / np.maximum(total_w, 1e-12)
+    ss_tot = np.bincount(groups, weights=w * (y - means[groups]) ** 2, minlength=num_groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r_squared = np.where(ss_tot > 0, 1 - ss_res / ss_tot, np.nan)
+    return coefficients, r_squared, counts, standard_errors
+
+def fit_latency_models(latency_df, context_column):
+    """Per-model fits: TTFT ~ context and round trip ~ context + completion tokens.
+
+    Slopes are reported in ms per 1k tokens. A sampled frame (with a weight column) is
+    fitted by weighted least squares and its slopes get *_margin columns (95%); the _n
+    columns then count sampled attempts.
+    """
+    codes = latency_df['model_id'].cat.codes.to_numpy()
+    context_k = latency_df[context_column].to_numpy(dtype=float) / 1000.0
+    completion_k = latency_df['completion_tokens'].to_numpy(dtype=float) / 1000.0
+    ttft = latency_df['time_to_first_token_ms'].to_numpy(dtype=float)
+    round_trip = latency_df['time_round_trip_ms'].to_numpy(dtype=float)
+    sampled = 'weight' in latency_df
+    weights = latency_df['weight'].to_numpy(dtype=float) if sampled else np.ones(len(latency_df))
+
+    fits = pd.DataFrame({'model_id': latency_df['model_id'].cat.categories})
+
+    has_ttft = ~np.isnan(context_k) & ~np.isnan(ttft)
+    if has_ttft.any():
+        X = np.column_stack([np.ones(has_ttft.sum()), context_k[has_ttft]])
+        coefficients, r_squared, counts, standard_errors = fit_per_group(codes[has_ttft], X, ttft[has_ttft], len(fits), weights[has_ttft])
+        fits['ttft_intercept_ms'] = coefficients[:, 0]
+        fits['ttft_ms_per_1k'] = coefficients[:, 1]
+        if sampled:
+            fits['ttft_ms_per_1k_margin'] = Z_95 * standard_errors[:, 1]
+        fits['ttft_r2'] = r_squared
+        fits['ttft_n'] = counts
+
+    has_round_trip = ~np.isnan(context_k) & ~np.isnan(completion_k) & ~np.isnan(round_trip)
+    if has_round_trip.any():
+        X = np.column_stack([np.ones(has_round_trip.sum()), context_k[has_round_trip], completion_k[has_round_trip]])
+        coefficients, r_squared, counts, standard_errors = fit_per_group(
+            codes[has_round_trip], X, round_trip[has_round_trip], len(fits), weights[has_round_trip]
+        )
+        fits['round_trip_intercept_ms'] = coefficients[:, 0]
+        fits['round_trip_ms_per_1k_context'] = coefficients[:, 1]
+        if sampled:
+            fits['round_trip_ms_per_1k_context_margin'] = Z_95 * standard_errors[:, 1]
+        fits['round_trip_ms_per_1k_completion'] = coefficients[:, 2]
+        fits['round_trip_r2'] = r_squared
+        fits['round_trip_n'] = counts
+
+    has_context = ~np.isnan(context_k)
+    weighted_context = np.bincount(codes[has_context], weights=(weights * context_k)[has_context], minlength=len(fits))
+    total_weight = np.bincount(codes[has_context], weights=weights[has_context], minlength=len(fits))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fits['mean_context_tokens'] = weighted_context / total_weight * 1000.0
+    return fits
+
+def predict_trim_savings(fits, trim_share):
+    """Predicted per-attempt latency saved by cutting the mean context by trim_share"""
+    trimmed_k = fits['mean_context_tokens'] / 1000.0 * trim_share
+    return pd.DataFrame({
+        'model_id': fits['model_id'],
+        'ttft_saved_ms': fits.get('ttft_ms_per_1k', np.nan) * trimmed_k,
+        'round_trip_saved_ms': fits.get('round_trip_ms_per_1k_context', np.nan) * trimmed_k,
+    })
+
+def weighted_medians(grouped_df, keys, columns):
+    """Per group of a sampled frame: weighted medians of columns and the estimated attempts"""
+    summary = None
+    for column, name in columns.items():
+        medians = weighted_quantiles(grouped_df, keys, column, [0.5])[keys + ['p50']].rename(columns={'p50': name})
+        summary = medians if summary is None else summary.merge(medians, on=keys)
+    totals = grouped_df.groupby(keys, observed=True)['weight'].sum().rename('attempts').reset_index()
+    return summary.merge(totals, on=keys)
+
+def bin_by_context(latency_df, context_column, num_bins=10):
+    """Median TTFT and round trip per (model, context-size quantile bin)"""
+    context = latency_df[context_column]
+    edges = np.unique(np.nanquantile(context.to_numpy(dtype=float), np.linspace(0, 1, num_bins + 1)))
+    if len(edges) < 2:
+        return pd.DataFrame()
+    bins = np.clip(np.searchsorted(edges, context.to_numpy(dtype=float), side='right') - 1, 0, len(edges) - 2)
+    binned = latency_df.assign(bin=np.where(context.isna(), -1, bins))
+    binned = binned[binned['bin'] >= 0]
+    if 'weight' in binned:
+        summary = weighted_medians(binned, ['model_id', 'bin'], {
+            context_column: 'context_tokens',
+            'time_to_first_token_ms': 'median_ttft_ms',
+            'time_round_trip_ms': 'median_round_trip_ms',
+        })
+    else:
+        summary = binned.groupby(['model_id', 'bin'], observed=True).agg(
+            context_tokens=(context_column, 'median'),
+            median_ttft_ms=('time_to_first_token_ms', 'median'),
+            median_round_trip_ms=('time_round_trip_ms', 'median'),
+            attempts=('time_round_trip_ms', 'size'),
+        ).reset_index()
+    summary['bin_range'] = [f"{edges[b]:,.0f}–{edges[b + 1]:,.0f}" for b in summary['bin']]
+    return summary
+
+def compare_system_prompts(latency_df):
+    """Per (system prompt, model): prompt length, mean context and median latencies"""
+    keys = ['system_prompt_hash', 'model_id']
+    grouped = latency_df.groupby(keys, observed=True)
+    if 'weight' in latency_df:
+        has_context = latency_df['tokens_in_context'].notna()
+        weighted_context = latency_df.assign(
+            weighted_context=latency_df['tokens_in_context'].fillna(0) * latency_df['weight'],
+            weight=latency_df['weight'].where(has_context, 0.0),
+        )
+        summary = grouped.agg(
+            system_prompt_name=('system_prompt_name', 'first'),
+            system_prompt_chars=('system_prompt_chars', 'first'),
+        ).reset_index()
+        sums = weighted_context.groupby(keys, observed=True)[['weighted_context', 'weight']].sum()
+        summary['mean_tokens_in_context'] = (sums['weighted_context'] / sums['weight']).to_numpy()
+        summary = summary.merge(weighted_medians(latency_df, keys, {
+            'time_to_first_token_ms': 'median_ttft_ms',
+            'time_round_trip_ms': 'median_round_trip_ms',
+        }), on=keys)
+    else:
+        summary = grouped.agg(
+            system_prompt_name=('system_prompt_name', 'first'),
+            system_prompt_chars=('system_prompt_chars', 'first'),
+            mean_tokens_in_context=('tokens_in_context', 'mean'),
+            median_ttft_ms=('time_to_first_token_ms', 'median'),
+            median_round_trip_ms=('time_round_trip_ms', 'median'),
+            attempts=('time_round_trip_ms', 'size'),
+        ).reset_index()
+    return summary.sort_values(['model_id', 'system_prompt_chars'])
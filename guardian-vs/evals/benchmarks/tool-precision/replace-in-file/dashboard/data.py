@@ -0,0 +1,213 @@
+"""
+Data loading for the main dashboard page.
+
+Every loader is cached: small aggregates with st.cache_data, full drill-down rows
+with the memory-bounded frame cache.
+"""
+
+import streamlit as st
+import pandas as pd
+from utils import get_database_connection, compact_dtypes
+from frame_cache import cached_frame
+from migrations import VALID_PREDICATE
+
+@st.cache_data
+def load_all_runs():
+    """Load all evaluation runs"""
+    conn = get_database_connection()
+    
+    query = """
+    SELECT run_id, description, created_at, system_prompt_hash
+    FROM runs 
+    ORDER BY created_at DESC
+    """
+    
+    return pd.read_sql_query(query, conn)
+
+@st.cache_data
+def load_run_comparison(run_id):
+    """Load a specific run with model comparison data"""
+    return query_run_comparison(get_database_connection(), run_id)
+
+def query_run_comparison(conn, run_id):
+    """(run row, per-model performance) or (None, None); shared with the static site export"""
+    # Get the run details
+    run_query = """
+    SELECT run_id, description, created_at, system_prompt_hash
+    FROM runs 
+    WHERE run_id = ?
+    """
+    run_data = pd.read_sql_query(run_query, conn, params=(run_id,))
+    
+    if run_data.empty:
+        return None, None
+    
+    # Get model performance for this run
+    model_perf_query = """
+    SELECT 
+        res.model_id,
+        COUNT(*) as total_results,
+        AVG(CASE WHEN res.succeeded THEN 1.0 ELSE 0.0 END) as success_rate,
+        AVG(res.cost_usd) as avg_cost,
+        SUM(res.cost_usd) as total_cost,
+        AVG(res.time_to_first_token_ms) as avg_first_token_ms,
+        AVG(res.time_to_first_edit_ms) as avg_first_edit_ms,
+        AVG(res.time_round_trip_ms) as avg_round_trip_ms,
+        AVG(res.completion_tokens) as avg_completion_tokens,
+        AVG(res.num_edits) as avg_num_edits,
+        MIN(res.time_round_trip_ms) as min_round_trip_ms,
+        MAX(res.time_round_trip_ms) as max_round_trip_ms
+    FROM results res
+    WHERE res.run_id = ?
+      AND res.is_valid  -- Exclude: no_tool_calls, wrong_tool_call, wrong_file_edited (idx_results_valid_run_model)
+    GROUP BY res.model_id
+    ORDER BY success_rate DESC, avg_round_trip_ms ASC
+    """
+    
+    model_performance = pd.read_sql_query(model_perf_query, conn, params=(run_id,))
+    
+    return run_data.iloc[0], model_performance
+
+@st.cache_data
+def load_latest_run_comparison():
+    """Load the latest run with model comparison data"""
+    conn = get_database_connection()
+    
+    # Get the latest run
+    latest_run_query = """
+    SELECT run_id, description, created_at, system_prompt_hash
+    FROM runs 
+    ORDER BY created_at DESC 
+    LIMIT 1
+    """
+    latest_run = pd.read_sql_query(latest_run_query, conn)
+    
+    if latest_run.empty:
+        return None, None
+    
+    return load_run_comparison(latest_run.iloc[0]['run_id'])
+
+@cached_frame
+def load_detailed_results(run_id, model_id=None, valid_only=False):
+    """Load detailed results for drill-down analysis (memory-bounded cache, see frame_cache.py)"""
+    return query_detailed_results(get_database_connection(), run_id, model_id, valid_only)
+
+def query_detailed_results(conn, run_id, model_id=None, valid_only=False):
+    """Uncached body of load_detailed_results; prefetch.py runs it on its own connection"""
+    where_clause = f"WHERE res.run_id = '{run_id}'"
+    if model_id:
+        where_clause += f" AND res.model_id = '{model_id}'"
+    
+    # Option to filter out invalid attempts
+    if valid_only:
+        where_clause += " AND res.is_valid"
+    
+    query = f"""
+    SELECT 
+        res.*,
+        c.task_id,
+        c.description as case_description,
+        c.tokens_in_context,
+        sp.name as system_prompt_name,
+        pf.name as processing_functions_name,
+        orig_f.filepath as original_filepath,
+        orig_f.content as original_file_content,
+        edit_f.filepath as edited_filepath,
+        edit_f.content as edited_file_content
+    FROM results res
+    JOIN cases c ON res.case_id = c.case_id
+    LEFT JOIN system_prompts sp ON c.system_prompt_hash = sp.hash
+    LEFT JOIN processing_functions pf ON res.processing_functions_hash = pf.hash
+    LEFT JOIN files orig_f ON c.file_hash = orig_f.hash
+    LEFT JOIN files edit_f ON res.file_edited_hash = edit_f.hash
+    {where_clause}
+    ORDER BY res.created_at DESC
+    """
+    
+    return compact_dtypes(pd.read_sql_query(query, conn))
+
+# Per-result metrics that can be binned into distribution charts
+HISTOGRAM_COLUMNS = {
+    'time_round_trip_ms': 'Round Trip (ms)',
+    'time_to_first_token_ms': 'First Token (ms)',
+    'completion_tokens': 'Completion Tokens',
+}
+
+@st.cache_data
+def load_metric_histogram(run_id, column, num_bins=40, log_scale=False):
+    """Bin a per-result metric for every model in a run.
+
+    Only the bin edges and a (models x bins) count matrix are returned, so the
+    chart payload stays the same size no matter how many results the run has.
+    """
+    return query_metric_histogram(get_database_connection(), run_id, column, num_bins, log_scale)
+
+def query_metric_histogram(conn, run_id, column, num_bins=40, log_scale=False):
+    import numpy as np
+
+    if column not in HISTOGRAM_COLUMNS:
+        raise ValueError(f"Unsupported histogram column: {column}")
+
+    # Only pull the two narrow columns we need, never the full result rows
+    # The validity check is spelled out rather than is_valid so the round trip query is an
+    # index-only scan of idx_results_run_outcome (see migrations.py)
+    query = f"""
+    SELECT model_id, {column} AS value
+    FROM results
+    WHERE run_id = ?
+      AND {column} IS NOT NULL
+      AND {VALID_PREDICATE}
+    """
+    values_df = pd.read_sql_query(query, conn, params=(run_id,))
+
+    if values_df.empty:
+        return [], np.array([]), np.zeros((0, num_bins), dtype=np.int64)
+
+    model_codes, model_ids = pd.factorize(values_df['model_id'], sort=True)
+    values = values_df['value'].to_numpy(dtype=np.float64)
+
+    if log_scale:
+        # Log bins need strictly positive values; clamp zeros onto the first edge
+        values = np.maximum(values, 1.0)
+        edges = np.geomspace(values.min(), max(values.max(), values.min() * 1.01), num_bins + 1)
+    else:
+        edges = np.linspace(values.min(), max(values.max(), values.min() + 1), num_bins + 1)
+
+    # Bin every value at once, then count per (model, bin) pair with a single bincount
+    bin_idx = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, num_bins - 1)
+    counts = np.bincount(
+        model_codes * num_bins + bin_idx,
+        minlength=len(model_ids) * num_bins
+    ).reshape(len(model_ids), num_bins)
+
+    return list(model_ids), edges, counts
+
+# Per-result metrics that can be plotted against each other in the result scatter
+SCATTER_COLUMNS = {
+    'time_round_trip_ms': 'Round Trip (ms)',
+    'time_to_first_token_ms': 'First Token (ms)',
+    'cost_usd': 'Cost ($)',
+    'completion_tokens': 'Completion Tokens',
+    'tokens_in_context': 'Context Tokens',
+}
+
+@cached_frame
+def load_result_points(run_id):
+    """Narrow per-result frame for scatter plots: model, outcome and the SCATTER_COLUMNS metrics"""
+    conn = get_database_connection()
+    query = """
+    SELECT
+        res.model_id,
+        res.succeeded,
+        res.is_valid,
+        res.time_round_trip_ms,
+        res.time_to_first_token_ms,
+        res.cost_usd,
+        res.completion_tokens,
+        c.tokens_in_context
+    FROM results res
+    JOIN cases c ON res.case_id = c.case_id
+    WHERE res.run_id = ?
+    ORDER BY res.created_at
+    """
+    return compact_dtypes(pd.read_sql_query(query, conn, params=(run_id,)))
@@ -0,0 +1,181 @@
+"""
+Streaming export of a run's results to CSV, JSONL or Parquet.
+
+Rows are read with pd.read_sql_query(chunksize=...) and each chunk is written out
+before the next is read, so memory stays flat however big the run is. Only the chosen
+columns are selected; the large text columns (model output, tool call JSON, file
+contents) can be left out entirely. Parquet needs pyarrow, which is optional.
+
+Usage (from the dashboard directory):
+    python export.py <run_id> --format csv --output run.csv
+    python export.py <run_id> --format parquet --output run.parquet --no-blobs --valid-only
+    python export.py <run_id> --format jsonl --columns task_id model_id succeeded raw_model_output
+"""
+
+import sys
+import sqlite3
+import argparse
+import pandas as pd
+from utils import get_database_path
+
+# Exportable column -> (SQL expression, Parquet type)
+EXPORT_COLUMNS = {
+    'result_id': ('res.result_id', 'string'),
+    'run_id': ('res.run_id', 'string'),
+    'task_id': ('c.task_id', 'string'),
+    'model_id': ('res.model_id', 'string'),
+    'system_prompt_name': ('sp.name', 'string'),
+    'processing_functions_name': ('pf.name', 'string'),
+    'succeeded': ('res.succeeded', 'bool'),
+    'error_enum': ('res.error_enum', 'int64'),
+    'num_edits': ('res.num_edits', 'int64'),
+    'num_lines_deleted': ('res.num_lines_deleted', 'int64'),
+    'num_lines_added': ('res.num_lines_added', 'int64'),
+    'time_to_first_token_ms': ('res.time_to_first_token_ms', 'float64'),
+    'time_to_first_edit_ms': ('res.time_to_first_edit_ms', 'float64'),
+    'time_round_trip_ms': ('res.time_round_trip_ms', 'float64'),
+    'cost_usd': ('res.cost_usd', 'float64'),
+    'completion_tokens': ('res.completion_tokens', 'int64'),
+    'tokens_in_context': ('c.tokens_in_context', 'int64'),
+    'original_filepath': ('orig_f.filepath', 'string'),
+    'created_at': ('res.created_at', 'string'),
+    'raw_model_output': ('res.raw_model_output', 'string'),
+    'parsed_tool_call_json': ('res.parsed_tool_call_json', 'string'),
+    'original_file_content': ('orig_f.content', 'string'),
+    'edited_file_content': ('edit_f.content', 'string'),
+}
+
+# Large text columns that dominate the export size
+BLOB_COLUMNS = ['raw_model_output', 'parsed_tool_call_json', 'original_file_content', 'edited_file_content']
+
+DEFAULT_COLUMNS = [column for column in EXPORT_COLUMNS if column not in BLOB_COLUMNS]
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+DEFAULT_CHUNKSIZE = 5000
+
+def log(message):
+    print(message, file=sys.stderr)
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def build_export_query(columns, valid_only):
+    unknown = [column for column in columns if column not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown export columns: {', '.join(unknown)}")
+    select = ',\n        '.join(f"{EXPORT_COLUMNS[column][0]} AS {column}" for column in columns)
+    valid_filter = "AND (res.error_enum NOT IN (1, 6, 7) OR res.error_enum IS NULL)" if valid_only else ""
+    return f"""
+    SELECT
+        {select}
+    FROM results res
+    JOIN cases c ON res.case_id = c.case_id
+    LEFT JOIN system_prompts sp ON c.system_prompt_hash = sp.hash
+    LEFT JOIN processing_functions pf ON res.processing_functions_hash = pf.hash
+    LEFT JOIN files orig_f ON c.file_hash = orig_f.hash
+    LEFT JOIN files edit_f ON res.file_edited_hash = edit_f.hash
+    WHERE res.run_id = ? {valid_filter}
+    ORDER BY res.created_at
+    """
+
+def iter_export_chunks(conn, run_id, columns, valid_only=False, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield DataFrames of at most chunksize rows"""
+    query = build_export_query(columns, valid_only)
+    yield from pd.read_sql_query(query, conn, params=(run_id,), chunksize=chunksize)
+
+def write_csv(chunks, out):
+    rows = 0
+    for index, chunk in enumerate(chunks):
+        chunk.to_csv(out, header=index == 0, index=False)
+        rows += len(chunk)
+    return rows
+
+def write_jsonl(chunks, out):
+    rows = 0
+    for chunk in chunks:
+        if len(chunk):
+            lines = chunk.to_json(orient='records', lines=True, date_format='iso')
+            # pandas 2.x already ends the last record with a newline; older versions don't
+            out.write(lines if lines.endswith('\n') else lines + '\n')
+        rows += len(chunk)
+    return rows
+
+def parquet_schema(columns):
+    import pyarrow as pa
+
+    types = {'string': pa.string(), 'bool': pa.bool_(), 'int64': pa.int64(), 'float64': pa.float64()}
+    return pa.schema([(column, types[EXPORT_COLUMNS[column][1]]) for column in columns])
+
+def write_parquet(chunks, out, columns):
+    """One row group per chunk. The schema is fixed up front, so an all-NULL column in the first chunk doesn't break later ones."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = parquet_schema(columns)
+    rows = 0
+    with pq.ParquetWriter(out, schema, compression='zstd') as writer:
+        for chunk in chunks:
+            if 'succeeded' in chunk:
+                chunk['succeeded'] = chunk['succeeded'].astype('boolean')
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            rows += len(chunk)
+    return rows
+
+def export_run(conn, run_id, fmt, out, columns=None, valid_only=False, chunksize=DEFAULT_CHUNKSIZE):
+    """Stream one run to `out` (a text stream for csv/jsonl, a path or binary stream for parquet); returns rows written"""
+    columns = list(columns or DEFAULT_COLUMNS)
+    chunks = iter_export_chunks(conn, run_id, columns, valid_only, chunksize)
+    if fmt == 'csv':
+        return write_csv(chunks, out)
+    if fmt == 'jsonl':
+        return write_jsonl(chunks, out)
+    if fmt == 'parquet':
+        return write_parquet(chunks, out, columns)
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a run's results to CSV, JSONL or Parquet")
+    parser.add_argument('run_id', help='Run to export')
+    parser.add_argument('--db', default=get_database_path(), help='Path to evals.db (default: %(default)s)')
+    parser.add_argument('--format', choices=list(FORMATS), default='csv', help='Output format (default: %(default)s)')
+    parser.add_argument('--output', help='Output file (default: stdout; required for parquet)')
+    parser.add_argument('--columns', nargs='*', choices=list(EXPORT_COLUMNS), metavar='COLUMN',
+                        help=f"Columns to export (default: all except {', '.join(BLOB_COLUMNS)})")
+    parser.add_argument('--no-blobs', action='store_true', help='Drop the large text columns even if listed in --columns')
+    parser.add_argument('--valid-only', action='store_true', help='Skip invalid attempts (error_enum 1, 6, 7)')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='Rows per chunk (default: %(default)s)')
+    args = parser.parse_args()
+
+    columns = args.columns or DEFAULT_COLUMNS
+    if args.no_blobs:
+        columns = [column for column in columns if column not in BLOB_COLUMNS]
+    if args.format == 'parquet':
+        if not parquet_available():
+            raise SystemExit("Parquet export needs pyarrow: pip install pyarrow")
+        if not args.output:
+            raise SystemExit("--output is required for parquet")
+
+    conn = sqlite3.connect(args.db)
+    if conn.execute("SELECT 1 FROM runs WHERE run_id = ?", (args.run_id,)).fetchone() is None:
+        raise SystemExit(f"Run {args.run_id} not found")
+
+    if args.format == 'parquet':
+        rows = export_run(conn, args.run_id, 'parquet', args.output, columns, args.valid_only, args.chunksize)
+    elif args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as out:
+            rows = export_run(conn, args.run_id, args.format, out, columns, args.valid_only, args.chunksize)
+    else:
+        rows = export_run(conn, args.run_id, args.format, sys.stdout, columns, args.valid_only, args.chunksize)
+    log(f"Exported {rows} results ({len(columns)} columns) from run {args.run_id}" + (f" to {args.output}" if args.output else ""))
+
+if __name__ == "__main__":
+    main()
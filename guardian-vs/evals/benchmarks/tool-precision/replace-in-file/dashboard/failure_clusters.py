@@ -0,0 +1,207 @@
+"""
+Cluster near-identical failed outputs with MinHash signatures and LSH banding.
+
+Each failed result's text (the raw model output, or just its SEARCH blocks) is turned
+into token 3-gram shingles and a fixed-length MinHash signature. Signatures are stored in
+the failure_signatures table, so a new run only signs its own results. Clustering bands
+the signatures: results that agree on every row of at least one band land in the same
+bucket, and buckets are merged with a NumPy union-find. Nothing is compared pairwise.
+"""
+
+import re
+import zlib
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils import get_database_connection, extract_diff
+from search_locator import parse_search_blocks
+
+NUM_PERMUTATIONS = 128
+# 16 bands of 8 rows: pairs above ~0.7 Jaccard similarity almost always share a band
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // NUM_BANDS
+SHINGLE_SIZE = 3
+# Long outputs are mostly repeated file content; the start carries the failure pattern
+MAX_TEXT_CHARS = 20000
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.default_rng(20250626)  # fixed seed: stored signatures must stay comparable
+PERMUTATION_A = _rng.integers(1, 1 << 31, NUM_PERMUTATIONS, dtype=np.uint64)
+PERMUTATION_B = _rng.integers(0, 1 << 31, NUM_PERMUTATIONS, dtype=np.uint64)
+
+TOKEN_RE = re.compile(r'\w+|[^\w\s]')
+
+SOURCES = {
+    'output': "Raw model output",
+    'search': "Failed SEARCH blocks",
+}
+
+FAILURE_SIGNATURES_DDL = """
+CREATE TABLE IF NOT EXISTS failure_signatures (
+    result_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (result_id, source),
+    FOREIGN KEY (result_id) REFERENCES results(result_id)
+)
+"""
+
+def failure_text(source, raw_model_output, parsed_tool_call_json):
+    """Text that gets signed for a result, or None if the source doesn't apply"""
+    if source == 'output':
+        return raw_model_output or None
+    diff = extract_diff(parsed_tool_call_json)
+    if diff is None:
+        return None
+    blocks = parse_search_blocks(diff)
+    return '\n'.join('\n'.join(block) for block in blocks) or None
+
+def shingle_hashes(text):
+    """32-bit hashes of the token 3-grams of a text"""
+    tokens = TOKEN_RE.findall(text[:MAX_TEXT_CHARS].lower())
+    if not tokens:
+        return np.zeros(1, dtype=np.uint64)
+    token_hashes = np.fromiter((zlib.crc32(token.encode('utf-8')) for token in tokens), dtype=np.uint64, count=len(tokens))
+    if len(token_hashes) < SHINGLE_SIZE:
+        return token_hashes
+    # Combine consecutive token hashes into one 32-bit shingle hash (wraps in uint64)
+    shingles = token_hashes[:-2] * np.uint64(1000003) ** np.uint64(2) + token_hashes[1:-1] * np.uint64(1000003) + token_hashes[2:]
+    return np.unique(shingles & np.uint64(0xFFFFFFFF))
+
+def minhash_signature(text):
+    """MinHash signature (uint32[NUM_PERMUTATIONS]) of a text"""
+    shingles = shingle_hashes(text)
+    # (a * x + b) mod p for every permutation/shingle pair; a, b < 2^31 and x < 2^32 keep it inside uint64
+    hashed = (PERMUTATION_A[:, None] * shingles[None, :] + PERMUTATION_B[:, None]) % MERSENNE_PRIME
+    return hashed.min(axis=1).astype(np.uint32)
+
+def update_failure_signatures(source, batch_size=500):
+    """Sign failed results that don't have a signature for this source yet; returns how many were added"""
+    conn = get_database_connection()
+    conn.execute(FAILURE_SIGNATURES_DDL)
+
+    # Paged by result_id so only one batch of model outputs is in memory at a time
+    added = 0
+    last_result_id = ''
+    while True:
+        batch = conn.execute(
+            """
+            SELECT res.result_id, res.raw_model_output, res.parsed_tool_call_json
+            FROM results res
+            LEFT JOIN failure_signatures fs ON fs.result_id = res.result_id AND fs.source = ?
+            WHERE res.succeeded = 0 AND fs.result_id IS NULL AND res.result_id > ?
+            ORDER BY res.result_id
+            LIMIT ?
+            """,
+            (source, last_result_id, batch_size)
+        ).fetchall()
+        if not batch:
+            break
+        last_result_id = batch[-1][0]
+        rows = []
+        for result_id, raw_model_output, parsed_tool_call_json in batch:
+            text = failure_text(source, raw_model_output, parsed_tool_call_json)
+            # Results with nothing to sign get an empty signature so they are not re-read next time
+            signature = minhash_signature(text).tobytes() if text else b''
+            rows.append((result_id, source, signature))
+        with conn:
+            conn.executemany("INSERT OR IGNORE INTO failure_signatures (result_id, source, signature) VALUES (?, ?, ?)", rows)
+        added += len(rows)
+    return added
+
+def lsh_clusters(signatures):
+    """Cluster labels for a (n, NUM_PERMUTATIONS) signature matrix via LSH banding + union-find"""
+    n = len(signatures)
+    labels = np.arange(n)
+    if n < 2:
+        return labels
+
+    # One integer bucket id per (result, band)
+    bands = np.ascontiguousarray(signatures).reshape(n, NUM_BANDS, ROWS_PER_BAND)
+    bucket_ids = []
+    for band in range(NUM_BANDS):
+        band_rows = np.ascontiguousarray(bands[:, band, :]).view(np.dtype((np.void, ROWS_PER_BAND * 4))).ravel()
+        _, inverse = np.unique(band_rows, return_inverse=True)
+        bucket_ids.append(inverse.ravel())
+
+    # Label propagation: every bucket pulls its members down to the smallest label in it
+    while True:
+        previous = labels.copy()
+        for inverse in bucket_ids:
+            bucket_min = np.full(inverse.max() + 1, n)
+            np.minimum.at(bucket_min, inverse, labels)
+            labels = np.minimum(labels, bucket_min[inverse])
+            labels = labels[labels]  # pointer jumping
+        if np.array_equal(labels, previous):
+            return labels
+
+def pick_representative(signatures):
+    """Member whose signature agrees most with the others (sampled for large clusters)"""
+    if len(signatures) <= 2:
+        return 0
+    candidates = signatures[:500]
+    sample = signatures[np.linspace(0, len(signatures) - 1, min(len(signatures), 50)).astype(int)]
+    agreement = (candidates[:, None, :] == sample[None, :, :]).mean(axis=(1, 2))
+    return int(agreement.argmax())
+
+@st.cache_data
+def load_failure_clusters(model_id, run_ids, source, signature_count):
+    """Ranked failure clusters for one model over the given runs.
+
+    `signature_count` only keys the cache: it changes whenever new results are signed.
+    """
+    conn = get_database_connection()
+    placeholders = ', '.join('?' for _ in run_ids)
+    signed_df = pd.read_sql_query(
+        f"""
+        SELECT res.result_id, res.run_id, c.task_id, res.error_enum, fs.signature
+        FROM results res
+        JOIN cases c ON res.case_id = c.case_id
+        JOIN failure_signatures fs ON fs.result_id = res.result_id AND fs.source = ?
+        WHERE res.model_id = ? AND c.run_id IN ({placeholders}) AND res.succeeded = 0
+          AND length(fs.signature) > 0
+        ORDER BY res.created_at DESC
+        """,
+        conn,
+        params=(source, model_id, *run_ids)
+    )
+    if signed_df.empty:
+        return signed_df, pd.DataFrame()
+
+    signatures = np.frombuffer(b''.join(signed_df['signature']), dtype=np.uint32).reshape(len(signed_df), NUM_PERMUTATIONS)
+    signed_df = signed_df.drop(columns='signature')
+    signed_df['cluster'] = lsh_clusters(signatures)
+
+    clusters = []
+    for label, members in signed_df.groupby('cluster').groups.items():
+        positions = signed_df.index.get_indexer(members)
+        member_signatures = signatures[positions]
+        representative = pick_representative(member_signatures)
+        clusters.append({
+            'cluster': label,
+            'failures': len(positions),
+            'share': len(positions) / len(signed_df),
+            'runs': signed_df['run_id'].iloc[positions].nunique(),
+            'tasks': signed_df['task_id'].iloc[positions].nunique(),
+            'similarity': float((member_signatures == member_signatures[representative]).mean()),
+            'representative_result_id': signed_df['result_id'].iloc[positions[representative]],
+            'error_enums': ', '.join(sorted({str(int(e)) for e in signed_df['error_enum'].iloc[positions].dropna()})) or 'none',
+        })
+    clusters_df = pd.DataFrame(clusters).sort_values(['failures', 'tasks'], ascending=False).reset_index(drop=True)
+    clusters_df.insert(0, 'rank', np.arange(1, len(clusters_df) + 1))
+    return signed_df, clusters_df
+
+@st.cache_data(ttl=300)
+def refresh_failure_signatures(source):
+    """Sign any new failures (at most every few minutes) and return the signature count for the source"""
+    update_failure_signatures(source)
+    conn = get_database_connection()
+    return conn.execute("SELECT COUNT(*) FROM failure_signatures WHERE source = ?", (source,)).fetchone()[0]
+
+def load_failure_text(result_id, source):
+    conn = get_database_connection()
+    row = conn.execute(
+        "SELECT raw_model_output, parsed_tool_call_json FROM results WHERE result_id = ?", (result_id,)
+    ).fetchone()
+    return failure_text(source, *row) if row else None
@@ -0,0 +1,136 @@
+"""
+Flakiness of each (case, model) pair: does it fail consistently or flip between outcomes?
+
+A case that always fails costs one attempt to learn about; one that passes half the time
+eats the attempt budget. Scores are computed over valid attempts from result_rollups,
+which already hold per-run attempt and success counts for every (task, model) and are
+refreshed incrementally (only new or changed runs are re-summarized), so no pass over
+results is needed here.
+
+Per (task, model):
+- entropy: binary entropy of the pooled success rate, in bits (0 = always the same
+  outcome, 1 = a coin flip). This is the flakiness score.
+- attempt_variance: sample variance of the 0/1 outcomes over all attempts.
+- between_run_share: the share of that variance explained by differences between
+  runs' success rates. Near 1 means the outcome changed between runs (a prompt or
+  algorithm change), near 0 means it flips within a run.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils import get_database_connection, compact_dtypes
+from frame_cache import cached_frame
+
+# Pairs with fewer valid attempts than this get no score; two attempts can't tell flaky from unlucky
+MIN_ATTEMPTS = 3
+
+# Entropy above this (success rate roughly between 11% and 89%) counts as flaky
+FLAKY_ENTROPY = 0.5
+
+@st.cache_data
+def load_run_outcomes(rollup_version):
+    """Valid attempts and successes per (run, task, model) from the rollups; rollup_version keys the cache"""
+    return query_run_outcomes(get_database_connection())
+
+def query_run_outcomes(conn, run_id=None):
+    """load_run_outcomes on a given connection, optionally for one run (the static site export scores each run)"""
+    where, params = ("AND run_id = ?", (run_id,)) if run_id else ("", ())
+    return compact_dtypes(pd.read_sql_query(f"""
+    SELECT run_id, task_id, model_id, SUM(attempts) AS attempts, SUM(successes) AS successes
+    FROM result_rollups
+    WHERE is_valid = 1 {where}
+    GROUP BY run_id, task_id, model_id
+    """, conn, params=params))
+
+def binary_entropy(p):
+    """H(p) in bits, 0 at p = 0 and p = 1"""
+    p = np.clip(np.asarray(p, dtype=np.float64), 0.0, 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        h = -(p * np.log2(p) + (1 - p) * np.log2(1 - p))
+    return np.nan_to_num(h, nan=0.0)
+
+def classify(success_rate, entropy):
+    return np.select(
+        [success_rate == 0, success_rate == 1, entropy >= FLAKY_ENTROPY, success_rate < 0.5],
+        ['always fails', 'always passes', 'flaky', 'mostly fails'],
+        default='mostly passes'
+    )
+
+def flakiness_scores(outcomes_df, min_attempts=MIN_ATTEMPTS):
+    """One row per (task, model) with enough valid attempts, most flaky first"""
+    if outcomes_df.empty:
+        return pd.DataFrame()
+    pair_codes, pairs = pd.factorize(pd.MultiIndex.from_arrays([
+        outcomes_df['task_id'].astype(str), outcomes_df['model_id'].astype(str)
+    ]))
+    num_pairs = len(pairs)
+    run_attempts = outcomes_df['attempts'].to_numpy(dtype=np.float64)
+    run_successes = outcomes_df['successes'].to_numpy(dtype=np.float64)
+
+    attempts = np.bincount(pair_codes, weights=run_attempts, minlength=num_pairs)
+    successes = np.bincount(pair_codes, weights=run_successes, minlength=num_pairs)
+    rate = successes / attempts
+
+    # Weighted spread of per-run success rates around the pooled rate, next to the
+    # total Bernoulli variance p(1 - p); their ratio is the between-run share
+    run_rate = run_successes / run_attempts
+    between = np.bincount(pair_codes, weights=run_attempts * (run_rate - rate[pair_codes]) ** 2, minlength=num_pairs) / attempts
+    total = rate * (1 - rate)
+    num_runs = np.bincount(pair_codes, minlength=num_pairs)
+    mixed_runs = np.bincount(pair_codes, weights=(run_successes > 0) & (run_successes < run_attempts), minlength=num_pairs)
+
+    entropy = binary_entropy(rate)
+    scores = pd.DataFrame({
+        'task_id': pairs.get_level_values(0),
+        'model_id': pairs.get_level_values(1),
+        'valid_attempts': attempts.astype(np.int64),
+        'successes': successes.astype(np.int64),
+        'success_rate': rate,
+        'entropy': entropy,
+        'attempt_variance': total * attempts / np.maximum(attempts - 1, 1),
+        'between_run_share': np.divide(between, total, out=np.zeros(num_pairs), where=total > 0),
+        'num_runs': num_runs,
+        'mixed_runs': mixed_runs.astype(np.int64),
+        'pattern': classify(rate, entropy),
+    })
+    scores = scores[scores['valid_attempts'] >= min_attempts]
+    return scores.sort_values(['entropy', 'valid_attempts'], ascending=False).reset_index(drop=True)
+
+def case_flakiness(scores):
+    """Per task: the flakiest model's score and how many models flip on it"""
+    if scores.empty:
+        return pd.DataFrame(columns=['task_id', 'max_entropy', 'flaky_models'])
+    return scores.assign(is_flaky=scores['pattern'] == 'flaky').groupby('task_id').agg(
+        max_entropy=('entropy', 'max'),
+        flaky_models=('is_flaky', 'sum'),
+    ).reset_index()
+
+@cached_frame
+def load_pair_attempts(task_id, model_id, rollup_version):
+    """Every valid attempt of one model on one task across runs, newest first, with what the result view needs"""
+    conn = get_database_connection()
+    query = """
+    SELECT
+        res.*,
+        c.task_id,
+        c.description as case_description,
+        c.tokens_in_context,
+        r.description as run_description,
+        sp.name as system_prompt_name,
+        pf.name as processing_functions_name,
+        orig_f.filepath as original_filepath,
+        orig_f.content as original_file_content,
+        edit_f.filepath as edited_filepath,
+        edit_f.content as edited_file_content
+    FROM results res
+    JOIN cases c ON res.case_id = c.case_id
+    JOIN runs r ON res.run_id = r.run_id
+    LEFT JOIN system_prompts sp ON c.system_prompt_hash = sp.hash
+    LEFT JOIN processing_functions pf ON res.processing_functions_hash = pf.hash
+    LEFT JOIN files orig_f ON c.file_hash = orig_f.hash
+    LEFT JOIN files edit_f ON res.file_edited_hash = edit_f.hash
+    WHERE c.task_id = ? AND res.model_id = ? AND res.is_valid
+    ORDER BY res.created_at DESC
+    """
+    return compact_dtypes(pd.read_sql_query(query, conn, params=(task_id, model_id)))
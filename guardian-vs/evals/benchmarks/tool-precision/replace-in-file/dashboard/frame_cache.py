@@ -0,0 +1,131 @@
+"""
+Memory-bounded cache for loader results.
+
+st.cache_data keeps every entry until it is cleared and has no notion of how big
+an entry is, so a few large drill-downs can push the server into swap. This cache
+measures each entry with DataFrame.memory_usage(deep=True) and evicts least
+recently used entries once the total goes over a byte budget.
+
+The budget defaults to 512 MB and can be set with DASHBOARD_CACHE_MAX_MB.
+Cached DataFrames are shared between sessions and must not be mutated in place.
+"""
+
+import os
+import sys
+import threading
+import functools
+from collections import OrderedDict
+import pandas as pd
+
+DEFAULT_MAX_MB = 512
+
+def estimate_bytes(value):
+    """Deep size of a cached value; tuples/lists of frames are summed"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_bytes(item) for item in value)
+    return sys.getsizeof(value)
+
+class FrameCache:
+    """Thread-safe LRU cache bounded by the total deep size of its entries"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size in bytes)
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return (found, value) and mark the entry as most recently used"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key][0]
+            self.misses += 1
+            return False, None
+
+    def contains(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key, value):
+        """Store a value, evicting older entries until it fits. Values bigger than the budget are not kept."""
+        size = estimate_bytes(value)
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return False
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            return True
+
+    def put_if_fits(self, key, value):
+        """Store a value only if it fits in the free space; never evicts. For speculative loads."""
+        size = estimate_bytes(value)
+        with self._lock:
+            if key in self._entries or self.current_bytes + size > self.max_bytes:
+                return False
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+# One cache per server process, shared by every session
+_cache = FrameCache(int(float(os.environ.get('DASHBOARD_CACHE_MAX_MB', DEFAULT_MAX_MB)) * 1024 * 1024))
+
+def get_frame_cache():
+    return _cache
+
+def make_key(func, args, kwargs):
+    return (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+
+def cached_frame(func):
+    """Decorator: cache a loader's return value in the shared, memory-bounded FrameCache.
+
+    Arguments must be hashable. The wrapped function gets `.clear()` (drops the whole
+    cache), `.is_cached(*args, **kwargs)` and `.cache_key(*args, **kwargs)`, the key a
+    call with those arguments is stored under.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = make_key(func, args, kwargs)
+        found, value = _cache.get(key)
+        if found:
+            return value
+        value = func(*args, **kwargs)
+        _cache.put(key, value)
+        return value
+
+    wrapper.clear = _cache.clear
+    wrapper.is_cached = lambda *args, **kwargs: _cache.contains(make_key(func, args, kwargs))
+    wrapper.cache_key = lambda *args, **kwargs: make_key(func, args, kwargs)
+    return wrapper
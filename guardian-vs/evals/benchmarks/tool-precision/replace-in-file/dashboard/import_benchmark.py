@@ -0,0 +1,141 @@
+"""
+Cold-start import benchmark for the dashboard.
+
+Imports each dashboard entry module in a fresh interpreter with `python -X importtime`,
+repeats a few times and reports the median cumulative import time plus the heaviest
+direct imports. Results can be saved as a baseline and later runs compared against
+it, so cold-start time can be tracked as a regression metric.
+
+Usage (from the dashboard directory):
+    python import_benchmark.py                          # print timings
+    python import_benchmark.py --save baseline.json     # record a baseline
+    python import_benchmark.py --baseline baseline.json --max-regression 15
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+DASHBOARD_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Importing app.py runs its top level (page config + definitions) but not main()
+DEFAULT_MODULES = ['app']
+
+# Heavy modules that should only load once something is actually drawn.
+# (streamlit itself pulls in plotly.graph_objects for st.plotly_chart, but not plotly.express.)
+LAZY_MODULES = ['plotly.express', 'plotly.subplots', 'difflib']
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into (module, self_us, cumulative_us, depth) tuples"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+def measure_once(module):
+    """Import a module in a fresh interpreter and return its importtime entries"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=DASHBOARD_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+    return parse_importtime(completed.stderr)
+
+def module_breakdown(entries, module):
+    """Return (cumulative_us, {direct import: cumulative_us}) for the benchmarked module.
+
+    importtime lists children before their parent, so the depth-1 entries seen since the
+    previous top-level entry are the module's direct imports.
+    """
+    children = {}
+    for name, _, cumulative, depth in entries:
+        if depth == 1:
+            children[name] = cumulative
+        elif depth == 0:
+            if name == module:
+                return cumulative, children
+            children = {}
+    raise RuntimeError(f"No importtime entry found for {module}")
+
+def benchmark_module(module, repeat):
+    totals = []
+    direct_imports = {}
+    loaded = set()
+    for _ in range(repeat):
+        entries = measure_once(module)
+        total, children = module_breakdown(entries, module)
+        totals.append(total)
+        for name, cumulative in children.items():
+            direct_imports.setdefault(name, []).append(cumulative)
+        loaded.update(name for name, _, _, _ in entries)
+
+    heaviest = sorted(
+        ((name, statistics.median(times)) for name, times in direct_imports.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    return {
+        'median_ms': statistics.median(totals) / 1000,
+        'min_ms': min(totals) / 1000,
+        'heaviest': [(name, us / 1000) for name, us in heaviest[:10]],
+        'eager_lazy_modules': sorted(m for m in LAZY_MODULES if m in loaded),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure dashboard cold-start import time')
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help='Modules to import (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per module (default: %(default)s)')
+    parser.add_argument('--save', help='Write the results to this JSON file')
+    parser.add_argument('--baseline', help='Compare against a JSON file written by --save')
+    parser.add_argument('--max-regression', type=float, default=20.0,
+                        help='Fail if a module is this many percent slower than the baseline (default: %(default)s)')
+    args = parser.parse_args()
+
+    results = {}
+    for module in args.modules:
+        result = benchmark_module(module, args.repeat)
+        results[module] = result
+        print(f"{module}: median {result['median_ms']:.0f} ms, min {result['min_ms']:.0f} ms ({args.repeat} runs)")
+        for name, ms in result['heaviest']:
+            print(f"    {ms:8.1f} ms  {name}")
+        if result['eager_lazy_modules']:
+            print(f"    warning: imported eagerly: {', '.join(result['eager_lazy_modules'])}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({module: {'median_ms': r['median_ms']} for module, r in results.items()}, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressed = False
+        for module, result in results.items():
+            if module not in baseline:
+                continue
+            before = baseline[module]['median_ms']
+            change = (result['median_ms'] - before) / before * 100 if before else 0.0
+            print(f"{module}: {before:.0f} ms -> {result['median_ms']:.0f} ms ({change:+.1f}%)")
+            if change > args.max_regression:
+                regressed = True
+        if regressed:
+            print(f"Import time regressed by more than {args.max_regression:.0f}%")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
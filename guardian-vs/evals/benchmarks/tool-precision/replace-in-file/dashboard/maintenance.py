@@ -0,0 +1,315 @@
+"""
+Maintenance CLI for evals.db.
+
+evals.db only grows: every attempt's raw output and every edited file is kept
+forever. This script keeps the working database small and the query planner's
+statistics fresh.
+
+Usage (from the dashboard directory):
+    python maintenance.py archive --before 2025-06-01 --archive-db ../evals-archive.db
+    python maintenance.py prune-files
+    python maintenance.py optimize [--vacuum | --vacuum-into ../evals-compact.db]
+    python maintenance.py report
+"""
+
+import os
+import sys
+import sqlite3
+import argparse
+from datetime import datetime, timedelta, timezone
+from utils import get_database_path
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'database', 'schema.sql')
+
+# Representative dashboard queries, used to show which indexes the planner picks
+HOT_QUERIES = {
+    'run model summary': """
+        SELECT res.model_id, COUNT(*), AVG(res.succeeded), AVG(res.time_round_trip_ms)
+        FROM results res
+        WHERE res.run_id = :run_id AND res.is_valid
+        GROUP BY res.model_id
+    """,
+    'model drill-down': """
+        SELECT res.result_id FROM results res JOIN cases c ON res.case_id = c.case_id
+        WHERE res.run_id = :run_id AND res.model_id = :model_id
+        ORDER BY res.created_at DESC
+    """,
+    'case health': """
+        SELECT c.task_id, COUNT(r.result_id) FROM cases c JOIN results r ON c.case_id = r.case_id
+        GROUP BY c.task_id
+    """,
+    'latest run': "SELECT run_id FROM runs ORDER BY created_at DESC LIMIT 1",
+    'model history': """
+        SELECT res.result_id FROM results res
+        WHERE res.model_id = :model_id
+        ORDER BY res.created_at DESC LIMIT 50
+    """,
+}
+
+ARCHIVED_RUNS_DDL = """
+CREATE TABLE IF NOT EXISTS main.archived_runs (
+    run_id TEXT PRIMARY KEY,
+    created_at DATETIME,
+    description TEXT,
+    system_prompt_hash TEXT,
+    num_cases INTEGER,
+    num_results INTEGER,
+    archive_path TEXT NOT NULL,
+    archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+def log(message):
+    print(message, file=sys.stderr)
+
+def format_bytes(num_bytes):
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(num_bytes) < 1024 or unit == 'GB':
+            return f"{num_bytes:.1f} {unit}" if unit != 'B' else f"{num_bytes} B"
+        num_bytes /= 1024
+
+def get_storage_stats(conn, db_path):
+    """Return file size (including WAL) plus page-level usage for the main database"""
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    file_size = sum(os.path.getsize(p) for p in (db_path, db_path + '-wal') if os.path.exists(p))
+    return {
+        'file_bytes': file_size,
+        'used_bytes': (page_count - freelist_count) * page_size,
+        'free_bytes': freelist_count * page_size,
+    }
+
+def print_storage_delta(before, after):
+    log(f"  File size:   {format_bytes(before['file_bytes'])} -> {format_bytes(after['file_bytes'])}")
+    log(f"  Live data:   {format_bytes(before['used_bytes'])} -> {format_bytes(after['used_bytes'])} "
+        f"({format_bytes(before['used_bytes'] - after['used_bytes'])} reclaimed)")
+    if after['free_bytes']:
+        log(f"  Free pages:  {format_bytes(after['free_bytes'])} (run `optimize --vacuum` to return them to the OS)")
+
+def table_columns(conn, table, schema='main'):
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+def ensure_schema(db_path):
+    """Create the evals schema in a fresh database file"""
+    conn = sqlite3.connect(db_path)
+    try:
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'results'").fetchone()
+        if not exists:
+            with open(SCHEMA_PATH) as f:
+                conn.executescript(f.read())
+    finally:
+        conn.close()
+
+def copy_rows(conn, table, where_clause):
+    """Copy matching rows from main into the attached archive, using the columns both sides share"""
+    archive_columns = set(table_columns(conn, table, 'archive'))
+    columns = ', '.join(c for c in table_columns(conn, table) if c in archive_columns)
+    cursor = conn.execute(
+        f"INSERT OR IGNORE INTO archive.{table} ({columns}) SELECT {columns} FROM main.{table} WHERE {where_clause}"
+    )
+    return cursor.rowcount
+
+def archive_runs(conn, db_path, cutoff, archive_path, dry_run=False):
+    """Move runs created before `cutoff` into `archive_path`, leaving a row in archived_runs behind"""
+    runs = conn.execute(
+        "SELECT run_id, created_at, description FROM runs WHERE created_at < ? ORDER BY created_at",
+        (cutoff,)
+    ).fetchall()
+
+    if not runs:
+        log(f"No runs created before {cutoff}.")
+        return
+
+    log(f"{len(runs)} run(s) created before {cutoff}:")
+    for run_id, created_at, description in runs:
+        log(f"  {created_at}  {run_id}  {description or ''}")
+
+    if dry_run:
+        log("Dry run, nothing archived.")
+        return
+
+    before = get_storage_stats(conn, db_path)
+    ensure_schema(archive_path)
+    conn.execute("ATTACH DATABASE ? AS archive", (os.path.abspath(archive_path),))
+
+    try:
+        with conn:
+            conn.execute(ARCHIVED_RUNS_DDL)
+            conn.execute("DROP TABLE IF EXISTS temp.runs_to_archive")
+            conn.execute("CREATE TEMP TABLE runs_to_archive AS SELECT run_id FROM runs WHERE created_at < ?", (cutoff,))
+
+            in_runs = "run_id IN (SELECT run_id FROM temp.runs_to_archive)"
+            case_in_runs = f"case_id IN (SELECT case_id FROM main.cases WHERE {in_runs})"
+
+            # Referenced content first, so the archive is self-contained
+            copy_rows(conn, 'system_prompts', f"""
+                hash IN (SELECT system_prompt_hash FROM main.runs WHERE {in_runs})
+                OR hash IN (SELECT system_prompt_hash FROM main.cases WHERE {in_runs})
+            """)
+            copy_rows(conn, 'processing_functions', f"""
+                hash IN (SELECT processing_functions_hash FROM main.results WHERE {in_runs} OR {case_in_runs})
+            """)
+            copy_rows(conn, 'files', f"""
+                hash IN (SELECT file_hash FROM main.cases WHERE {in_runs})
+                OR hash IN (SELECT file_edited_hash FROM main.results WHERE {in_runs} OR {case_in_runs})
+            """)
+            copy_rows(conn, 'runs', in_runs)
+            num_cases = copy_rows(conn, 'cases', in_runs)
+            num_results = copy_rows(conn, 'results', f"{in_runs} OR {case_in_runs}")
+
+            conn.execute("""
+                INSERT OR REPLACE INTO main.archived_runs
+                    (run_id, created_at, description, system_prompt_hash, num_cases, num_results, archive_path)
+                SELECT r.run_id, r.created_at, r.description, r.system_prompt_hash,
+                    (SELECT COUNT(*) FROM main.cases c WHERE c.run_id = r.run_id),
+                    (SELECT COUNT(*) FROM main.results res WHERE res.run_id = r.run_id),
+                    ?
+                FROM main.runs r
+                WHERE r.run_id IN (SELECT run_id FROM temp.runs_to_archive)
+            """, (os.path.abspath(archive_path),))
+
+            # Derived data, not archived; it is rebuilt if the runs are ever restored
+            if conn.execute("SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = 'failure_signatures'").fetchone():
+                conn.execute(f"""
+                    DELETE FROM main.failure_signatures
+                    WHERE result_id IN (SELECT result_id FROM main.results WHERE {in_runs} OR {case_in_runs})
+                """)
+            conn.execute(f"DELETE FROM main.results WHERE {in_runs} OR {case_in_runs}")
+            conn.execute(f"DELETE FROM main.cases WHERE {in_runs}")
+            conn.execute(f"DELETE FROM main.runs WHERE {in_runs}")
+    finally:
+        conn.execute("DETACH DATABASE archive")
+
+    log(f"Archived {len(runs)} run(s), {num_cases} case(s) and {num_results} result(s) to {archive_path}.")
+    prune_orphaned_files(conn, db_path)
+    print_storage_delta(before, get_storage_stats(conn, db_path))
+
+def prune_orphaned_files(conn, db_path):
+    """Delete `files` rows no case or result references any more"""
+    before = get_storage_stats(conn, db_path)
+    with conn:
+        cursor = conn.execute("""
+            DELETE FROM files
+            WHERE hash NOT IN (SELECT file_hash FROM cases WHERE file_hash IS NOT NULL)
+              AND hash NOT IN (SELECT file_edited_hash FROM results WHERE file_edited_hash IS NOT NULL)
+        """)
+    log(f"Deleted {cursor.rowcount} orphaned file row(s).")
+    if cursor.rowcount:
+        print_storage_delta(before, get_storage_stats(conn, db_path))
+
+def optimize(conn, db_path, vacuum=False, vacuum_into=None):
+    """Refresh planner statistics and optionally compact the database"""
+    before = get_storage_stats(conn, db_path)
+
+    log("Running ANALYZE...")
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA optimize")
+    conn.commit()
+
+    if vacuum_into:
+        if os.path.exists(vacuum_into):
+            raise SystemExit(f"Refusing to overwrite existing file: {vacuum_into}")
+        log(f"Writing compacted copy to {vacuum_into}...")
+        conn.execute("VACUUM INTO ?", (vacuum_into,))
+        log(f"  {format_bytes(before['file_bytes'])} -> {format_bytes(os.path.getsize(vacuum_into))}")
+    elif vacuum:
+        log("Running VACUUM...")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+        print_storage_delta(before, get_storage_stats(conn, db_path))
+
+def report(conn, db_path):
+    """Print table sizes, planner statistics and the indexes used by the dashboard's hot queries"""
+    stats = get_storage_stats(conn, db_path)
+    print(f"Database: {os.path.abspath(db_path)}")
+    print(f"  File size {format_bytes(stats['file_bytes'])}, live data {format_bytes(stats['used_bytes'])}, "
+          f"free pages {format_bytes(stats['free_bytes'])}")
+
+    print("\nTables:")
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+    )]
+    for table in tables:
+        count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        print(f"  {table:<24} {count:>10} rows")
+
+    has_stats = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+    print("\nIndex statistics (sqlite_stat1):")
+    if has_stats:
+        for tbl, idx, stat in conn.execute("SELECT tbl, idx, stat FROM sqlite_stat1 WHERE idx IS NOT NULL ORDER BY tbl, idx"):
+            # stat is "<rows> <avg rows per distinct key prefix>..."
+            print(f"  {tbl}.{idx:<32} {stat}")
+    else:
+        print("  none yet, run `python maintenance.py optimize`")
+
+    latest = conn.execute("""
+        SELECT res.run_id, res.model_id FROM results res
+        JOIN runs r ON res.run_id = r.run_id
+        ORDER BY r.created_at DESC LIMIT 1
+    """).fetchone() or ('', '')
+    params = {'run_id': latest[0], 'model_id': latest[1]}
+
+    used_indexes = set()
+    print("\nQuery plans for dashboard queries:")
+    for name, query in HOT_QUERIES.items():
+        print(f"  {name}:")
+        for _, _, _, detail in conn.execute(f"EXPLAIN QUERY PLAN {query}", params):
+            print(f"    {detail}")
+            for word in detail.replace('(', ' ').split():
+                if word.startswith(('idx_', 'sqlite_autoindex_')):
+                    used_indexes.add(word)
+
+    all_indexes = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name NOT LIKE 'sqlite_autoindex_%' ORDER BY name"
+    )]
+    unused = [idx for idx in all_indexes if idx not in used_indexes]
+    print(f"\nIndexes used by these queries: {', '.join(sorted(used_indexes)) or 'none'}")
+    print(f"Indexes not used by these queries: {', '.join(unused) or 'none'}")
+
+def parse_cutoff(args):
+    if args.before:
+        return args.before
+    return (datetime.now(timezone.utc) - timedelta(days=args.older_than_days)).strftime('%Y-%m-%d %H:%M:%S')
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintenance tasks for the diff edit evals database')
+    parser.add_argument('--db', default=get_database_path(), help='Path to evals.db (default: %(default)s)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    archive_parser = subparsers.add_parser('archive', help='Move old runs into a separate archive database')
+    cutoff_group = archive_parser.add_mutually_exclusive_group(required=True)
+    cutoff_group.add_argument('--before', help='Archive runs created before this date (YYYY-MM-DD[ HH:MM:SS], UTC)')
+    cutoff_group.add_argument('--older-than-days', type=int, help='Archive runs older than this many days')
+    archive_parser.add_argument('--archive-db', required=True, help='Archive database file (created if missing)')
+    archive_parser.add_argument('--dry-run', action='store_true', help='Only list the runs that would be archived')
+
+    subparsers.add_parser('prune-files', help='Delete files rows that no case or result references')
+
+    optimize_parser = subparsers.add_parser('optimize', help='Run ANALYZE / PRAGMA optimize, optionally VACUUM')
+    vacuum_group = optimize_parser.add_mutually_exclusive_group()
+    vacuum_group.add_argument('--vacuum', action='store_true', help='VACUUM the database in place')
+    vacuum_group.add_argument('--vacuum-into', help='Write a compacted copy to this path instead of vacuuming in place')
+
+    subparsers.add_parser('report', help='Show table sizes, index statistics and index usage')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        raise SystemExit(f"Database not found: {os.path.abspath(args.db)}")
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.command == 'archive':
+            archive_runs(conn, args.db, parse_cutoff(args), args.archive_db, dry_run=args.dry_run)
+        elif args.command == 'prune-files':
+            prune_orphaned_files(conn, args.db)
+        elif args.command == 'optimize':
+            optimize(conn, args.db, vacuum=args.vacuum, vacuum_into=args.vacuum_into)
+        elif args.command == 'report':
+            report(conn, args.db)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+In-place schema migrations for evals.db.
+
+database/schema.sql always describes the latest schema and stamps new databases with
+PRAGMA user_version = SCHEMA_VERSION. Databases created before a migration existed
+are upgraded here: each migration runs in its own transaction and bumps user_version,
+so running the migrator again is a no-op. After migrating, the query plans of the
+dashboard's hot queries are checked against the indexes they are meant to use.
+
+The dashboard runs pending migrations when it opens the database; the CLI does the
+same without starting Streamlit.
+
+Usage (from the dashboard directory):
+    python migrations.py             # upgrade evals.db and verify query plans
+    python migrations.py --check     # only report the version and query plans
+"""
+
+import sys
+import sqlite3
+import argparse
+from utils import get_database_path
+
+# Spelled-out form of results.is_valid; errors 1, 6 and 7 are no_tool_calls,
+# wrong_tool_call and wrong_file_edited, which say nothing about editing
+VALID_PREDICATE = "(error_enum IS NULL OR error_enum NOT IN (1, 6, 7))"
+
+def log(message):
+    print(message, file=sys.stderr)
+
+def result_columns(conn):
+    # table_xinfo, unlike table_info, lists generated columns
+    return {row[1] for row in conn.execute("PRAGMA table_xinfo(results)")}
+
+def add_is_valid(conn):
+    """Generated is_valid column, a partial index on valid attempts and covering outcome indexes.
+
+    ALTER TABLE can only add VIRTUAL generated columns (STORED needs a table rebuild);
+    the partial index stores which rows are valid, so filtering on is_valid is still an
+    index lookup. SQLite never treats an index as covering a query that reads a
+    generated column, though, so the covering indexes are on error_enum and aggregates
+    that want an index-only scan use VALID_PREDICATE instead of is_valid.
+    """
+    if 'is_valid' not in result_columns(conn):
+        conn.execute(f"ALTER TABLE results ADD COLUMN is_valid INTEGER GENERATED ALWAYS AS {VALID_PREDICATE} VIRTUAL")
+    # Valid attempts of a run (and model), for queries that read whole rows
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_results_valid_run_model ON results(run_id, model_id) WHERE is_valid")
+    # Per-run and per-case aggregates of success, latency and cost, answered from the index alone.
+    # They start with the same columns as idx_results_run_model / idx_results_case_model, which become redundant.
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_results_run_outcome
+        ON results(run_id, model_id, error_enum, succeeded, time_round_trip_ms, cost_usd)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_results_case_outcome
+        ON results(case_id, model_id, error_enum, succeeded, time_round_trip_ms, cost_usd)
+    """)
+    conn.execute("DROP INDEX IF EXISTS idx_results_run_model")
+    conn.execute("DROP INDEX IF EXISTS idx_results_case_model")
+
+# Uniform in [0, 1) from SQLite's 64-bit random()
+RANDOM_UNIT = "(random() / 18446744073709551616.0 + 0.5)"
+
+def add_sample_key(conn):
+    """Random results.sample_key for stratified sampling (sampling.py), filled in by a trigger on insert.
+
+    ALTER TABLE can't add a column with a random default, and the benchmark's inserts
+    don't name the column, so the trigger assigns keys to new rows.
+    """
+    if 'sample_key' not in result_columns(conn):
+        conn.execute("ALTER TABLE results ADD COLUMN sample_key REAL")
+    conn.execute(f"UPDATE results SET sample_key = {RANDOM_UNIT} WHERE sample_key IS NULL")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS results_sample_key AFTER INSERT ON results
+        WHEN NEW.sample_key IS NULL
+        BEGIN
+            UPDATE results SET sample_key = {RANDOM_UNIT} WHERE rowid = NEW.rowid;
+        END
+    """)
+    # A stratum's sample is a range scan: sample_key below its threshold, per (case, model)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_results_case_sample ON results(case_id, model_id, sample_key)")
+
+def add_model_created_index(conn):
+    """A model's attempts across every run in time order, for the Model History page"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_results_model_created ON results(model_id, created_at)")
+
+# (version, description, function); versions must be consecutive
+MIGRATIONS = [
+    (1, "results.is_valid with partial and covering indexes", add_is_valid),
+    (2, "results.sample_key for stratified sampling", add_sample_key),
+    (3, "index on results(model_id, created_at)", add_model_created_index),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Dashboard queries and the index use each one's plan must mention
+PLAN_CHECKS = {
+    'run model summary': ("""
+        SELECT model_id, COUNT(*), AVG(succeeded), AVG(time_to_first_token_ms), AVG(num_edits)
+        FROM results WHERE run_id = :run_id AND is_valid
+        GROUP BY model_id
+    """, 'INDEX idx_results_valid_run_model'),
+    'valid drill-down': ("""
+        SELECT * FROM results
+        WHERE run_id = :run_id AND model_id = :model_id AND is_valid
+    """, 'INDEX idx_results_valid_run_model'),
+    'round trip histogram': (f"""
+        SELECT model_id, time_round_trip_ms FROM results
+        WHERE run_id = :run_id AND time_round_trip_ms IS NOT NULL AND {VALID_PREDICATE}
+    """, 'COVERING INDEX idx_results_run_outcome'),
+    'case x model outcomes': (f"""
+        SELECT c.task_id, res.model_id, res.succeeded, res.time_round_trip_ms, res.cost_usd
+        FROM results res JOIN cases c ON res.case_id = c.case_id
+        WHERE c.run_id = :run_id AND {VALID_PREDICATE.replace('error_enum', 'res.error_enum')}
+    """, 'COVERING INDEX idx_results_case_outcome'),
+    'stratified sample': ("""
+        SELECT res.succeeded FROM cases c
+        JOIN results res ON res.case_id = c.case_id AND res.model_id = :model_id AND res.sample_key < 0.05
+        WHERE c.run_id = :run_id
+    """, 'INDEX idx_results_case_sample'),
+    'latest attempts of a model': ("""
+        SELECT result_id, run_id, succeeded, created_at FROM results
+        WHERE model_id = :model_id
+        ORDER BY created_at DESC LIMIT 50
+    """, 'INDEX idx_results_model_created'),
+}
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def pending_migrations(conn):
+    version = schema_version(conn)
+    return [migration for migration in MIGRATIONS if migration[0] > version]
+
+def migrate(conn):
+    """Apply pending migrations, one transaction each; returns the versions applied"""
+    applied = []
+    for version, description, apply in pending_migrations(conn):
+        log(f"Migrating evals.db to version {version}: {description}")
+        conn.execute("BEGIN")
+        try:
+            apply(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        applied.append(version)
+    if applied:
+        # Fresh statistics so the planner weighs the new indexes properly
+        conn.execute("ANALYZE results")
+        conn.commit()
+    return applied
+
+def query_plan(conn, query, params):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+def verify_query_plans(conn):
+    """Returns {check name: (plan uses the expected index, plan lines)}"""
+    latest = conn.execute("""
+        SELECT res.run_id, res.model_id FROM results res
+        JOIN runs r ON res.run_id = r.run_id
+        ORDER BY r.created_at DESC LIMIT 1
+    """).fetchone() or ('', '')
+    params = {'run_id': latest[0], 'model_id': latest[1]}
+    outcomes = {}
+    for name, (query, index) in PLAN_CHECKS.items():
+        plan = query_plan(conn, query, params)
+        outcomes[name] = (any(index in detail for detail in plan), plan)
+    return outcomes
+
+def main():
+    parser = argparse.ArgumentParser(description='Upgrade evals.db to the current schema and verify query plans')
+    parser.add_argument('--db', default=get_database_path(), help='Path to evals.db (default: %(default)s)')
+    parser.add_argument('--check', action='store_true', help='Only report the schema version and query plans')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    version = schema_version(conn)
+    if args.check:
+        log(f"Schema version {version} (current {SCHEMA_VERSION}), {len(pending_migrations(conn))} migration(s) pending")
+        if version < SCHEMA_VERSION:
+            raise SystemExit(1)
+    else:
+        applied = migrate(conn)
+        log(f"Applied migration(s) {', '.join(map(str, applied))}" if applied else f"Already at version {version}")
+
+    failed = 0
+    for name, (ok, plan) in verify_query_plans(conn).items():
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+        for detail in plan:
+            print(f"       {detail}")
+        failed += not ok
+    if failed:
+        raise SystemExit(f"{failed} query plan(s) don't use the expected index")
+
+if __name__ == "__main__":
+    main()
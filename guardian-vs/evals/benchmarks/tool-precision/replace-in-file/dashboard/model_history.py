@@ -0,0 +1,122 @@
+"""
+One model's trajectory across every run it took part in.
+
+Each series is a single query over one model's rows: success and cost from
+result_rollups, round-trip percentiles from the latency_rollups histogram (both via
+their (model_id, run_id) indexes), and the latest individual attempts from results via
+idx_results_model_created. Runs are ordered by runs.created_at.
+
+A run can mix system prompts and diff-apply algorithms (replays add a
+processing_functions_hash), so each run's configuration is the set of names it used;
+config_changes marks the runs where that set differs from the model's previous run.
+"""
+
+import pandas as pd
+import streamlit as st
+from utils import get_database_connection
+from rollups import histogram_quantiles
+
+HISTORY_PERCENTILES = [0.5, 0.9, 0.99]
+
+@st.cache_data
+def load_history_models(rollup_version):
+    """Models with any rollup rows, with how many runs each appears in (rollup_version keys the cache)"""
+    conn = get_database_connection()
+    return pd.read_sql_query("""
+    SELECT model_id, COUNT(DISTINCT run_id) AS num_runs
+    FROM result_rollups
+    GROUP BY model_id
+    ORDER BY num_runs DESC, model_id
+    """, conn)
+
+def join_names(names):
+    return ', '.join(sorted({str(name) for name in names if pd.notna(name)})) or '–'
+
+@st.cache_data
+def load_model_runs(model_id, rollup_version):
+    """Per run of the model, oldest first: attempts, success rate on valid attempts, cost and configuration"""
+    conn = get_database_connection()
+    config_df = pd.read_sql_query("""
+    SELECT
+        ro.run_id,
+        r.created_at,
+        r.description,
+        COALESCE(sp.name, substr(ro.system_prompt_hash, 1, 12)) AS system_prompt_name,
+        COALESCE(pf.name, substr(ro.processing_functions_hash, 1, 12)) AS processing_functions_name,
+        SUM(ro.attempts) AS attempts,
+        SUM(CASE WHEN ro.is_valid = 1 THEN ro.attempts ELSE 0 END) AS valid_attempts,
+        SUM(CASE WHEN ro.is_valid = 1 THEN ro.successes ELSE 0 END) AS successes,
+        SUM(ro.total_cost_usd) AS total_cost_usd
+    FROM result_rollups ro
+    JOIN runs r ON ro.run_id = r.run_id
+    LEFT JOIN system_prompts sp ON ro.system_prompt_hash = sp.hash
+    LEFT JOIN processing_functions pf ON ro.processing_functions_hash = pf.hash
+    WHERE ro.model_id = ?
+    GROUP BY ro.run_id, ro.system_prompt_hash, ro.processing_functions_hash
+    """, conn, params=(model_id,))
+    if config_df.empty:
+        return config_df
+
+    runs_df = config_df.groupby('run_id', sort=False).agg(
+        created_at=('created_at', 'first'),
+        description=('description', 'first'),
+        system_prompts=('system_prompt_name', join_names),
+        processing_functions=('processing_functions_name', join_names),
+        attempts=('attempts', 'sum'),
+        valid_attempts=('valid_attempts', 'sum'),
+        successes=('successes', 'sum'),
+        total_cost_usd=('total_cost_usd', 'sum'),
+    ).reset_index().sort_values('created_at').reset_index(drop=True)
+    runs_df['success_rate'] = runs_df['successes'] / runs_df['valid_attempts'].where(runs_df['valid_attempts'] > 0)
+    runs_df['cost_per_attempt'] = runs_df['total_cost_usd'] / runs_df['attempts']
+    # All spend counts, including invalid attempts
+    runs_df['cost_per_success'] = runs_df['total_cost_usd'] / runs_df['successes'].where(runs_df['successes'] > 0)
+    runs_df['run_label'] = runs_df['description'].fillna(runs_df['run_id'].str[:8])
+    return runs_df
+
+@st.cache_data
+def load_model_latency(model_id, rollup_version):
+    """Round-trip percentiles of valid attempts per run of the model, from the latency histogram"""
+    conn = get_database_connection()
+    histogram_df = pd.read_sql_query("""
+    SELECT run_id, bucket, SUM(attempts) AS attempts
+    FROM latency_rollups
+    WHERE model_id = ?
+    GROUP BY run_id, bucket
+    """, conn, params=(model_id,))
+    if histogram_df.empty:
+        return pd.DataFrame(columns=['run_id'])
+    return pd.DataFrame({
+        f"p{q * 100:g}_round_trip_ms": histogram_quantiles(histogram_df, ['run_id'], q)
+        for q in HISTORY_PERCENTILES
+    }).reset_index()
+
+@st.cache_data(ttl=60)
+def load_latest_attempts(model_id, limit=50):
+    """The model's most recent attempts across runs, read straight from results (not the rollups)"""
+    conn = get_database_connection()
+    return pd.read_sql_query("""
+    SELECT res.created_at, res.run_id, c.task_id, res.succeeded, res.error_enum,
+           res.time_round_trip_ms, res.cost_usd
+    FROM results res
+    JOIN cases c ON res.case_id = c.case_id
+    WHERE res.model_id = ?
+    ORDER BY res.created_at DESC
+    LIMIT ?
+    """, conn, params=(model_id, limit))
+
+def config_changes(runs_df):
+    """Runs whose system prompts or diff-apply algorithms differ from the model's previous run"""
+    previous = runs_df[['system_prompts', 'processing_functions']].shift()
+    prompt_changed = runs_df['system_prompts'] != previous['system_prompts']
+    functions_changed = runs_df['processing_functions'] != previous['processing_functions']
+    changed = (prompt_changed | functions_changed) & previous['system_prompts'].notna()
+    changes = runs_df[changed].copy()
+    changes['change'] = [
+        '; '.join(
+            ([f"prompt: {row.system_prompts}"] if prompt else [])
+            + ([f"diff: {row.processing_functions}"] if functions else [])
+        )
+        for row, prompt, functions in zip(changes.itertuples(), prompt_changed[changed], functions_changed[changed])
+    ]
+    return changes
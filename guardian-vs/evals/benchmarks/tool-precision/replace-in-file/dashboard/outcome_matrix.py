@@ -0,0 +1,120 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass
+from utils import get_database_connection
+
+@dataclass
+class OutcomeMatrix:
+    """Sparse task_id x model_id outcome matrix for a single run.
+
+    Cells are stored in COO form: row/col are categorical codes into task_ids and
+    model_ids, and only (task, model) pairs that actually have valid attempts are kept.
+    """
+    task_ids: np.ndarray
+    model_ids: np.ndarray
+    rows: np.ndarray
+    cols: np.ndarray
+    attempts: np.ndarray
+    successes: np.ndarray
+    median_latency_ms: np.ndarray
+    total_cost_usd: np.ndarray
+
+    @property
+    def shape(self):
+        return len(self.task_ids), len(self.model_ids)
+
+    def success_rate(self):
+        return self.successes / np.maximum(self.attempts, 1)
+
+    def to_dense(self, values, fill_value=np.nan):
+        """Scatter per-cell values into a dense (tasks x models) array"""
+        dense = np.full(self.shape, fill_value, dtype=np.float64)
+        dense[self.rows, self.cols] = values
+        return dense
+
+    def to_frame(self):
+        """One row per non-empty cell, with task_id/model_id labels"""
+        return pd.DataFrame({
+            'task_id': self.task_ids[self.rows],
+            'model_id': self.model_ids[self.cols],
+            'attempts': self.attempts,
+            'successes': self.successes,
+            'success_rate': self.success_rate(),
+            'median_latency_ms': self.median_latency_ms,
+            'total_cost_usd': self.total_cost_usd,
+        })
+
+def build_outcome_matrix(outcomes_df):
+    """Build an OutcomeMatrix from per-attempt rows (task_id, model_id, succeeded, time_round_trip_ms, cost_usd)"""
+    task_codes, task_ids = pd.factorize(outcomes_df['task_id'], sort=True)
+    model_codes, model_ids = pd.factorize(outcomes_df['model_id'], sort=True)
+    num_models = len(model_ids)
+
+    # One row per observed (task, model) cell; median ignores missing latencies
+    cells = pd.DataFrame({
+        'cell': task_codes.astype(np.int64) * num_models + model_codes,
+        'succeeded': outcomes_df['succeeded'].to_numpy(dtype=np.int64),
+        'latency': outcomes_df['time_round_trip_ms'].to_numpy(dtype=np.float64),
+        'cost': outcomes_df['cost_usd'].to_numpy(dtype=np.float64),
+    }).groupby('cell', sort=True).agg(
+        attempts=('succeeded', 'size'),
+        successes=('succeeded', 'sum'),
+        median_latency=('latency', 'median'),
+        total_cost=('cost', 'sum'),
+    )
+    cell_codes = cells.index.to_numpy()
+
+    return OutcomeMatrix(
+        task_ids=np.asarray(task_ids, dtype=object),
+        model_ids=np.asarray(model_ids, dtype=object),
+        rows=(cell_codes // num_models).astype(np.int32),
+        cols=(cell_codes % num_models).astype(np.int32),
+        attempts=cells['attempts'].to_numpy(dtype=np.int32),
+        successes=cells['successes'].to_numpy(dtype=np.int32),
+        median_latency_ms=cells['median_latency'].to_numpy(dtype=np.float32),
+        total_cost_usd=cells['total_cost'].to_numpy(dtype=np.float64),
+    )
+
+@st.cache_data
+def load_outcome_matrix(run_id):
+    """Compute (once per run) the sparse case x model outcome matrix over valid attempts"""
+    conn = get_database_connection()
+
+    query = """
+    SELECT c.task_id, res.model_id, res.succeeded, res.time_round_trip_ms, res.cost_usd
+    FROM results res
+    JOIN cases c ON res.case_id = c.case_id
+    WHERE c.run_id = ?
+      AND (res.error_enum NOT IN (1, 6, 7) OR res.error_enum IS NULL)
+    """
+    outcomes_df = pd.read_sql_query(query, conn, params=(run_id,))
+
+    return build_outcome_matrix(outcomes_df)
+
+def order_rows(matrix, method="worst_first"):
+    """Return a row permutation of the matrix's tasks.
+
+    - worst_first: lowest mean success rate across models first
+    - task_id: alphabetical
+    - clustered: spectral ordering on the leading singular vector of the success-rate matrix,
+      which places tasks with similar per-model failure patterns next to each other
+    """
+    num_tasks = matrix.shape[0]
+    if method == "task_id" or num_tasks == 0:
+        return np.arange(num_tasks)
+
+    # Every task row has at least one observed cell, so the row mean is always defined
+    rates = matrix.to_dense(matrix.success_rate())
+    mean_rate = np.nanmean(rates, axis=1)
+
+    if method == "clustered" and rates.shape[1] > 1:
+        # Impute missing cells with the model's mean so they don't dominate the projection
+        col_mean = np.nan_to_num(np.nanmean(rates, axis=0), nan=0.0)
+        filled = np.where(np.isnan(rates), col_mean, rates)
+        centered = filled - filled.mean(axis=0)
+        _, _, vt = np.linalg.svd(centered, full_matrices=False)
+        projection = centered @ vt[0]
+        return np.lexsort((mean_rate, np.round(projection, 3)))
+
+    return np.lexsort((matrix.task_ids.astype(str), mean_rate))
@@ -2,7 +2,10 @@ import streamlit as st
 import pandas as pd
 import json
 import os # Need to import os for load_case_raw_data
-from utils import get_database_connection, guess_language_from_filepath # Absolute import
+from utils import get_database_connection, guess_language_from_filepath, compact_dtypes # Absolute import
+from rollups import ensure_rollups_fresh
+from flakiness import load_run_outcomes, flakiness_scores, case_flakiness, load_pair_attempts
+from components.result_detail import render_result_detail
 
 st.set_page_config(
     page_title="Case Health Inspector",
@@ -11,7 +14,15 @@ st.set_page_config(
 )
 
 st.title("Case Health Inspector")
-st.markdown("Identify test cases that are frequently problematic across different models and runs.")
+st.markdown("Identify test cases that are frequently problematic across different models and runs, "
+            "and tell cases that always fail from ones that flip between outcomes.")
+
+FLAKINESS_FORMAT = {
+    'success_rate': "{:.1%}",
+    'entropy': "{:.2f}",
+    'attempt_variance': "{:.3f}",
+    'between_run_share': "{:.0%}",
+}
 
 @st.cache_data
 def load_problematic_cases_summary():
@@ -25,8 +36,8 @@ def load_problematic_cases_summary():
             r.run_id,
             r.model_id,
             r.result_id,
-            (CASE WHEN (r.error_enum NOT IN (1, 6, 7) OR r.error_enum IS NULL) THEN 1 ELSE 0 END) AS is_valid_attempt,
-            (CASE WHEN (r.error_enum NOT IN (1, 6, 7) OR r.error_enum IS NULL) THEN r.succeeded ELSE NULL END) AS succeeded_on_valid
+            r.is_valid AS is_valid_attempt,
+            (CASE WHEN r.is_valid THEN r.succeeded ELSE NULL END) AS succeeded_on_valid
         FROM cases c
         JOIN results r ON c.case_id = r.case_id
         LEFT JOIN files f_orig ON c.file_hash = f_orig.hash -- Join to get original filepath
@@ -59,7 +70,7 @@ def load_problematic_cases_summary():
     ORDER BY percent_valid_attempts ASC, success_rate_on_valid ASC;
     """
     df = pd.read_sql_query(query, conn)
-    return df
+    return compact_dtypes(df)
 
 @st.cache_data
 def load_case_raw_data(task_id):
@@ -112,11 +123,19 @@ def render_problematic_cases_page():
         st.warning("No case summary data found. Run some evaluations first.")
         return
 
+    rollup_version = ensure_rollups_fresh()
+    scores = flakiness_scores(load_run_outcomes(rollup_version))
+    summary_df = summary_df.merge(case_flakiness(scores), on='task_id', how='left')
+
     st.markdown("### Cases Overview")
     st.dataframe(summary_df.style.format({
         "percent_valid_attempts": "{:.1f}%",
-        "success_rate_on_valid": "{:.1f}%"
-    }), use_container_width=True)
+        "success_rate_on_valid": "{:.1f}%",
+        "max_entropy": "{:.2f}",
+        "flaky_models": "{:.0f}",
+    }, na_rep="–"), use_container_width=True)
+
+    render_flaky_pairs(scores)
 
     st.markdown("---")
     st.markdown("### Case Drill Down")
@@ -176,8 +195,58 @@ def render_problematic_cases_page():
         else:
             st.error(f"Could not load raw JSON data for case: {selected_task_id}")
         
-        # Placeholder for more detailed stats (per-model performance on this case, error breakdown)
-        st.markdown("*(Further per-model statistics and error breakdowns for this case can be added here.)*")
+        render_case_flakiness(selected_task_id, scores, rollup_version)
+
+def render_flaky_pairs(scores):
+    """Per (case, model) outcome entropy, flakiest first"""
+    st.markdown("### Flaky Cases")
+    st.caption("Entropy of each model's outcomes on a case over all valid attempts in all runs: 0 bits means the same "
+               "outcome every time, 1 bit a coin flip. Between-run share near 100% means the outcome changed from run "
+               "to run rather than within runs.")
+    if scores.empty:
+        st.info("Not enough repeated valid attempts to score flakiness yet.")
+        return
+
+    patterns = ['flaky', 'mostly fails', 'mostly passes', 'always fails', 'always passes']
+    shown = st.multiselect("Patterns:", patterns, default=['flaky'])
+    flaky = scores[scores['pattern'].isin(shown)]
+    st.dataframe(flaky.style.format(FLAKINESS_FORMAT), use_container_width=True, hide_index=True)
+
+def render_case_flakiness(task_id, scores, rollup_version):
+    """Per-model flakiness on one case and the attempts that disagreed with the usual outcome"""
+    case_scores = scores[scores['task_id'] == task_id] if not scores.empty else scores
+    st.markdown("#### Outcome Consistency by Model")
+    if case_scores.empty:
+        st.info("No model has enough valid attempts on this case to score.")
+        return
+    st.dataframe(case_scores.drop(columns='task_id').style.format(FLAKINESS_FORMAT), use_container_width=True, hide_index=True)
+
+    # Flakiest model first
+    model_id = st.selectbox("Model:", case_scores['model_id'].tolist(), key="flaky_model")
+    attempts_df = load_pair_attempts(task_id, model_id, rollup_version)
+    if attempts_df.empty:
+        return
+    majority = attempts_df['succeeded'].mean() >= 0.5
+    disagrees = attempts_df['succeeded'].astype(bool) != majority
+    st.caption(f"{int(disagrees.sum())} of {len(attempts_df)} valid attempts "
+               f"{'failed' if majority else 'succeeded'}, against a usual outcome of {'success' if majority else 'failure'}.")
+
+    only_disagreeing = st.checkbox("Only attempts that disagreed", value=True, key="flaky_only_disagreeing")
+    shown = attempts_df[disagrees] if only_disagreeing else attempts_df
+    st.dataframe(
+        shown[['created_at', 'run_description', 'processing_functions_name', 'succeeded', 'error_enum', 'time_round_trip_ms', 'cost_usd']],
+        use_container_width=True,
+        hide_index=True
+    )
+    if shown.empty:
+        return
+
+    labels = {
+        index: f"{'✅' if row['succeeded'] else '❌'} {row['created_at']} ({row['run_description'] or row['run_id'][:8]})"
+        for index, row in shown.iterrows()
+    }
+    selected = st.selectbox("Inspect attempt:", list(labels), format_func=lambda index: labels[index], key="flaky_attempt")
+    render_result_detail(attempts_df.loc[selected])
 
 if __name__ == "__main__":
     render_problematic_cases_page()
@@ -0,0 +1,146 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from utils import get_database_connection
+from outcome_matrix import load_outcome_matrix, order_rows
+
+st.set_page_config(
+    page_title="Case x Model Matrix",
+    page_icon="🧮",
+    layout="wide"
+)
+
+st.title("Case x Model Outcome Matrix")
+st.markdown("See exactly which cases each model fails in a run. Cells aggregate valid attempts only.")
+
+@st.cache_data
+def load_runs():
+    conn = get_database_connection()
+    query = """
+    SELECT run_id, description, created_at
+    FROM runs
+    ORDER BY created_at DESC
+    """
+    return pd.read_sql_query(query, conn)
+
+ROW_ORDERS = {
+    "Worst cases first": "worst_first",
+    "Cluster similar failure patterns": "clustered",
+    "Task ID": "task_id",
+}
+
+def render_case_matrix_page():
+    import plotly.graph_objects as go
+
+    runs_df = load_runs()
+
+    if runs_df.empty:
+        st.warning("No evaluation runs found. Run some evaluations first.")
+        return
+
+    # Default to the run selected on the main dashboard, if any
+    run_ids = runs_df['run_id'].tolist()
+    selected_run_id = st.session_state.get('selected_run_id')
+    default_index = run_ids.index(selected_run_id) if selected_run_id in run_ids else 0
+    run_labels = {
+        run['run_id']: f"{run['description'] or run['run_id'][:8]} ({run['created_at']})"
+        for _, run in runs_df.iterrows()
+    }
+
+    run_id = st.selectbox(
+        "Run:",
+        run_ids,
+        index=default_index,
+        format_func=lambda rid: run_labels[rid]
+    )
+
+    matrix = load_outcome_matrix(run_id)
+    num_tasks, num_models = matrix.shape
+
+    if num_tasks == 0:
+        st.warning("No valid results found for this run.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        metric = st.radio("Cell value:", ["Success rate", "Median latency"], horizontal=True)
+    with col2:
+        order_label = st.selectbox("Row order:", list(ROW_ORDERS.keys()))
+    with col3:
+        failing_only = st.checkbox("Only cases at least one model fails", value=True)
+
+    success_rate = matrix.to_dense(matrix.success_rate())
+    row_order = order_rows(matrix, ROW_ORDERS[order_label])
+
+    if failing_only:
+        has_failure = np.nanmin(success_rate, axis=1) < 1.0
+        row_order = row_order[has_failure[row_order]]
+
+    if len(row_order) == 0:
+        st.success("Every model succeeded on every valid attempt in this run.")
+        return
+
+    # Cap the rows sent to the browser; the matrix itself is already computed for all tasks
+    if len(row_order) > 10:
+        max_rows = st.slider("Max cases shown:", 10, len(row_order), min(200, len(row_order)))
+        row_order = row_order[:max_rows]
+
+    if metric == "Success rate":
+        z = success_rate[row_order]
+        colorscale, zmin, zmax, value_format = 'RdYlGn', 0.0, 1.0, '.0%'
+    else:
+        z = matrix.to_dense(matrix.median_latency_ms)[row_order]
+        colorscale, zmin, zmax, value_format = 'Viridis', None, None, '.0f'
+
+    attempts = matrix.to_dense(matrix.attempts, fill_value=0)[row_order]
+
+    fig = go.Figure(go.Heatmap(
+        z=z,
+        x=list(matrix.model_ids),
+        y=list(matrix.task_ids[row_order]),
+        customdata=attempts,
+        colorscale=colorscale,
+        zmin=zmin,
+        zmax=zmax,
+        hoverongaps=False,
+        hovertemplate=f"%{{y}}<br>%{{x}}<br>{metric}: %{{z:{value_format}}}<br>Valid attempts: %{{customdata:.0f}}<extra></extra>"
+    ))
+    fig.update_layout(
+        template='plotly_dark',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Azeret Mono, monospace"),
+        height=max(400, 16 * len(row_order)),
+        yaxis=dict(autorange='reversed'),
+        margin=dict(t=30)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.caption(f"{num_tasks} cases x {num_models} models, {len(matrix.attempts)} non-empty cells")
+
+    st.markdown("---")
+    st.markdown("### Case Breakdown")
+
+    selected_task_id = st.selectbox(
+        "Select a case to break down by model:",
+        options=[""] + list(matrix.task_ids[row_order])
+    )
+
+    if selected_task_id:
+        task_row = int(np.flatnonzero(matrix.task_ids == selected_task_id)[0])
+        in_row = matrix.rows == task_row
+        breakdown_df = pd.DataFrame({
+            'model_id': matrix.model_ids[matrix.cols[in_row]],
+            'valid_attempts': matrix.attempts[in_row],
+            'successes': matrix.successes[in_row],
+            'success_rate': matrix.success_rate()[in_row],
+            'median_latency_ms': matrix.median_latency_ms[in_row],
+        }).sort_values('success_rate')
+
+        st.dataframe(breakdown_df.style.format({
+            "success_rate": "{:.0%}",
+            "median_latency_ms": "{:.0f}"
+        }), use_container_width=True)
+
+if __name__ == "__main__":
+    render_case_matrix_page()
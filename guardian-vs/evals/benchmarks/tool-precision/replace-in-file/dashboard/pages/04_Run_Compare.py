@@ -0,0 +1,129 @@
+import streamlit as st
+from data import load_all_runs
+from run_compare import load_run_diff
+
+st.set_page_config(
+    page_title="Run Compare",
+    page_icon="🔀",
+    layout="wide"
+)
+
+st.title("Run vs Run Comparison")
+st.markdown("Find the cases that flipped between a baseline run and a candidate run, e.g. a new prompt or `diff-apply` version. "
+            "Runs are joined on task_id and model_id; cells aggregate valid attempts only.")
+
+FLIP_LABELS = {
+    'regressed': "🔴 Pass → Fail",
+    'fixed': "🟢 Fail → Pass",
+    'still failing': "⚪ Still failing",
+    'still passing': "⚪ Still passing",
+}
+
+def render_run_compare_page():
+    import plotly.express as px
+
+    all_runs = load_all_runs()
+
+    if len(all_runs) < 2:
+        st.warning("At least two runs are needed for a comparison.")
+        return
+
+    run_ids = all_runs['run_id'].tolist()
+    run_labels = {
+        run['run_id']: f"{run['description'] or run['run_id'][:8]} ({run['created_at']})"
+        for _, run in all_runs.iterrows()
+    }
+
+    # Default: the run selected on the main dashboard against the run before it
+    selected_run_id = st.session_state.get('selected_run_id')
+    candidate_index = run_ids.index(selected_run_id) if selected_run_id in run_ids else 0
+    baseline_index = min(candidate_index + 1, len(run_ids) - 1)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        run_id_a = st.selectbox("Baseline run (A):", run_ids, index=baseline_index, format_func=lambda rid: run_labels[rid])
+    with col2:
+        run_id_b = st.selectbox("Candidate run (B):", run_ids, index=candidate_index, format_func=lambda rid: run_labels[rid])
+
+    if run_id_a == run_id_b:
+        st.info("Pick two different runs to compare.")
+        return
+
+    diff_df, summary_df = load_run_diff(run_id_a, run_id_b)
+
+    if diff_df.empty:
+        st.warning("These runs have no (task_id, model_id) pairs in common.")
+        return
+
+    st.markdown("### Per-Model Summary")
+    st.caption("flip p-value: McNemar test on pass→fail vs fail→pass cases. "
+               "latency p-value: paired test on per-case median latency deltas.")
+    st.dataframe(summary_df.style.format({
+        'success_rate_a': "{:.1%}",
+        'success_rate_b': "{:.1%}",
+        'flip_p_value': "{:.3f}",
+        'median_latency_delta_ms': "{:+.0f}",
+        'latency_p_value': "{:.3f}",
+        'cost_per_attempt_delta_usd': "{:+.5f}",
+    }), use_container_width=True)
+
+    flip_counts = summary_df.melt(
+        id_vars='model_id',
+        value_vars=['regressed', 'fixed'],
+        var_name='flip',
+        value_name='cases'
+    )
+    flip_counts['flip'] = flip_counts['flip'].map(FLIP_LABELS)
+    fig = px.bar(
+        flip_counts,
+        x='model_id',
+        y='cases',
+        color='flip',
+        barmode='group',
+        title="Flipped Cases by Model",
+        labels={'model_id': 'Model', 'cases': 'Cases', 'flip': ''},
+        color_discrete_map={FLIP_LABELS['regressed']: '#ef4444', FLIP_LABELS['fixed']: '#10b981'},
+        template='plotly_dark'
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Azeret Mono, monospace")
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("### Per-Case Changes")
+    col1, col2 = st.columns(2)
+    with col1:
+        flips = st.multiselect(
+            "Show:",
+            list(FLIP_LABELS.keys()),
+            default=['regressed', 'fixed'],
+            format_func=lambda flip: FLIP_LABELS[flip]
+        )
+    with col2:
+        models = st.multiselect("Models:", summary_df['model_id'].tolist())
+
+    shown_df = diff_df[diff_df['flip'].isin(flips)]
+    if models:
+        shown_df = shown_df[shown_df['model_id'].isin(models)]
+
+    st.dataframe(
+        shown_df[[
+            'task_id', 'model_id', 'flip',
+            'success_rate_a', 'success_rate_b', 'attempts_a', 'attempts_b',
+            'median_latency_ms_a', 'median_latency_ms_b', 'latency_delta_ms', 'cost_per_attempt_delta_usd'
+        ]].sort_values(['flip', 'model_id', 'task_id']).style.format({
+            'success_rate_a': "{:.0%}",
+            'success_rate_b': "{:.0%}",
+            'median_latency_ms_a': "{:.0f}",
+            'median_latency_ms_b': "{:.0f}",
+            'latency_delta_ms': "{:+.0f}",
+            'cost_per_attempt_delta_usd': "{:+.5f}",
+        }),
+        use_container_width=True
+    )
+    st.caption(f"{len(shown_df)} of {len(diff_df)} shared (task, model) pairs shown")
+
+if __name__ == "__main__":
+    render_run_compare_page()
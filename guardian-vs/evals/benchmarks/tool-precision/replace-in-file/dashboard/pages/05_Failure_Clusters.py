@@ -0,0 +1,114 @@
+import streamlit as st
+import pandas as pd
+from utils import get_database_connection
+from data import load_all_runs
+from failure_clusters import (
+    SOURCES,
+    refresh_failure_signatures,
+    load_failure_clusters,
+    load_failure_text,
+)
+
+st.set_page_config(
+    page_title="Failure Clusters",
+    page_icon="🧩",
+    layout="wide"
+)
+
+st.title("Failure Clusters")
+st.markdown("Groups near-identical failed attempts (MinHash + LSH), so recurring failure patterns can be triaged once instead of result by result.")
+
+@st.cache_data
+def load_models_with_failures(run_ids):
+    conn = get_database_connection()
+    placeholders = ', '.join('?' for _ in run_ids)
+    query = f"""
+    SELECT res.model_id, COUNT(*) AS failures
+    FROM results res
+    JOIN cases c ON res.case_id = c.case_id
+    WHERE c.run_id IN ({placeholders}) AND res.succeeded = 0
+    GROUP BY res.model_id
+    ORDER BY failures DESC
+    """
+    return pd.read_sql_query(query, conn, params=run_ids)
+
+def render_failure_clusters_page():
+    all_runs = load_all_runs()
+
+    if all_runs.empty:
+        st.warning("No evaluation runs found. Run some evaluations first.")
+        return
+
+    run_labels = {
+        run['run_id']: f"{run['description'] or run['run_id'][:8]} ({run['created_at']})"
+        for _, run in all_runs.iterrows()
+    }
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        run_ids = st.multiselect(
+            "Runs:",
+            all_runs['run_id'].tolist(),
+            default=all_runs['run_id'].tolist(),
+            format_func=lambda rid: run_labels[rid]
+        )
+    with col2:
+        source = st.radio("Cluster on:", list(SOURCES.keys()), format_func=lambda s: SOURCES[s])
+
+    if not run_ids:
+        st.info("Select at least one run.")
+        return
+
+    with st.spinner("Signing new failures..."):
+        signature_total = refresh_failure_signatures(source)
+
+    models_df = load_models_with_failures(tuple(run_ids))
+    if models_df.empty:
+        st.success("No failed attempts in the selected runs.")
+        return
+
+    model_id = st.selectbox(
+        "Model:",
+        models_df['model_id'].tolist(),
+        format_func=lambda m: f"{m} ({models_df.set_index('model_id').loc[m, 'failures']} failures)"
+    )
+
+    signed_df, clusters_df = load_failure_clusters(model_id, tuple(sorted(run_ids)), source, signature_total)
+
+    if clusters_df.empty:
+        st.info(f"No failures with {SOURCES[source].lower()} for this model.")
+        return
+
+    repeated = clusters_df[clusters_df['failures'] > 1]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Failures", len(signed_df))
+    with col2:
+        st.metric("Clusters", len(clusters_df))
+    with col3:
+        st.metric("Failures in repeated patterns", f"{repeated['failures'].sum() / len(signed_df):.0%}")
+
+    show_singletons = st.checkbox("Include one-off failures", value=False)
+    shown_df = clusters_df if show_singletons else repeated
+
+    st.markdown("### Ranked Clusters")
+    st.dataframe(
+        shown_df.drop(columns=['cluster', 'representative_result_id']).style.format({
+            'share': "{:.1%}",
+            'similarity': "{:.0%}",
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    st.markdown("### Representative Examples")
+    for cluster in shown_df.head(10).itertuples(index=False):
+        members = signed_df[signed_df['cluster'] == cluster.cluster]
+        with st.expander(f"#{cluster.rank}: {cluster.failures} failures across {cluster.tasks} task(s)"):
+            st.caption(f"Representative result {cluster.representative_result_id}; "
+                       f"tasks: {', '.join(members['task_id'].drop_duplicates().head(10))}")
+            text = load_failure_text(cluster.representative_result_id, source)
+            st.code(text[:5000] if text else "", language=None)
+
+if __name__ == "__main__":
+    render_failure_clusters_page()
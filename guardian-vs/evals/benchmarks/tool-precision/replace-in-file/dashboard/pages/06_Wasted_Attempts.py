@@ -0,0 +1,154 @@
+import streamlit as st
+import pandas as pd
+from utils import get_database_connection
+from data import load_all_runs
+from rollups import ensure_rollups_fresh
+
+st.set_page_config(
+    page_title="Wasted Attempts",
+    page_icon="♻️",
+    layout="wide"
+)
+
+st.title("Wasted Attempts")
+st.markdown("Invalid attempts (no tool call, wrong tool, wrong file) are excluded from success rates, "
+            "but TestRunner re-rolls them until it has enough valid attempts, so they still cost money, tokens and time.")
+
+# A group is flagged when more than this share of its model time went to invalid attempts
+REROLL_DOMINATED_SHARE = 0.5
+
+@st.cache_data
+def load_rollups(run_ids, rollup_version):
+    """Rollup rows for the selected runs (rollup_version only keys the cache)"""
+    conn = get_database_connection()
+    placeholders = ', '.join('?' for _ in run_ids)
+    query = f"""
+    SELECT ro.*, sp.name AS system_prompt_name
+    FROM result_rollups ro
+    LEFT JOIN system_prompts sp ON ro.system_prompt_hash = sp.hash
+    WHERE ro.run_id IN ({placeholders})
+    """
+    return pd.read_sql_query(query, conn, params=run_ids)
+
+def waste_by(rollups_df, keys):
+    """Valid vs invalid totals per group, with the share of time spent on re-rolls"""
+    rollups_df = rollups_df.assign(
+        invalid=1 - rollups_df['is_valid'],
+        tokens=rollups_df['total_input_tokens'].fillna(0) + rollups_df['total_completion_tokens'].fillna(0),
+    )
+    invalid = rollups_df[rollups_df['invalid'] == 1]
+
+    totals = rollups_df.groupby(keys, observed=True).agg(
+        attempts=('attempts', 'sum'),
+        total_time_ms=('total_round_trip_ms', 'sum'),
+        total_cost_usd=('total_cost_usd', 'sum'),
+    )
+    wasted = invalid.groupby(keys, observed=True).agg(
+        invalid_attempts=('attempts', 'sum'),
+        wasted_cost_usd=('total_cost_usd', 'sum'),
+        wasted_tokens=('tokens', 'sum'),
+        wasted_time_ms=('total_round_trip_ms', 'sum'),
+    )
+    summary = totals.join(wasted, how='left').fillna(0)
+    summary['invalid_share'] = summary['invalid_attempts'] / summary['attempts']
+    summary['wasted_time_share'] = (summary['wasted_time_ms'] / summary['total_time_ms'].where(summary['total_time_ms'] > 0)).fillna(0)
+    summary['wasted_cost_share'] = (summary['wasted_cost_usd'] / summary['total_cost_usd'].where(summary['total_cost_usd'] > 0)).fillna(0)
+    summary['reroll_dominated'] = summary['wasted_time_share'] > REROLL_DOMINATED_SHARE
+    summary['wasted_time_min'] = summary['wasted_time_ms'] / 60000
+    return summary.drop(columns=['wasted_time_ms', 'total_time_ms']).sort_values('wasted_cost_usd', ascending=False).reset_index()
+
+WASTE_FORMAT = {
+    'total_cost_usd': "${:.4f}",
+    'wasted_cost_usd': "${:.4f}",
+    'wasted_tokens': "{:,.0f}",
+    'invalid_attempts': "{:.0f}",
+    'invalid_share': "{:.1%}",
+    'wasted_time_share': "{:.1%}",
+    'wasted_cost_share': "{:.1%}",
+    'wasted_time_min': "{:.1f}",
+}
+
+def highlight_dominated(row):
+    color = 'background-color: rgba(239, 68, 68, 0.25)' if row['reroll_dominated'] else ''
+    return [color] * len(row)
+
+def render_waste_table(summary):
+    st.dataframe(
+        summary.style.apply(highlight_dominated, axis=1).format(WASTE_FORMAT),
+        use_container_width=True,
+        hide_index=True
+    )
+
+def render_wasted_attempts_page():
+    import plotly.express as px
+
+    all_runs = load_all_runs()
+    if all_runs.empty:
+        st.warning("No evaluation runs found. Run some evaluations first.")
+        return
+
+    run_labels = {
+        run['run_id']: f"{run['description'] or run['run_id'][:8]} ({run['created_at']})"
+        for _, run in all_runs.iterrows()
+    }
+    run_ids = st.multiselect(
+        "Runs:",
+        all_runs['run_id'].tolist(),
+        default=all_runs['run_id'].tolist()[:1],
+        format_func=lambda rid: run_labels[rid]
+    )
+    if not run_ids:
+        st.info("Select at least one run.")
+        return
+
+    rollups_df = load_rollups(tuple(sorted(run_ids)), ensure_rollups_fresh())
+    if rollups_df.empty:
+        st.warning("No results in the selected runs.")
+        return
+
+    by_model = waste_by(rollups_df, ['model_id'])
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Invalid Attempts", f"{by_model['invalid_attempts'].sum():.0f}",
+                  f"{by_model['invalid_attempts'].sum() / by_model['attempts'].sum():.1%} of all", delta_color="off")
+    with col2:
+        st.metric("Wasted Cost", f"${by_model['wasted_cost_usd'].sum():.2f}")
+    with col3:
+        st.metric("Wasted Tokens", f"{by_model['wasted_tokens'].sum():,.0f}")
+    with col4:
+        st.metric("Wasted Model Time", f"{by_model['wasted_time_min'].sum():.1f} min")
+
+    st.markdown("### By Model")
+    fig = px.bar(
+        by_model,
+        x='model_id',
+        y='wasted_cost_usd',
+        color='wasted_time_share',
+        color_continuous_scale=['#10b981', '#f59e0b', '#ef4444'],
+        range_color=[0, 1],
+        title="Cost of Invalid Attempts (color: share of model time spent on re-rolls)",
+        labels={'model_id': 'Model', 'wasted_cost_usd': 'Wasted Cost ($)', 'wasted_time_share': 'Re-roll time share'},
+        template='plotly_dark'
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Azeret Mono, monospace")
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    render_waste_table(by_model)
+
+    st.markdown("### By System Prompt")
+    render_waste_table(waste_by(rollups_df.fillna({'system_prompt_name': 'unknown'}), ['system_prompt_name', 'model_id']))
+
+    st.markdown("### By Case")
+    by_case = waste_by(rollups_df, ['task_id', 'model_id'])
+    dominated_only = st.checkbox(f"Only re-roll dominated (>{REROLL_DOMINATED_SHARE:.0%} of time on invalid attempts)", value=True)
+    if dominated_only:
+        by_case = by_case[by_case['reroll_dominated']]
+    st.caption(f"{len(by_case)} (case, model) pairs; highlighted rows spend most of their time on invalid attempts")
+    render_waste_table(by_case.head(200))
+
+if __name__ == "__main__":
+    render_wasted_attempts_page()
@@ -0,0 +1,157 @@
+import streamlit as st
+import numpy as np
+from data import load_all_runs
+from timeline import (
+    load_attempt_intervals, concurrency_profile, time_weighted_mean,
+    idle_gaps, completions_per_minute, assign_lanes, gantt_segments
+)
+
+st.set_page_config(
+    page_title="Run Timeline",
+    page_icon="⏱️",
+    layout="wide"
+)
+
+st.title("Run Timeline")
+st.markdown("When each attempt was in flight, reconstructed as `created_at - time_round_trip_ms` → `created_at`. "
+            "Shows how many attempts actually ran in parallel and where the run stalled, e.g. on rate limits.")
+
+@st.cache_data
+def load_gantt_layout(run_id):
+    """Lane per attempt, packed per model and stacked model by model"""
+    intervals_df = load_attempt_intervals(run_id)
+    lanes = np.empty(len(intervals_df), dtype=np.int32)
+    model_rows = {}
+    offset = 0
+    for model_id, model_df in intervals_df.groupby('model_id', observed=True):
+        model_lanes = assign_lanes(model_df['start_s'].to_numpy(), model_df['end_s'].to_numpy())
+        lanes[model_df.index.to_numpy()] = model_lanes + offset
+        num_lanes = int(model_lanes.max()) + 1
+        model_rows[model_id] = (offset, num_lanes)
+        offset += num_lanes
+    return lanes, model_rows
+
+def dark_layout(fig, **kwargs):
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Azeret Mono, monospace"),
+        **kwargs
+    )
+    return fig
+
+def render_timeline_page():
+    import plotly.graph_objects as go
+    import plotly.express as px
+
+    all_runs = load_all_runs()
+    if all_runs.empty:
+        st.warning("No evaluation runs found. Run some evaluations first.")
+        return
+
+    run_ids = all_runs['run_id'].tolist()
+    run_labels = {
+        run['run_id']: f"{run['description'] or run['run_id'][:8]} ({run['created_at']})"
+        for _, run in all_runs.iterrows()
+    }
+    selected_run_id = st.session_state.get('selected_run_id')
+    run_id = st.selectbox(
+        "Run:",
+        run_ids,
+        index=run_ids.index(selected_run_id) if selected_run_id in run_ids else 0,
+        format_func=lambda rid: run_labels[rid]
+    )
+
+    intervals_df = load_attempt_intervals(run_id)
+    if intervals_df.empty:
+        st.warning("No timed results in this run.")
+        return
+
+    start_s = intervals_df['start_s'].to_numpy()
+    end_s = intervals_df['end_s'].to_numpy()
+    times, levels = concurrency_profile(start_s, end_s)
+    span_s = float(times[-1] - times[0])
+    min_gap_s = st.slider("Minimum idle gap (seconds):", 1, 120, 10)
+    gaps_df = idle_gaps(times, levels, min_gap_s)
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("Wall Clock", f"{span_s / 60:.1f} min")
+    with col2:
+        st.metric("Peak Concurrency", f"{int(levels.max())}")
+    with col3:
+        st.metric("Mean Concurrency", f"{time_weighted_mean(times, levels):.1f}")
+    with col4:
+        st.metric("Throughput", f"{len(intervals_df) / max(span_s / 60, 1e-9):.1f} /min")
+    with col5:
+        idle_s = gaps_df['duration_s'].sum()
+        st.metric("Idle Time", f"{idle_s / 60:.1f} min", f"{idle_s / span_s:.1%} of wall clock" if span_s else None, delta_color="off")
+
+    st.markdown("### Concurrency Over Time")
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=times / 60, y=levels, mode='lines', line_shape='hv',
+        name='all models', line=dict(color='#e5e7eb', width=1)
+    ))
+    for model_id, model_df in intervals_df.groupby('model_id', observed=True):
+        model_times, model_levels = concurrency_profile(model_df['start_s'].to_numpy(), model_df['end_s'].to_numpy())
+        fig.add_trace(go.Scattergl(
+            x=model_times / 60, y=model_levels, mode='lines', line_shape='hv',
+            name=str(model_id), line=dict(width=1)
+        ))
+    for gap in gaps_df.itertuples():
+        fig.add_vrect(x0=gap.start_s / 60, x1=gap.end_s / 60, fillcolor='#ef4444', opacity=0.15, line_width=0)
+    dark_layout(fig, template='plotly_dark', xaxis_title='Minutes since first attempt', yaxis_title='Attempts in flight')
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("### Completed Attempts per Minute")
+    _, per_minute = completions_per_minute(intervals_df)
+    per_minute_long = per_minute.rename_axis('minute').reset_index().melt(id_vars='minute', var_name='model_id', value_name='attempts')
+    fig = px.bar(
+        per_minute_long, x='minute', y='attempts', color='model_id',
+        labels={'minute': 'Minute', 'attempts': 'Attempts', 'model_id': 'Model'},
+        template='plotly_dark'
+    )
+    st.plotly_chart(dark_layout(fig, bargap=0), use_container_width=True)
+
+    st.markdown("### Attempts per Model")
+    lanes, model_rows = load_gantt_layout(run_id)
+    st.caption("One line per attempt, packed into lanes per model; red lines are invalid attempts that were re-rolled.")
+    fig = go.Figure()
+    for model_id, (offset, num_lanes) in model_rows.items():
+        for is_valid, color in ((1, None), (0, '#ef4444')):
+            mask = (intervals_df['model_id'] == model_id).to_numpy() & (intervals_df['is_valid'] == is_valid).to_numpy()
+            if not mask.any():
+                continue
+            x, y = gantt_segments(start_s[mask] / 60, end_s[mask] / 60, lanes[mask])
+            fig.add_trace(go.Scattergl(
+                x=x, y=y, mode='lines', connectgaps=False,
+                name=f"{model_id}{'' if is_valid else ' (invalid)'}",
+                line=dict(width=2, color=color), hoverinfo='skip'
+            ))
+        fig.add_hline(y=offset - 0.5, line_width=1, line_color='rgba(255,255,255,0.2)')
+    fig.update_yaxes(
+        tickvals=[offset + (num_lanes - 1) / 2 for offset, num_lanes in model_rows.values()],
+        ticktext=[str(model_id) for model_id in model_rows],
+        autorange='reversed'
+    )
+    total_lanes = sum(num_lanes for _, num_lanes in model_rows.values())
+    dark_layout(fig, template='plotly_dark', xaxis_title='Minutes since first attempt', height=min(max(300, total_lanes * 4 + 150), 1200))
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("### Idle Gaps")
+    if gaps_df.empty:
+        st.info(f"No stretch of {min_gap_s}s or more without an attempt in flight.")
+    else:
+        st.caption(f"{len(gaps_df)} stretches of at least {min_gap_s}s with nothing in flight, longest first")
+        st.dataframe(
+            (gaps_df.assign(start_min=gaps_df['start_s'] / 60, end_min=gaps_df['end_s'] / 60)
+                [['start_min', 'end_min', 'duration_s']]
+                .sort_values('duration_s', ascending=False)
+                .style.format({'start_min': "{:.2f}", 'end_min': "{:.2f}", 'duration_s': "{:.1f}"})),
+            use_container_width=True,
+            hide_index=True
+        )
+
+if __name__ == "__main__":
+    render_timeline_page()
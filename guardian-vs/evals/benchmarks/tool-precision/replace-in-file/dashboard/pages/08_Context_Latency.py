@@ -0,0 +1,148 @@
+import streamlit as st
+import numpy as np
+from data import load_all_runs
+from context_latency import (
+    CONTEXT_COLUMNS, load_context_latency, load_context_latency_sample, fit_latency_models,
+    predict_trim_savings, bin_by_context, compare_system_prompts
+)
+from components.sampling import render_sampling_toggle
+
+st.set_page_config(
+    page_title="Context vs Latency",
+    page_icon="📏",
+    layout="wide"
+)
+
+st.title("Context Size vs Latency")
+st.markdown("How much slower each model gets as the prompt grows. Time-to-first-token is fitted on context tokens; "
+            "round trip on context and completion tokens, so long answers aren't blamed on long prompts. "
+            "API errors are left out.")
+
+FIT_FORMAT = {
+    'mean_context_tokens': "{:,.0f}",
+    'ttft_intercept_ms': "{:,.0f}",
+    'ttft_ms_per_1k': "{:,.1f}",
+    'ttft_ms_per_1k_margin': "± {:,.1f}",
+    'ttft_r2': "{:.2f}",
+    'ttft_n': "{:,.0f}",
+    'round_trip_intercept_ms': "{:,.0f}",
+    'round_trip_ms_per_1k_context': "{:,.1f}",
+    'round_trip_ms_per_1k_context_margin': "± {:,.1f}",
+    'round_trip_ms_per_1k_completion': "{:,.1f}",
+    'round_trip_r2': "{:.2f}",
+    'round_trip_n': "{:,.0f}",
+}
+
+def dark_layout(fig, **kwargs):
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Azeret Mono, monospace"),
+        **kwargs
+    )
+    return fig
+
+def render_context_latency_page():
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    all_runs = load_all_runs()
+    if all_runs.empty:
+        st.warning("No evaluation runs found. Run some evaluations first.")
+        return
+
+    run_labels = {
+        run['run_id']: f"{run['description'] or run['run_id'][:8]} ({run['created_at']})"
+        for _, run in all_runs.iterrows()
+    }
+    selected_run_id = st.session_state.get('selected_run_id')
+    default_runs = [selected_run_id] if selected_run_id in run_labels else all_runs['run_id'].tolist()[:1]
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        run_ids = st.multiselect("Runs:", all_runs['run_id'].tolist(), default=default_runs, format_func=lambda rid: run_labels[rid])
+    with col2:
+        context_column = st.selectbox("Context size:", list(CONTEXT_COLUMNS), format_func=CONTEXT_COLUMNS.get)
+    if not run_ids:
+        st.info("Select at least one run.")
+        return
+
+    run_ids = tuple(sorted(run_ids))
+    fraction, rollup_version = render_sampling_toggle(run_ids)
+    if fraction is None:
+        latency_df = load_context_latency(run_ids)
+    else:
+        latency_df = load_context_latency_sample(run_ids, fraction, rollup_version)
+    if latency_df.empty or latency_df[context_column].isna().all():
+        st.warning("No results with both a latency and a context size in the selected runs.")
+        return
+
+    fits = fit_latency_models(latency_df, context_column)
+    binned = bin_by_context(latency_df, context_column)
+
+    st.markdown("### Latency by Context Size")
+    st.caption("Points: median per context-size decile. Lines: the per-model TTFT fit.")
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.line(
+            binned, x='context_tokens', y='median_ttft_ms', color='model_id', markers=True,
+            hover_data=['bin_range', 'attempts'],
+            labels={'context_tokens': 'Context tokens', 'median_ttft_ms': 'Median TTFT (ms)', 'model_id': 'Model'},
+            title="Time to First Token", template='plotly_dark'
+        )
+        fig.update_traces(line=dict(dash='dot'))
+        x_range = np.array([np.nanmin(latency_df[context_column]), np.nanmax(latency_df[context_column])], dtype=float)
+        for fit in fits.dropna(subset=['ttft_ms_per_1k']).itertuples():
+            fig.add_trace(go.Scatter(
+                x=x_range, y=fit.ttft_intercept_ms + fit.ttft_ms_per_1k * x_range / 1000.0,
+                mode='lines', name=f"{fit.model_id} fit", line=dict(width=1), showlegend=False
+            ))
+        st.plotly_chart(dark_layout(fig), use_container_width=True)
+    with col2:
+        fig = px.line(
+            binned, x='context_tokens', y='median_round_trip_ms', color='model_id', markers=True,
+            hover_data=['bin_range', 'attempts'],
+            labels={'context_tokens': 'Context tokens', 'median_round_trip_ms': 'Median round trip (ms)', 'model_id': 'Model'},
+            title="Round Trip", template='plotly_dark'
+        )
+        st.plotly_chart(dark_layout(fig), use_container_width=True)
+
+    st.markdown("### Per-Model Fits")
+    st.caption("Slopes are ms per 1k tokens. A low R² means prompt size explains little of that model's latency."
+               + (" Fits are weighted by how many attempts each sampled one stands for; _n counts sampled attempts." if fraction else ""))
+    st.dataframe(fits.style.format(FIT_FORMAT, na_rep="–"), use_container_width=True, hide_index=True)
+
+    st.markdown("### What If the Context Were Trimmed?")
+    trim_share = st.slider("Cut the mean context by:", 0.05, 0.9, 0.25, 0.05, format="%.2f")
+    savings = predict_trim_savings(fits, trim_share)
+    st.caption(f"Predicted latency saved per attempt if every prompt were {trim_share:.0%} shorter, from the fitted slopes.")
+    st.dataframe(
+        savings.style.format({'ttft_saved_ms': "{:,.0f}", 'round_trip_saved_ms': "{:,.0f}"}, na_rep="–"),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    st.markdown("### System Prompt Variants")
+    by_prompt = compare_system_prompts(latency_df)
+    if by_prompt['system_prompt_hash'].nunique() < 2:
+        st.info("The selected runs use a single system prompt; select runs with different prompts to compare them.")
+    fig = px.scatter(
+        by_prompt, x='system_prompt_chars', y='median_round_trip_ms', color='model_id', size='attempts',
+        hover_data=['system_prompt_name', 'mean_tokens_in_context', 'median_ttft_ms'],
+        labels={'system_prompt_chars': 'System prompt length (chars)', 'median_round_trip_ms': 'Median round trip (ms)', 'model_id': 'Model'},
+        template='plotly_dark'
+    )
+    st.plotly_chart(dark_layout(fig), use_container_width=True)
+    st.dataframe(
+        by_prompt.style.format({
+            'system_prompt_chars': "{:,.0f}",
+            'mean_tokens_in_context': "{:,.0f}",
+            'median_ttft_ms': "{:,.0f}",
+            'median_round_trip_ms': "{:,.0f}",
+        }, na_rep="–"),
+        use_container_width=True,
+        hide_index=True
+    )
+
+if __name__ == "__main__":
+    render_context_latency_page()
@@ -0,0 +1,117 @@
+import streamlit as st
+import pandas as pd
+from data import load_all_runs
+from rollups import ensure_rollups_fresh
+from pareto import load_config_summary, add_frontier
+
+st.set_page_config(
+    page_title="Pareto Frontier",
+    page_icon="⚖️",
+    layout="wide"
+)
+
+st.title("Pareto Frontier")
+st.markdown("Every model × system prompt × processing functions configuration in the selected runs, "
+            "on success rate (higher is better), p95 round trip and cost per success (lower is better). "
+            "Configurations that another one beats on all three are greyed out.")
+
+FRONTIER_FORMAT = {
+    'success_rate': "{:.1%}",
+    'p95_latency_ms': "{:,.0f}",
+    'cost_per_success': "${:.4f}",
+    'valid_attempts': "{:,.0f}",
+}
+
+def config_label(row):
+    return f"{row['model_id']} · {row['system_prompt_name'] or row['system_prompt_hash'][:8]} · {row['processing_functions_name'] or row['processing_functions_hash'][:8]}"
+
+def render_pareto_page():
+    import plotly.graph_objects as go
+
+    all_runs = load_all_runs()
+    if all_runs.empty:
+        st.warning("No evaluation runs found. Run some evaluations first.")
+        return
+
+    run_labels = {
+        run['run_id']: f"{run['description'] or run['run_id'][:8]} ({run['created_at']})"
+        for _, run in all_runs.iterrows()
+    }
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        run_ids = st.multiselect("Runs:", all_runs['run_id'].tolist(), default=all_runs['run_id'].tolist()[:5], format_func=lambda rid: run_labels[rid])
+    with col2:
+        min_attempts = st.number_input("Min valid attempts:", min_value=1, value=20, step=10,
+                                       help="Configurations with fewer valid attempts are left out; their rates are too noisy to rank")
+    if not run_ids:
+        st.info("Select at least one run.")
+        return
+
+    summary_df = load_config_summary(tuple(sorted(run_ids)), ensure_rollups_fresh())
+    summary_df = summary_df[summary_df['valid_attempts'] >= min_attempts]
+    if summary_df.empty:
+        st.warning("No configuration has enough valid attempts in the selected runs.")
+        return
+
+    summary_df = add_frontier(summary_df.reset_index(drop=True))
+    summary_df['config'] = summary_df.apply(config_label, axis=1)
+    frontier = summary_df[summary_df['on_frontier']]
+    dominated = summary_df[~summary_df['on_frontier']]
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Configurations", len(summary_df))
+    with col2:
+        st.metric("On Frontier", len(frontier))
+    with col3:
+        st.metric("Best Success Rate", f"{summary_df['success_rate'].max():.1%}")
+
+    st.caption("x: p95 round trip, y: success rate, marker size: cost per success. Hover for the configuration.")
+    fig = go.Figure()
+    max_cost = summary_df['cost_per_success'].max()
+    # NaN when no configuration has a success
+    max_cost = max_cost if pd.notna(max_cost) and max_cost > 0 else 1.0
+    for points, name, color in ((dominated, 'Dominated', 'rgba(148, 163, 184, 0.35)'), (frontier, 'Frontier', '#10b981')):
+        fig.add_trace(go.Scatter(
+            x=points['p95_latency_ms'],
+            y=points['success_rate'],
+            mode='markers',
+            name=name,
+            marker=dict(
+                color=color,
+                size=10 + 30 * points['cost_per_success'].fillna(max_cost) / max_cost,
+                line=dict(width=1, color='rgba(255,255,255,0.5)') if name == 'Frontier' else dict(width=0)
+            ),
+            text=points['config'],
+            customdata=points[['cost_per_success', 'valid_attempts']].to_numpy(),
+            hovertemplate="%{text}<br>success %{y:.1%}<br>p95 %{x:,.0f} ms<br>$%{customdata[0]:.4f} per success"
+                          "<br>%{customdata[1]} valid attempts<extra></extra>",
+        ))
+    fig.update_layout(
+        template='plotly_dark',
+        xaxis_title='p95 round trip (ms)',
+        yaxis_title='Success rate',
+        yaxis_tickformat='.0%',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Azeret Mono, monospace"),
+        height=550
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("### Frontier Configurations")
+    columns = ['model_id', 'system_prompt_name', 'processing_functions_name', 'success_rate', 'p95_latency_ms', 'cost_per_success', 'valid_attempts']
+    st.dataframe(
+        frontier.sort_values('success_rate', ascending=False)[columns].style.format(FRONTIER_FORMAT, na_rep="–"),
+        use_container_width=True,
+        hide_index=True
+    )
+    with st.expander(f"Dominated configurations ({len(dominated)})"):
+        st.dataframe(
+            dominated.sort_values('success_rate', ascending=False)[columns].style.format(FRONTIER_FORMAT, na_rep="–"),
+            use_container_width=True,
+            hide_index=True
+        )
+
+if __name__ == "__main__":
+    render_pareto_page()
@@ -0,0 +1,135 @@
+import streamlit as st
+from data import load_all_runs
+from apply_timing import (
+    has_timing_columns, load_apply_timings, summarize_algorithms, by_file_size,
+    load_apply_timings_sample, summarize_algorithms_sampled, by_file_size_sampled
+)
+from components.sampling import render_sampling_toggle
+
+st.set_page_config(
+    page_title="Diff-Apply Algorithms",
+    page_icon="🧩",
+    layout="wide"
+)
+
+st.title("Diff-Apply Algorithms")
+st.markdown("How each parsing + diff-apply combination (`processing_functions_hash`) does on attempts that reached the apply step: "
+            "how often the edit applies and how long applying takes as files get bigger. "
+            "Replay runs (`replay.py` or `TestRunner.ts --replay-run-id`) give every algorithm the same model outputs.")
+
+SUMMARY_FORMAT = {
+    'applied_attempts': "{:,.0f}",
+    'timed_attempts': "{:,.0f}",
+    'apply_success_rate': "{:.1%}",
+    'parse_p50_ms': "{:.2f}",
+    'apply_p50_ms': "{:.2f}",
+    'apply_p90_ms': "{:.2f}",
+    'apply_p99_ms': "{:.2f}",
+    'failed_apply_p90_ms': "{:.2f}",
+    # Approximate mode only
+    'sampled_attempts': "{:,.0f}",
+    'apply_success_margin': "± {:.1%}",
+    'apply_p90_low_ms': "{:.2f}",
+    'apply_p90_high_ms': "{:.2f}",
+    'apply_p99_low_ms': "{:.2f}",
+    'apply_p99_high_ms': "{:.2f}",
+}
+
+def dark_layout(fig, **kwargs):
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Azeret Mono, monospace"),
+        **kwargs
+    )
+    return fig
+
+def render_diff_apply_page():
+    import plotly.express as px
+
+    all_runs = load_all_runs()
+    if all_runs.empty:
+        st.warning("No evaluation runs found. Run some evaluations first.")
+        return
+
+    run_labels = {
+        run['run_id']: f"{run['description'] or run['run_id'][:8]} ({run['created_at']})"
+        for _, run in all_runs.iterrows()
+    }
+    run_ids = st.multiselect("Runs:", all_runs['run_id'].tolist(), default=all_runs['run_id'].tolist()[:5], format_func=lambda rid: run_labels[rid])
+    if not run_ids:
+        st.info("Select at least one run.")
+        return
+
+    if not has_timing_columns():
+        st.warning("This database has no `apply_time_ms` / `parse_time_ms` columns yet. "
+                   "Running the benchmark once (any command that opens the database) adds them.")
+        return
+
+    run_ids = tuple(sorted(run_ids))
+    fraction, rollup_version = render_sampling_toggle(run_ids)
+    approximate = fraction is not None
+    if approximate:
+        timings_df = load_apply_timings_sample(run_ids, fraction, rollup_version)
+    else:
+        timings_df = load_apply_timings(run_ids)
+    if timings_df.empty:
+        st.warning("No attempts in the selected runs reached the apply step.")
+        return
+    if timings_df['apply_time_ms'].isna().all():
+        st.info("The selected runs were recorded before apply timing was captured; only success rates are shown.")
+
+    summary = summarize_algorithms_sampled(timings_df) if approximate else summarize_algorithms(timings_df)
+    st.markdown("### By Algorithm")
+    st.caption("Apply success rate counts attempts with no error or a diff_edit_error. "
+               "Failed-apply p90 is the time spent before giving up, where fallback matching costs the most."
+               + (" Attempt counts are estimated for the whole runs; low/high bound each percentile." if approximate else ""))
+    st.dataframe(
+        summary.drop(columns='processing_functions_hash').style.format(SUMMARY_FORMAT, na_rep="–"),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    sized = by_file_size_sampled(timings_df) if approximate else by_file_size(timings_df)
+    if sized.empty:
+        st.info("No original file sizes recorded for these cases.")
+        return
+
+    st.markdown("### Against File Size")
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.line(
+            sized, x='file_lines', y='apply_p95_ms', color='processing_functions_name', markers=True, log_x=True,
+            hover_data=['size_range', 'attempts', 'apply_p50_ms'],
+            labels={'file_lines': 'File lines (median of bin)', 'apply_p95_ms': 'p95 apply time (ms)', 'processing_functions_name': 'Algorithm'},
+            title="p95 Apply Time", template='plotly_dark'
+        )
+        st.plotly_chart(dark_layout(fig), use_container_width=True)
+    with col2:
+        fig = px.line(
+            sized, x='file_lines', y='apply_success_rate', color='processing_functions_name', markers=True, log_x=True,
+            error_y='apply_success_margin' if approximate else None,
+            hover_data=['size_range', 'attempts'],
+            labels={'file_lines': 'File lines (median of bin)', 'apply_success_rate': 'Apply success rate', 'processing_functions_name': 'Algorithm'},
+            title="Apply Success Rate", template='plotly_dark'
+        )
+        fig.update_yaxes(tickformat='.0%', range=[0, 1])
+        st.plotly_chart(dark_layout(fig), use_container_width=True)
+
+    with st.expander("Per size bin"):
+        st.dataframe(
+            sized.drop(columns=['processing_functions_hash', 'size_bin']).style.format({
+                'file_lines': "{:,.0f}",
+                'attempts': "{:,.0f}",
+                'apply_success_rate': "{:.1%}",
+                'apply_success_margin': "± {:.1%}",
+                'sampled_attempts': "{:,.0f}",
+                'apply_p50_ms': "{:.2f}",
+                'apply_p95_ms': "{:.2f}",
+            }, na_rep="–"),
+            use_container_width=True,
+            hide_index=True
+        )
+
+if __name__ == "__main__":
+    render_diff_apply_page()
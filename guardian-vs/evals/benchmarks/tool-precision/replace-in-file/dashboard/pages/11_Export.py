@@ -0,0 +1,128 @@
+import os
+import time
+import tempfile
+import streamlit as st
+from data import load_all_runs
+from utils import get_database_connection
+from export import EXPORT_COLUMNS, BLOB_COLUMNS, DEFAULT_COLUMNS, FORMATS, export_run, parquet_available
+
+st.set_page_config(
+    page_title="Export",
+    page_icon="📦",
+    layout="wide"
+)
+
+# Streamlit holds a download's whole file in memory; bigger exports go through the CLI
+MAX_DOWNLOAD_MB = 200
+
+# Prepared files live here until the session moves on; ones left by closed sessions are removed after a while
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), 'evals-export')
+MAX_EXPORT_AGE_HOURS = 6
+
+st.title("Export Results")
+st.markdown("Stream a run's results to CSV, JSONL or Parquet for offline analysis. "
+            "Rows are written in chunks to a temporary file, never held as one DataFrame, but the download "
+            "button serves that file from memory, so in-browser downloads are capped at "
+            f"{MAX_DOWNLOAD_MB} MB. For larger runs, `python export.py <run_id> --format parquet --output run.parquet` "
+            "writes the file with flat memory use.")
+
+def remove_file(path):
+    if path and os.path.exists(path):
+        os.remove(path)
+
+def remove_stale_exports():
+    """Delete prepared files older than MAX_EXPORT_AGE_HOURS, e.g. from sessions that were closed"""
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    cutoff = time.time() - MAX_EXPORT_AGE_HOURS * 3600
+    for entry in os.scandir(EXPORT_DIR):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass  # Removed by another session in the meantime
+
+def render_export_page():
+    remove_stale_exports()
+    all_runs = load_all_runs()
+    if all_runs.empty:
+        st.warning("No evaluation runs found. Run some evaluations first.")
+        return
+
+    run_ids = all_runs['run_id'].tolist()
+    run_labels = {
+        run['run_id']: f"{run['description'] or run['run_id'][:8]} ({run['created_at']})"
+        for _, run in all_runs.iterrows()
+    }
+    selected_run_id = st.session_state.get('selected_run_id')
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        run_id = st.selectbox("Run:", run_ids, index=run_ids.index(selected_run_id) if selected_run_id in run_ids else 0,
+                              format_func=lambda rid: run_labels[rid])
+    with col2:
+        formats = [fmt for fmt in FORMATS if fmt != 'parquet' or parquet_available()]
+        fmt = st.selectbox("Format:", formats, format_func=str.upper)
+        if 'parquet' not in formats:
+            st.caption("Parquet needs `pip install pyarrow`.")
+
+    include_blobs = st.checkbox("Include model output, tool call JSON and file contents", value=False,
+                                help="These columns are usually most of the export's size")
+    valid_only = st.checkbox("Valid attempts only", value=False)
+    available = [column for column in EXPORT_COLUMNS if include_blobs or column not in BLOB_COLUMNS]
+    default = DEFAULT_COLUMNS + (BLOB_COLUMNS if include_blobs else [])
+    columns = st.multiselect("Columns:", available, default=default)
+    if not columns:
+        st.info("Select at least one column.")
+        return
+
+    request = (run_id, fmt, tuple(columns), valid_only)
+    prepared = st.session_state.get('export_file')
+    if prepared and prepared['request'] != request:
+        # Settings changed since the last export; the old file no longer matches
+        remove_file(prepared['path'])
+        prepared = st.session_state['export_file'] = None
+
+    if st.button("Prepare export", type="primary"):
+        if prepared:
+            remove_file(prepared['path'])
+        handle, path = tempfile.mkstemp(suffix=f".{FORMATS[fmt][1]}", prefix="evals-export-", dir=EXPORT_DIR)
+        os.close(handle)
+        try:
+            with st.spinner("Exporting..."):
+                if fmt == 'parquet':
+                    rows = export_run(get_database_connection(), run_id, fmt, path, columns, valid_only)
+                else:
+                    with open(path, 'w', encoding='utf-8', newline='') as out:
+                        rows = export_run(get_database_connection(), run_id, fmt, out, columns, valid_only)
+        except BaseException:
+            # Also covers a rerun interrupting the export; the partial file is of no use
+            remove_file(path)
+            raise
+        size_mb = os.path.getsize(path) / 1e6
+        if size_mb > MAX_DOWNLOAD_MB:
+            # Can't be offered for download, so don't keep it around
+            os.remove(path)
+            path = None
+        prepared = st.session_state['export_file'] = {'request': request, 'path': path, 'rows': rows, 'size_mb': size_mb}
+
+    if prepared:
+        st.caption(f"{prepared['rows']:,} results, {prepared['size_mb']:.1f} MB")
+        mime, extension = FORMATS[fmt]
+        if prepared['path'] is None:
+            st.warning(f"Too large to download in the browser (over {MAX_DOWNLOAD_MB} MB). Export it from the dashboard directory with "
+                       f"`python export.py {run_id} --format {fmt} --output run-{run_id[:8]}.{extension}"
+                       f" --columns {' '.join(columns)}" + (" --valid-only" if valid_only else "") + "`.")
+            return
+        if not os.path.exists(prepared['path']):
+            st.info(f"The prepared file was removed after {MAX_EXPORT_AGE_HOURS} hours; prepare the export again.")
+            return
+        with open(prepared['path'], 'rb') as exported:
+            st.download_button(
+                f"Download {extension.upper()}",
+                data=exported,
+                file_name=f"run-{run_id[:8]}.{extension}",
+                mime=mime
+            )
+
+if __name__ == "__main__":
+    render_export_page()
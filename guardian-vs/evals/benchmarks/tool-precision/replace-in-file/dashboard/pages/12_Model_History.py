@@ -0,0 +1,141 @@
+import streamlit as st
+from rollups import ensure_rollups_fresh
+from model_history import (
+    HISTORY_PERCENTILES, load_history_models, load_model_runs, load_model_latency,
+    load_latest_attempts, config_changes
+)
+
+st.set_page_config(
+    page_title="Model History",
+    page_icon="📈",
+    layout="wide"
+)
+
+st.title("Model History")
+st.markdown("One model across every run it took part in: success rate, round-trip percentiles and cost per run, "
+            "oldest first. Dotted lines mark runs where the system prompt or diff-apply algorithm changed.")
+
+HISTORY_FORMAT = {
+    'success_rate': "{:.1%}",
+    'attempts': "{:,.0f}",
+    'valid_attempts': "{:,.0f}",
+    'p50_round_trip_ms': "{:,.0f}",
+    'p90_round_trip_ms': "{:,.0f}",
+    'p99_round_trip_ms': "{:,.0f}",
+    'cost_per_attempt': "${:.4f}",
+    'cost_per_success': "${:.4f}",
+    'total_cost_usd': "${:.2f}",
+}
+
+def dark_layout(fig, **kwargs):
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Azeret Mono, monospace"),
+        **kwargs
+    )
+    return fig
+
+def annotate_changes(fig, changes):
+    for change in changes.itertuples():
+        fig.add_vline(x=change.created_at, line=dict(dash='dot', width=1, color='rgba(148, 163, 184, 0.6)'))
+        fig.add_annotation(
+            x=change.created_at, y=1, yref='paper', text=change.change, showarrow=False,
+            textangle=-90, xanchor='right', yanchor='top', font=dict(size=10, color='#94a3b8')
+        )
+    return fig
+
+def render_model_history_page():
+    import plotly.graph_objects as go
+
+    rollup_version = ensure_rollups_fresh()
+    models_df = load_history_models(rollup_version)
+    if models_df.empty:
+        st.warning("No evaluation runs found. Run some evaluations first.")
+        return
+
+    model_ids = models_df['model_id'].tolist()
+    num_runs = dict(zip(models_df['model_id'], models_df['num_runs']))
+    drill_down_model = st.session_state.get('drill_down_model')
+    model_id = st.selectbox(
+        "Model:", model_ids,
+        index=model_ids.index(drill_down_model) if drill_down_model in model_ids else 0,
+        format_func=lambda mid: f"{mid} ({num_runs[mid]} runs)"
+    )
+
+    runs_df = load_model_runs(model_id, rollup_version)
+    if runs_df.empty:
+        st.warning("No results for this model.")
+        return
+    runs_df = runs_df.merge(load_model_latency(model_id, rollup_version), on='run_id', how='left')
+    changes = config_changes(runs_df)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Runs", len(runs_df))
+    with col2:
+        st.metric("Attempts", f"{runs_df['attempts'].sum():,}")
+    with col3:
+        latest = runs_df['success_rate'].iloc[-1]
+        st.metric("Latest Success Rate", "–" if latest != latest else f"{latest:.1%}")
+    with col4:
+        st.metric("Config Changes", len(changes))
+
+    hover = runs_df[['run_label', 'system_prompts', 'processing_functions']].to_numpy()
+    hovertemplate = "%{customdata[0]}<br>prompt: %{customdata[1]}<br>diff: %{customdata[2]}<br>%{y}<extra></extra>"
+
+    fig = go.Figure(go.Scatter(
+        x=runs_df['created_at'], y=runs_df['success_rate'], mode='lines+markers', name='Success rate',
+        customdata=hover, hovertemplate=hovertemplate, line=dict(color='#10b981')
+    ))
+    fig.update_yaxes(tickformat='.0%', rangemode='tozero')
+    annotate_changes(fig, changes)
+    st.plotly_chart(dark_layout(fig, title="Success Rate (valid attempts)", template='plotly_dark', height=380),
+                    use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = go.Figure()
+        for q in HISTORY_PERCENTILES:
+            column = f"p{q * 100:g}_round_trip_ms"
+            fig.add_trace(go.Scatter(
+                x=runs_df['created_at'], y=runs_df[column], mode='lines+markers', name=f"p{q * 100:g}",
+                customdata=hover, hovertemplate=hovertemplate
+            ))
+        fig.update_yaxes(title="ms", rangemode='tozero')
+        annotate_changes(fig, changes)
+        st.plotly_chart(dark_layout(fig, title="Round Trip Percentiles", template='plotly_dark', height=380),
+                        use_container_width=True)
+    with col2:
+        fig = go.Figure()
+        for column, name in (('cost_per_attempt', 'Per attempt'), ('cost_per_success', 'Per success')):
+            fig.add_trace(go.Scatter(
+                x=runs_df['created_at'], y=runs_df[column], mode='lines+markers', name=name,
+                customdata=hover, hovertemplate=hovertemplate
+            ))
+        fig.update_yaxes(title="USD", tickprefix='$', rangemode='tozero')
+        annotate_changes(fig, changes)
+        st.plotly_chart(dark_layout(fig, title="Cost", template='plotly_dark', height=380),
+                        use_container_width=True)
+    st.caption("Percentiles are read from the latency histogram, so they are accurate to about 5%.")
+
+    st.markdown("### Runs")
+    st.dataframe(
+        runs_df[[
+            'created_at', 'run_label', 'system_prompts', 'processing_functions', 'attempts', 'valid_attempts',
+            'success_rate', 'p50_round_trip_ms', 'p90_round_trip_ms', 'p99_round_trip_ms',
+            'cost_per_attempt', 'cost_per_success', 'total_cost_usd'
+        ]].iloc[::-1].style.format(HISTORY_FORMAT, na_rep="–"),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    st.markdown("### Latest Attempts")
+    st.dataframe(
+        load_latest_attempts(model_id).style.format({'time_round_trip_ms': "{:,.0f}", 'cost_usd': "${:.4f}"}, na_rep="–"),
+        use_container_width=True,
+        hide_index=True
+    )
+
+if __name__ == "__main__":
+    render_model_history_page()
@@ -0,0 +1,69 @@
+"""
+Pareto frontier of (success rate, p95 latency, cost per success).
+
+A configuration is one (model, system prompt, processing functions) combination over
+the selected runs. Everything is read from the rollup tables (rollups.py): success
+rate and cost from result_rollups, p95 from the latency_rollups histogram.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils import get_database_connection
+from rollups import histogram_quantiles
+
+CONFIG_KEYS = ['model_id', 'system_prompt_hash', 'processing_functions_hash']
+
+@st.cache_data
+def load_config_summary(run_ids, rollup_version):
+    """Per configuration: attempts, success rate, p95 latency, cost per success (rollup_version keys the cache)"""
+    conn = get_database_connection()
+    placeholders = ', '.join('?' for _ in run_ids)
+    summary_df = pd.read_sql_query(f"""
+    SELECT
+        ro.model_id,
+        ro.system_prompt_hash,
+        ro.processing_functions_hash,
+        sp.name AS system_prompt_name,
+        pf.name AS processing_functions_name,
+        SUM(CASE WHEN ro.is_valid = 1 THEN ro.attempts ELSE 0 END) AS valid_attempts,
+        SUM(CASE WHEN ro.is_valid = 1 THEN ro.successes ELSE 0 END) AS successes,
+        SUM(ro.total_cost_usd) AS total_cost_usd
+    FROM result_rollups ro
+    LEFT JOIN system_prompts sp ON ro.system_prompt_hash = sp.hash
+    LEFT JOIN processing_functions pf ON ro.processing_functions_hash = pf.hash
+    WHERE ro.run_id IN ({placeholders})
+    GROUP BY ro.model_id, ro.system_prompt_hash, ro.processing_functions_hash
+    """, conn, params=list(run_ids))
+
+    histogram_df = pd.read_sql_query(f"""
+    SELECT model_id, system_prompt_hash, processing_functions_hash, bucket, SUM(attempts) AS attempts
+    FROM latency_rollups
+    WHERE run_id IN ({placeholders})
+    GROUP BY model_id, system_prompt_hash, processing_functions_hash, bucket
+    """, conn, params=list(run_ids))
+    p95 = histogram_quantiles(histogram_df, CONFIG_KEYS, 0.95).rename('p95_latency_ms')
+
+    summary_df = summary_df.join(p95, on=CONFIG_KEYS)
+    summary_df['success_rate'] = summary_df['successes'] / summary_df['valid_attempts'].where(summary_df['valid_attempts'] > 0)
+    # All spend counts, including re-rolled invalid attempts
+    summary_df['cost_per_success'] = summary_df['total_cost_usd'] / summary_df['successes'].where(summary_df['successes'] > 0)
+    return summary_df
+
+def pareto_mask(values, maximize):
+    """Boolean mask of non-dominated rows.
+
+    values: (n, d) array, maximize: (d,) booleans. Row i is dominated when some row is at
+    least as good on every objective and strictly better on one. NaN counts as worst.
+    """
+    signs = np.where(maximize, -1.0, 1.0)
+    costs = np.where(np.isnan(values), np.inf, values * signs)
+    # (n, n, d): how row j compares with row i
+    no_worse = (costs[None, :, :] <= costs[:, None, :]).all(axis=2)
+    better = (costs[None, :, :] < costs[:, None, :]).any(axis=2)
+    dominated = (no_worse & better).any(axis=1)
+    return ~dominated
+
+def add_frontier(summary_df):
+    values = summary_df[['success_rate', 'p95_latency_ms', 'cost_per_success']].to_numpy(dtype=float)
+    return summary_df.assign(on_frontier=pareto_mask(values, np.array([True, False, False])))
@@ -0,0 +1,122 @@
+"""
+Background prefetch of model drill-downs.
+
+Opening a model's drill-down runs load_detailed_results cold, the slowest click in the
+dashboard. While the overview is on screen, one background thread per server process
+loads the drill-down frames (all and valid-only results) for the run's top models into
+the frame cache, so the click is a cache hit. The first session to start also queues
+the latest run.
+
+Prefetching only fills free space: it pauses once the frame cache is more than
+PREFETCH_BUDGET_SHARE full and stores a frame only if it fits without evicting
+anything. Selecting another run replaces the queue and interrupts the query in flight.
+The thread uses its own SQLite connection, so it never holds up the page's queries.
+
+DASHBOARD_PREFETCH_MODELS sets how many models per run are prefetched (default 3, 0 turns
+prefetching off).
+"""
+
+import os
+import sys
+import sqlite3
+import threading
+import pandas as pd
+import streamlit as st
+from utils import get_database_path
+from frame_cache import get_frame_cache
+from data import load_detailed_results, query_detailed_results, load_latest_run_comparison
+
+DEFAULT_TOP_MODELS = 3
+
+# Prefetch stops adding frames once the cache is this full, leaving the rest for real clicks
+PREFETCH_BUDGET_SHARE = 0.5
+
+def log(message):
+    print(message, file=sys.stderr)
+
+class Prefetcher:
+    def __init__(self, db_path, top_models):
+        self.db_path = db_path
+        self.top_models = top_models
+        self.cache = get_frame_cache()
+        self.condition = threading.Condition()
+        self.requested = None
+        self.pending = []
+        self.current = None
+        self.conn = None
+        self.stats = {'loaded': 0, 'already_cached': 0, 'over_budget': 0, 'cancelled': 0}
+        self.thread = threading.Thread(target=self.run, name='drill-down-prefetch', daemon=True)
+        self.thread.start()
+
+    def request(self, run_id, model_ids):
+        """Prefetch the top models of a run (best first), replacing whatever was queued before"""
+        jobs = [(run_id, model_id, valid_only) for model_id in list(model_ids)[:self.top_models] for valid_only in (False, True)]
+        with self.condition:
+            if jobs == self.requested:
+                return
+            self.requested = jobs
+            self.pending = list(jobs)
+            if self.current is not None and self.current not in jobs:
+                self.interrupt()
+            self.condition.notify()
+
+    def cancel(self):
+        """Drop the queue and stop the load in flight, e.g. while a drill-down is loading its own data"""
+        with self.condition:
+            self.requested = None
+            self.pending = []
+            if self.current is not None:
+                self.interrupt()
+
+    def interrupt(self):
+        # Called with the condition held; Connection.interrupt is safe from any thread
+        self.stats['cancelled'] += 1
+        if self.conn is not None:
+            self.conn.interrupt()
+
+    def budget_left(self):
+        return self.cache.current_bytes < self.cache.max_bytes * PREFETCH_BUDGET_SHARE
+
+    def run(self):
+        self.conn = sqlite3.connect(self.db_path)
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                job = self.current = self.pending.pop(0)
+            try:
+                self.load(*job)
+            except (sqlite3.Error, pd.errors.DatabaseError) as error:
+                # "interrupted" is a cancellation; anything else is logged and the job dropped
+                if 'interrupt' not in str(error):
+                    log(f"Prefetch of {job} failed: {error}")
+            finally:
+                with self.condition:
+                    self.current = None
+
+    def load(self, run_id, model_id, valid_only):
+        key = load_detailed_results.cache_key(run_id, model_id, valid_only=True) if valid_only \
+            else load_detailed_results.cache_key(run_id, model_id)
+        if self.cache.contains(key):
+            self.stats['already_cached'] += 1
+            return
+        if not self.budget_left():
+            self.stats['over_budget'] += 1
+            return
+        frame = query_detailed_results(self.conn, run_id, model_id, valid_only)
+        if self.cache.put_if_fits(key, frame):
+            self.stats['loaded'] += 1
+        else:
+            self.stats['over_budget'] += 1
+
+@st.cache_resource
+def get_prefetcher():
+    """The process-wide prefetcher, or None when disabled. Starts by queueing the latest run."""
+    top_models = int(os.environ.get('DASHBOARD_PREFETCH_MODELS', DEFAULT_TOP_MODELS))
+    if top_models <= 0:
+        return None
+    prefetcher = Prefetcher(os.path.abspath(get_database_path()), top_models)
+    latest_run, model_performance = load_latest_run_comparison()
+    if latest_run is not None:
+        prefetcher.request(latest_run['run_id'], model_performance['model_id'])
+    return prefetcher
@@ -0,0 +1,287 @@
+"""
+Offline re-scoring: replay a run's stored model outputs through another diff-apply algorithm.
+
+Every result keeps the model's parsed tool call and every case points at the original
+file (cases.file_hash), so a new diff-apply variant can be scored without any API calls.
+Results are streamed out of evals.db, the SEARCH/REPLACE blocks are applied by the
+TypeScript implementation (replay-worker.ts, one long-lived node process per pool
+worker) and the outcomes are written as a new run under the replay's
+processing_functions_hash. Timing, cost and model output are copied from the original,
+except apply_time_ms, which is measured by the worker for re-applied attempts.
+
+Same semantics as `TestRunner.ts --replay-run-id`: only attempts that originally
+reached the diff step (error_enum NULL or 3) are re-applied; everything else is copied.
+
+Usage (from the dashboard directory):
+    python replay.py <run_id> --diff-apply diff-06-26-25
+    python replay.py <run_id> --diff-apply diff-06-23-25 --workers 8 --dry-run
+"""
+
+import os
+import sys
+import json
+import uuid
+import shlex
+import sqlite3
+import hashlib
+import argparse
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from utils import get_database_path, extract_diff
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+DIFF_APPLY_FUNCTIONS = ['diff-06-06-25', 'diff-06-23-25', 'diff-06-25-25', 'diff-06-26-25']
+PARSING_FUNCTION = 'parseAssistantMessageV2'
+DEFAULT_WORKER_COMMAND = 'npx --no-install ts-node --transpile-only replay-worker.ts'
+
+# Attempts that got as far as applying the diff (no error, or diff_edit_error)
+REPLAYABLE_ERRORS = (None, 3)
+DIFF_EDIT_ERROR = 3
+
+# Columns set by the replay rather than copied from the original result; sample_key is left
+# NULL so the insert trigger draws a fresh one
+REPLACED_COLUMNS = {'result_id', 'run_id', 'case_id', 'processing_functions_hash', 'succeeded', 'error_enum', 'apply_time_ms', 'created_at', 'sample_key'}
+
+def log(message):
+    print(message, file=sys.stderr)
+
+def processing_functions_hash(parsing_function, diff_edit_function):
+    """Same hash as upsertProcessingFunctions in database/operations.ts"""
+    return hashlib.sha256((parsing_function + diff_edit_function).encode('utf-8')).hexdigest()
+
+# --- Pool workers: each process owns one node diff-apply worker ---
+
+_apply_process = None
+
+def _start_apply_process(worker_command, diff_apply):
+    global _apply_process
+    _apply_process = subprocess.Popen(
+        shlex.split(worker_command) + [diff_apply],
+        cwd=BENCHMARK_DIR,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+        encoding='utf-8',
+        bufsize=1,
+    )
+
+def apply_batch(requests):
+    """Apply (id, diff, original) requests in the worker's node process; returns {id: (ok, error, apply_ms)}"""
+    try:
+        for request_id, diff, original in requests:
+            _apply_process.stdin.write(json.dumps({'id': request_id, 'diff': diff, 'original': original}) + '\n')
+        _apply_process.stdin.flush()
+    except BrokenPipeError:
+        raise RuntimeError(f"diff-apply worker exited with code {_apply_process.wait()}")
+
+    outcomes = {}
+    for _ in requests:
+        line = _apply_process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"diff-apply worker exited with code {_apply_process.wait()}")
+        response = json.loads(line)
+        outcomes[response['id']] = (response['ok'], response.get('error'), response.get('apply_ms'))
+    return outcomes
+
+# --- Main process: streaming reads, a single writer ---
+
+def create_replay_run(conn, run_id, diff_apply):
+    """Insert the replay run, its processing functions and mirrored cases; returns (run_id, hash, case map)"""
+    original_run = conn.execute("SELECT system_prompt_hash FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+    if original_run is None:
+        raise SystemExit(f"Run {run_id} not found")
+
+    replay_run_id = str(uuid.uuid4())
+    conn.execute(
+        "INSERT INTO runs (run_id, description, system_prompt_hash) VALUES (?, ?, ?)",
+        (replay_run_id, f"Replay of run {run_id} using {diff_apply}", original_run[0])
+    )
+
+    functions_hash = processing_functions_hash(PARSING_FUNCTION, diff_apply)
+    conn.execute(
+        "INSERT OR IGNORE INTO processing_functions (hash, name, parsing_function, diff_edit_function) VALUES (?, ?, ?, ?)",
+        (functions_hash, f"replay-{diff_apply}", PARSING_FUNCTION, diff_apply)
+    )
+
+    case_ids = {}
+    for case_id, system_prompt_hash, task_id, tokens_in_context, file_hash in conn.execute(
+        "SELECT case_id, system_prompt_hash, task_id, tokens_in_context, file_hash FROM cases WHERE run_id = ?", (run_id,)
+    ).fetchall():
+        case_ids[case_id] = str(uuid.uuid4())
+        conn.execute(
+            "INSERT INTO cases (case_id, run_id, description, system_prompt_hash, task_id, tokens_in_context, file_hash) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (case_ids[case_id], replay_run_id, f"Replay of case {case_id} from run {run_id}",
+             system_prompt_hash, task_id, tokens_in_context, file_hash)
+        )
+    return replay_run_id, functions_hash, case_ids
+
+def stream_results(conn, run_id, batch_size):
+    """Yield lists of result rows (dicts) for a run, joined with the case's original file hash"""
+    cursor = conn.execute(
+        """
+        SELECT res.*, c.file_hash AS original_file_hash
+        FROM results res
+        JOIN cases c ON res.case_id = c.case_id
+        WHERE c.run_id = ?
+        ORDER BY res.created_at
+        """,
+        (run_id,)
+    )
+    columns = [description[0] for description in cursor.description]
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield [dict(zip(columns, row)) for row in rows]
+
+class FileContents:
+    """Original file contents by hash, loaded on first use (a run has one file per case)"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.contents = {}
+
+    def get(self, file_hash):
+        if file_hash not in self.contents:
+            row = self.conn.execute("SELECT content FROM files WHERE hash = ?", (file_hash,)).fetchone()
+            self.contents[file_hash] = row[0] if row else None
+        return self.contents[file_hash]
+
+def prepare_batch(rows, files):
+    """Split a batch into apply requests and rows whose outcome is simply copied"""
+    requests = []
+    for index, row in enumerate(rows):
+        row['replayed'] = False
+        if row['error_enum'] not in REPLAYABLE_ERRORS or not row['original_file_hash']:
+            continue
+        diff = extract_diff(row['parsed_tool_call_json'])
+        original = files.get(row['original_file_hash'])
+        if diff is None or original is None:
+            continue
+        requests.append((index, diff, original))
+    return requests
+
+def apply_outcomes(rows, outcomes):
+    for index, (ok, _, apply_ms) in outcomes.items():
+        rows[index]['replayed'] = True
+        rows[index]['new_succeeded'] = ok
+        rows[index]['new_error_enum'] = None if ok else DIFF_EDIT_ERROR
+        rows[index]['new_apply_time_ms'] = apply_ms
+
+def write_batch(conn, rows, copy_columns, replay_run_id, functions_hash, case_ids, record_apply_time):
+    columns = ['result_id', 'run_id', 'case_id', 'processing_functions_hash', 'succeeded', 'error_enum'] + copy_columns
+    if record_apply_time:
+        columns.append('apply_time_ms')
+    placeholders = ', '.join('?' for _ in columns)
+    conn.executemany(
+        f"INSERT INTO results ({', '.join(columns)}) VALUES ({placeholders})",
+        [
+            [
+                str(uuid.uuid4()),
+                replay_run_id,
+                case_ids[row['case_id']],
+                functions_hash,
+                row['new_succeeded'] if row['replayed'] else row['succeeded'],
+                row['new_error_enum'] if row['replayed'] else row['error_enum'],
+            ] + [row[column] for column in copy_columns]
+            + ([row['new_apply_time_ms'] if row['replayed'] else None] if record_apply_time else [])
+            for row in rows
+        ]
+    )
+
+def tally(summary, rows):
+    """Per-model counts of replayed attempts and how their outcome changed"""
+    for row in rows:
+        counts = summary.setdefault(row['model_id'], {'results': 0, 'replayed': 0, 'succeeded_before': 0, 'succeeded_after': 0, 'gained': 0, 'lost': 0})
+        counts['results'] += 1
+        if not row['replayed']:
+            continue
+        before, after = bool(row['succeeded']), bool(row['new_succeeded'])
+        counts['replayed'] += 1
+        counts['succeeded_before'] += before
+        counts['succeeded_after'] += after
+        counts['gained'] += after and not before
+        counts['lost'] += before and not after
+
+def print_summary(summary):
+    log(f"{'model':<40} {'results':>8} {'replayed':>9} {'before':>8} {'after':>8} {'gained':>7} {'lost':>5}")
+    for model_id, counts in sorted(summary.items()):
+        replayed = counts['replayed']
+        before = counts['succeeded_before'] / replayed if replayed else 0.0
+        after = counts['succeeded_after'] / replayed if replayed else 0.0
+        log(f"{model_id:<40} {counts['results']:>8} {replayed:>9} {before:>8.1%} {after:>8.1%} {counts['gained']:>7} {counts['lost']:>5}")
+
+def replay_run(db_path, run_id, diff_apply, workers, batch_size, worker_command, dry_run):
+    reader = sqlite3.connect(db_path)
+    writer = sqlite3.connect(db_path)
+    # WAL (as set by the benchmark's client.ts) lets the streaming reader and the writer overlap
+    writer.execute("PRAGMA journal_mode=WAL")
+
+    result_columns = [column for _, column, *_ in writer.execute("PRAGMA table_info(results)").fetchall()]
+    copy_columns = [column for column in result_columns if column not in REPLACED_COLUMNS]
+    # Databases created before apply timing was recorded don't have the column until client.ts adds it
+    record_apply_time = 'apply_time_ms' in result_columns
+    replay_run_id, functions_hash, case_ids = create_replay_run(writer, run_id, diff_apply)
+    log(f"Replaying run {run_id} with {diff_apply} ({len(case_ids)} cases, {workers} workers)")
+
+    files = FileContents(reader)
+    summary = {}
+    pending = {}  # future -> rows of its batch
+    written = 0
+
+    def finish(future):
+        nonlocal written
+        rows = pending.pop(future)
+        apply_outcomes(rows, future.result())
+        tally(summary, rows)
+        if not dry_run:
+            write_batch(writer, rows, copy_columns, replay_run_id, functions_hash, case_ids, record_apply_time)
+        written += len(rows)
+        log(f"  {written} results replayed")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_start_apply_process,
+                                 initargs=(worker_command, diff_apply)) as pool:
+            for rows in stream_results(reader, run_id, batch_size):
+                requests = prepare_batch(rows, files)
+                pending[pool.submit(apply_batch, requests)] = rows
+                # Keep a bounded number of batches in flight so memory stays flat on big runs
+                while len(pending) >= workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(future)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(future)
+    except BaseException:
+        writer.rollback()
+        raise
+
+    if dry_run:
+        writer.rollback()
+        log("Dry run: nothing written")
+    else:
+        writer.commit()
+        log(f"New run ID: {replay_run_id} (processing_functions_hash {functions_hash[:12]})")
+    print_summary(summary)
+    return None if dry_run else replay_run_id
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay stored model outputs through a diff-apply algorithm')
+    parser.add_argument('run_id', help='Run to replay')
+    parser.add_argument('--diff-apply', required=True, choices=DIFF_APPLY_FUNCTIONS, help='diff-apply implementation to score')
+    parser.add_argument('--db', default=get_database_path(), help='Path to evals.db (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes (default: %(default)s)')
+    parser.add_argument('--batch-size', type=int, default=64, help='Results per worker task (default: %(default)s)')
+    parser.add_argument('--worker-command', default=DEFAULT_WORKER_COMMAND,
+                        help='Command that starts replay-worker.ts, run from the benchmark directory (default: %(default)s)')
+    parser.add_argument('--dry-run', action='store_true', help='Score and print the summary without writing a run')
+    args = parser.parse_args()
+
+    replay_run(args.db, args.run_id, args.diff_apply, args.workers, args.batch_size, args.worker_command, args.dry_run)
+
+if __name__ == "__main__":
+    main()
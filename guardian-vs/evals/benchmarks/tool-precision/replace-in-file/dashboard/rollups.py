@@ -0,0 +1,146 @@
+"""
+Per-run summary tables, so dashboard pages aggregate a few thousand rollup rows instead of
+scanning every result.
+
+result_rollups holds one row per (run, task, model, validity) with attempt, success,
+cost, token and time totals. A run is (re)summarized only when its result count differs
+from the count recorded in rollup_runs, so finished runs are summarized exactly once and
+a run that is still being written is picked up again on the next refresh.
+
+latency_rollups keeps a histogram of valid round-trip times per (run, model, system
+prompt, processing functions) in buckets 5% wide, so percentiles such as p95 can be
+read from the summary tables to within the bucket width.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils import get_database_connection
+
+# Each latency bucket spans a factor of this much; bucket b covers [GROWTH^b, GROWTH^(b+1)) ms
+LATENCY_BUCKET_GROWTH = 1.05
+
+ROLLUP_DDL = """
+CREATE TABLE IF NOT EXISTS result_rollups (
+    run_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    model_id TEXT NOT NULL,
+    system_prompt_hash TEXT,
+    processing_functions_hash TEXT NOT NULL,
+    is_valid INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    successes INTEGER NOT NULL,
+    total_cost_usd REAL,
+    total_input_tokens INTEGER,
+    total_completion_tokens INTEGER,
+    total_round_trip_ms REAL,
+    PRIMARY KEY (run_id, task_id, model_id, processing_functions_hash, is_valid)
+);
+CREATE TABLE IF NOT EXISTS latency_rollups (
+    run_id TEXT NOT NULL,
+    model_id TEXT NOT NULL,
+    system_prompt_hash TEXT NOT NULL,
+    processing_functions_hash TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    PRIMARY KEY (run_id, model_id, system_prompt_hash, processing_functions_hash, bucket)
+);
+-- One model's rows across all runs (Model History); the primary keys lead with run_id
+CREATE INDEX IF NOT EXISTS idx_result_rollups_model ON result_rollups(model_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_latency_rollups_model ON latency_rollups(model_id, run_id);
+CREATE TABLE IF NOT EXISTS rollup_runs (
+    run_id TEXT PRIMARY KEY,
+    num_results INTEGER NOT NULL,
+    refreshed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+ROLLUP_INSERT = """
+INSERT INTO result_rollups
+SELECT
+    c.run_id,
+    c.task_id,
+    res.model_id,
+    c.system_prompt_hash,
+    res.processing_functions_hash,
+    CASE WHEN res.error_enum NOT IN (1, 6, 7) OR res.error_enum IS NULL THEN 1 ELSE 0 END AS is_valid,
+    COUNT(*),
+    SUM(res.succeeded),
+    SUM(res.cost_usd),
+    SUM(c.tokens_in_context),
+    SUM(res.completion_tokens),
+    SUM(res.time_round_trip_ms)
+FROM results res
+JOIN cases c ON res.case_id = c.case_id
+WHERE c.run_id = ?
+GROUP BY c.run_id, c.task_id, res.model_id, res.processing_functions_hash, is_valid
+"""
+
+def ensure_rollup_tables(conn):
+    has_latency = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'latency_rollups'").fetchone()
+    conn.executescript(ROLLUP_DDL)
+    if not has_latency:
+        # Runs summarized before latency_rollups existed have no histogram yet; summarize everything again
+        with conn:
+            conn.execute("DELETE FROM rollup_runs")
+
+def latency_bucket(latency_ms):
+    return np.floor(np.log(np.maximum(latency_ms, 1.0)) / np.log(LATENCY_BUCKET_GROWTH)).astype(np.int64)
+
+def bucket_midpoint(bucket):
+    return LATENCY_BUCKET_GROWTH ** (np.asarray(bucket) + 0.5)
+
+def insert_latency_rollups(conn, run_id):
+    """Histogram of valid round-trip times for one run"""
+    latency_df = pd.read_sql_query("""
+    SELECT res.model_id, c.system_prompt_hash, res.processing_functions_hash, res.time_round_trip_ms
+    FROM results res
+    JOIN cases c ON res.case_id = c.case_id
+    WHERE c.run_id = ?
+      AND res.time_round_trip_ms IS NOT NULL
+      AND (res.error_enum NOT IN (1, 6, 7) OR res.error_enum IS NULL)
+    """, conn, params=(run_id,))
+    if latency_df.empty:
+        return
+    latency_df['bucket'] = latency_bucket(latency_df['time_round_trip_ms'].to_numpy(dtype=float))
+    counts = latency_df.groupby(['model_id', 'system_prompt_hash', 'processing_functions_hash', 'bucket']).size()
+    conn.executemany(
+        "INSERT INTO latency_rollups VALUES (?, ?, ?, ?, ?, ?)",
+        [(run_id, *key[:3], int(key[3]), int(count)) for key, count in counts.items()]
+    )
+
+def histogram_quantiles(histogram_df, keys, q):
+    """Quantile per group of latency_rollups rows: midpoint of the first bucket whose cumulative count reaches q"""
+    histogram_df = histogram_df.sort_values(keys + ['bucket'])
+    cumulative = histogram_df.groupby(keys)['attempts'].cumsum()
+    totals = histogram_df.groupby(keys)['attempts'].transform('sum')
+    reached = histogram_df[cumulative >= q * totals]
+    first = reached.groupby(keys)['bucket'].min()
+    return pd.Series(bucket_midpoint(first.to_numpy()), index=first.index)
+
+def refresh_rollups(conn):
+    """Summarize new or changed runs and drop rollups of deleted runs; returns the refreshed run ids"""
+    ensure_rollup_tables(conn)
+
+    current = dict(conn.execute("SELECT run_id, COUNT(*) FROM results GROUP BY run_id").fetchall())
+    recorded = dict(conn.execute("SELECT run_id, num_results FROM rollup_runs").fetchall())
+    stale = [run_id for run_id, count in current.items() if recorded.get(run_id) != count]
+    removed = [run_id for run_id in recorded if run_id not in current]
+
+    with conn:
+        for run_id in removed + stale:
+            conn.execute("DELETE FROM result_rollups WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM latency_rollups WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM rollup_runs WHERE run_id = ?", (run_id,))
+        for run_id in stale:
+            conn.execute(ROLLUP_INSERT, (run_id,))
+            insert_latency_rollups(conn, run_id)
+            conn.execute("INSERT INTO rollup_runs (run_id, num_results) VALUES (?, ?)", (run_id, current[run_id]))
+    return stale
+
+@st.cache_data(ttl=300)
+def ensure_rollups_fresh():
+    """Refresh the rollups at most every few minutes; returns a version that changes when they do"""
+    conn = get_database_connection()
+    refresh_rollups(conn)
+    return conn.execute("SELECT COUNT(*), SUM(num_results) FROM rollup_runs").fetchone()
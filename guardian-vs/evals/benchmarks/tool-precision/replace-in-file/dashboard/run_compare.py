@@ -0,0 +1,80 @@
+import math
+import streamlit as st
+import pandas as pd
+import numpy as np
+from outcome_matrix import load_outcome_matrix
+
+# A (task, model) cell "passes" when at least this share of its valid attempts succeeded
+PASS_THRESHOLD = 0.5
+
+def normal_two_sided_p(z):
+    return math.erfc(abs(z) / math.sqrt(2))
+
+def mcnemar_p(regressed, fixed):
+    """Continuity-corrected McNemar test on discordant pairs (pass->fail vs fail->pass)"""
+    discordant = regressed + fixed
+    if discordant == 0:
+        return 1.0
+    chi2 = max(abs(regressed - fixed) - 1, 0) ** 2 / discordant
+    return normal_two_sided_p(math.sqrt(chi2))
+
+def paired_mean_p(deltas):
+    """Two-sided p-value that the mean paired delta is zero (normal approximation)"""
+    deltas = deltas[~np.isnan(deltas)]
+    if len(deltas) < 2:
+        return float('nan')
+    std = deltas.std(ddof=1)
+    if std == 0:
+        return 1.0 if deltas.mean() == 0 else 0.0
+    return normal_two_sided_p(deltas.mean() / (std / math.sqrt(len(deltas))))
+
+def diff_cells(cells_a, cells_b):
+    """Join two runs' per-cell outcomes on (task_id, model_id) and classify flips"""
+    diff_df = cells_a.merge(cells_b, on=['task_id', 'model_id'], suffixes=('_a', '_b'))
+
+    passed_a = diff_df['success_rate_a'] >= PASS_THRESHOLD
+    passed_b = diff_df['success_rate_b'] >= PASS_THRESHOLD
+    diff_df['flip'] = np.select(
+        [passed_a & ~passed_b, ~passed_a & passed_b, passed_a],
+        ['regressed', 'fixed', 'still passing'],
+        default='still failing'
+    )
+    diff_df['success_rate_delta'] = diff_df['success_rate_b'] - diff_df['success_rate_a']
+    diff_df['latency_delta_ms'] = diff_df['median_latency_ms_b'] - diff_df['median_latency_ms_a']
+    diff_df['cost_per_attempt_delta_usd'] = (
+        diff_df['total_cost_usd_b'] / diff_df['attempts_b'] - diff_df['total_cost_usd_a'] / diff_df['attempts_a']
+    )
+    return diff_df
+
+def summarize_diff(diff_df):
+    """Per-model flip counts, deltas and significance"""
+    rows = []
+    for model_id, model_df in diff_df.groupby('model_id', sort=True):
+        regressed = int((model_df['flip'] == 'regressed').sum())
+        fixed = int((model_df['flip'] == 'fixed').sum())
+        latency_deltas = model_df['latency_delta_ms'].to_numpy(dtype=np.float64)
+        rows.append({
+            'model_id': model_id,
+            'cases_compared': len(model_df),
+            'success_rate_a': model_df['successes_a'].sum() / model_df['attempts_a'].sum(),
+            'success_rate_b': model_df['successes_b'].sum() / model_df['attempts_b'].sum(),
+            'regressed': regressed,
+            'fixed': fixed,
+            'flip_p_value': mcnemar_p(regressed, fixed),
+            'median_latency_delta_ms': np.nanmedian(latency_deltas) if not np.isnan(latency_deltas).all() else np.nan,
+            'latency_p_value': paired_mean_p(latency_deltas),
+            'cost_per_attempt_delta_usd': model_df['cost_per_attempt_delta_usd'].mean(),
+        })
+    return pd.DataFrame(rows)
+
+@st.cache_data
+def load_run_diff(run_id_a, run_id_b):
+    """Per-case diff and per-model summary between a baseline run (a) and a candidate run (b).
+
+    Both sides come from the cached per-run outcome matrices, so comparing a pair only
+    costs a merge once each run's matrix has been built.
+    """
+    cells_a = load_outcome_matrix(run_id_a).to_frame()
+    cells_b = load_outcome_matrix(run_id_b).to_frame()
+    diff_df = diff_cells(cells_a, cells_b)
+    return diff_df, summarize_diff(diff_df)
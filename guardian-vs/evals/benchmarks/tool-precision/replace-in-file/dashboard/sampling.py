@@ -0,0 +1,153 @@
+"""
+Approximate statistics from a stratified sample of results.
+
+Exploratory pages that read every result of the selected runs get slower as history
+grows. In approximate mode they read a sample instead, stratified by (task, model): the
+stratum sizes N_h come from result_rollups, and a stratum's sample is every attempt
+whose results.sample_key (uniform in [0, 1), see migrations.py) is below the stratum's
+threshold, a range scan on idx_results_case_sample. The threshold is the sampling
+fraction, raised for small strata so each one expects at least MIN_PER_STRATUM attempts.
+The fraction is picked so the sample holds about a fixed number of attempts, which
+keeps the pages' latency flat however many results exist.
+
+Every attempt is sampled independently with probability pi = its stratum's threshold,
+so a sampled attempt stands for weight = 1 / pi attempts. Estimators take the weights
+into account and report 95% bounds:
+- weighted_rates: ratio estimates (success rates, means) with a margin from the
+  linearized variance under Poisson sampling, sum of (1 - pi) * w^2 * z^2.
+- weighted_quantiles: percentiles with an interval from the order statistics at
+  q ± 1.96 * sqrt(q(1 - q) / n_eff), n_eff being the Kish effective sample size.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils import get_database_connection
+
+# Target sample sizes offered in approximate mode
+SAMPLE_SIZES = (5_000, 20_000, 50_000, 100_000)
+DEFAULT_SAMPLE_SIZE = 20_000
+
+# Expected attempts per stratum at least, so small strata still get a weight
+MIN_PER_STRATUM = 3
+
+# Two-sided 95% normal quantile
+Z_95 = 1.96
+
+def strata_cte(placeholders):
+    """The `strata` CTE for a sampled query: the sample_key threshold per (task, model).
+
+    Binds the sampling fraction, then the run ids. Join it as
+        FROM cases c
+        JOIN strata s ON s.task_id = c.task_id
+        JOIN results res ON res.case_id = c.case_id AND res.model_id = s.model_id AND res.sample_key < s.threshold
+        WHERE c.run_id IN (...)
+    """
+    return f"""
+    strata AS (
+        SELECT task_id, model_id,
+               MAX(?, MIN(1.0, {MIN_PER_STRATUM}.0 / SUM(attempts))) AS threshold
+        FROM result_rollups
+        WHERE run_id IN ({placeholders})
+        GROUP BY task_id, model_id
+    )"""
+
+SAMPLED_FROM = """
+    FROM cases c
+    JOIN strata s ON s.task_id = c.task_id
+    JOIN results res ON res.case_id = c.case_id AND res.model_id = s.model_id AND res.sample_key < s.threshold
+"""
+
+@st.cache_data
+def load_population(run_ids, rollup_version):
+    """Attempts and (task, model) strata in the selected runs, from the rollups; rollup_version keys the cache"""
+    conn = get_database_connection()
+    placeholders = ', '.join('?' for _ in run_ids)
+    attempts, strata = conn.execute(f"""
+    SELECT COALESCE(SUM(attempts), 0), COUNT(DISTINCT task_id || char(0) || model_id)
+    FROM result_rollups
+    WHERE run_id IN ({placeholders})
+    """, list(run_ids)).fetchone()
+    return {'attempts': attempts, 'strata': strata}
+
+def sample_fraction(target_size, population):
+    """Fraction of attempts to sample for about target_size attempts (1.0 reads everything)"""
+    if population <= target_size:
+        return 1.0
+    # Rounded so small changes in the population don't change the cache key
+    return float(f"{target_size / population:.2g}")
+
+def add_weights(sample_df):
+    """weight = 1 / inclusion probability, from the stratum threshold the attempt was sampled under"""
+    return sample_df.assign(weight=1.0 / sample_df['threshold'].to_numpy(dtype=np.float64))
+
+def group_codes(df, group_columns):
+    if len(group_columns) == 1:
+        codes, groups = pd.factorize(df[group_columns[0]], sort=True)
+        return codes, pd.DataFrame({group_columns[0]: np.asarray(groups)})
+    codes, groups = pd.factorize(pd.MultiIndex.from_frame(df[group_columns]), sort=True)
+    return codes, groups.to_frame(index=False, name=group_columns)
+
+def weighted_rates(df, group_columns, value_column):
+    """Per group: estimated attempts, weighted mean of value_column and its 95% margin.
+
+    For 0/1 values this is a rate. The ratio estimator is linearized as
+    z = (y - estimate) / estimated attempts; each sampled attempt adds (1 - pi) * (w * z)^2
+    to the variance.
+    """
+    codes, groups = group_codes(df, group_columns)
+    num_groups = len(groups)
+    w = df['weight'].to_numpy(dtype=np.float64)
+    y = df[value_column].to_numpy(dtype=np.float64)
+    total = np.bincount(codes, weights=w, minlength=num_groups)
+    estimate = np.bincount(codes, weights=w * y, minlength=num_groups) / total
+    z = (y - estimate[codes]) / total[codes]
+    variance = np.bincount(codes, weights=(1 - 1 / w) * (w * z) ** 2, minlength=num_groups)
+
+    return groups.assign(
+        estimated_attempts=total,
+        sampled_attempts=np.bincount(codes, minlength=num_groups),
+        estimate=estimate,
+        margin=Z_95 * np.sqrt(variance),
+    )
+
+def weighted_quantiles(df, group_columns, value_column, quantiles):
+    """Per group: weighted quantiles of value_column with 95% bounds.
+
+    Columns p{100q}, p{100q}_low and p{100q}_high for each q (e.g. p90, p90_low,
+    p90_high); NaN values are ignored, groups without any get NaN.
+    """
+    codes, groups = group_codes(df, group_columns)
+    num_groups = len(groups)
+    values = df[value_column].to_numpy(dtype=np.float64)
+    w = df['weight'].to_numpy(dtype=np.float64)
+    has_value = ~np.isnan(values)
+    codes, values, w = codes[has_value], values[has_value], w[has_value]
+
+    order = np.lexsort((values, codes))
+    codes, values, w = codes[order], values[order], w[order]
+    total = np.bincount(codes, weights=w, minlength=num_groups)
+    counts = np.bincount(codes, minlength=num_groups)
+    starts = np.concatenate([[0.0], np.cumsum(total)[:-1]])
+    last = np.cumsum(counts) - 1
+    # Group g's rows sit in (g, g + 1] on this axis, so one searchsorted serves every group
+    position = codes + (np.cumsum(w) - starts[codes]) / total[codes]
+    n_eff = np.divide(total ** 2, np.bincount(codes, weights=w ** 2, minlength=num_groups),
+                      out=np.zeros(num_groups), where=counts > 0)
+
+    def at(levels):
+        index = np.searchsorted(position, np.arange(num_groups) + levels, side='left')
+        # Level 0 lands on the previous group's last row, so clamp to the group's own rows
+        index = np.clip(index, last - counts + 1, last)
+        picked = values[np.clip(index, 0, max(len(values) - 1, 0))] if len(values) else np.full(num_groups, np.nan)
+        return np.where(counts > 0, picked, np.nan)
+
+    result = groups.copy()
+    for q in quantiles:
+        name = f"p{q * 100:g}"
+        with np.errstate(divide='ignore', invalid='ignore'):
+            half = Z_95 * np.sqrt(q * (1 - q) / n_eff)
+        result[name] = at(np.full(num_groups, q))
+        result[f"{name}_low"] = at(np.clip(q - half, 0.0, 1.0))
+        result[f"{name}_high"] = at(np.clip(q + half, 0.0, 1.0))
+    return result
@@ -0,0 +1,115 @@
+"""
+Server-side downsampling for per-result scatter plots.
+
+A run can have tens of thousands of results; sending every one to the browser as an
+SVG marker makes plotly unusable. These helpers pick a bounded subset in NumPy before
+anything is serialized:
+
+- grid_downsample: bins points into a 2-D grid and keeps one representative per
+  occupied cell, weighted by how many results it stands for. The most extreme points
+  (by robust distance from the median) are always kept, so outliers never disappear.
+- lttb: Largest-Triangle-Three-Buckets for a series ordered along x (e.g. by time),
+  which keeps the visual peaks and troughs of the series.
+
+scatter_trace_class switches to WebGL (go.Scattergl) once a figure has more points
+than SVG handles comfortably.
+"""
+
+import numpy as np
+
+# Total points a per-result scatter may send to the browser
+MAX_SCATTER_POINTS = 5000
+
+# Above this many points in one figure, draw with WebGL instead of SVG
+WEBGL_THRESHOLD = 1000
+
+# Share of the point budget reserved for outliers
+OUTLIER_SHARE = 0.1
+
+def scatter_trace_class(num_points, threshold=WEBGL_THRESHOLD):
+    import plotly.graph_objects as go
+
+    return go.Scattergl if num_points > threshold else go.Scatter
+
+def robust_scale(values):
+    """Distance from the median in units of the interquartile range"""
+    low, median, high = np.quantile(values, [0.25, 0.5, 0.75])
+    spread = high - low
+    if spread <= 0:
+        spread = np.abs(values - median).max() or 1.0
+    return np.abs(values - median) / spread
+
+def grid_downsample(x, y, max_points, outlier_share=OUTLIER_SHARE):
+    """Pick at most max_points of (x, y); returns (indices, weights).
+
+    weights[i] is how many input points indices[i] represents: 1 for outliers, the
+    cell population for grid representatives. Weights sum to len(x).
+    Transform x/y (e.g. log10) before calling to grid in the plotted scale.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n), np.ones(n, dtype=np.int64)
+
+    # Most extreme points on either axis, kept individually
+    num_outliers = int(max_points * outlier_share)
+    if num_outliers:
+        score = np.maximum(robust_scale(x), robust_scale(y))
+        outliers = np.argpartition(score, n - num_outliers)[n - num_outliers:]
+    else:
+        outliers = np.array([], dtype=np.int64)
+    rest = np.ones(n, dtype=bool)
+    rest[outliers] = False
+    rest_idx = np.flatnonzero(rest)
+
+    # g*g <= remaining budget, so there can't be more occupied cells than points allowed
+    cells_per_axis = max(int(np.sqrt(max_points - num_outliers)), 1)
+    def cell_of(values):
+        low, high = values.min(), values.max()
+        scaled = (values - low) / (high - low) if high > low else np.zeros_like(values)
+        return np.minimum((scaled * cells_per_axis).astype(np.int64), cells_per_axis - 1)
+    cells = cell_of(x[rest_idx]) * cells_per_axis + cell_of(y[rest_idx])
+
+    # First point seen in each cell represents it; counts become its weight
+    _, first, counts = np.unique(cells, return_index=True, return_counts=True)
+    indices = np.concatenate([outliers, rest_idx[first]])
+    weights = np.concatenate([np.ones(len(outliers), dtype=np.int64), counts])
+    order = np.argsort(indices)
+    return indices[order], weights[order]
+
+def lttb(x, y, max_points):
+    """Largest-Triangle-Three-Buckets; x must be sorted. Returns indices into x/y."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+
+    # First and last points are always kept; the rest is split into max_points - 2 buckets
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # The next bucket's mean is the third vertex of the triangle
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[end:next_end].mean() if next_end > end else x[-1]
+        next_y = y[end:next_end].mean() if next_end > end else y[-1]
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+def allocate_budget(group_sizes, max_points):
+    """Split max_points across groups in proportion to their size (every group gets at least one)"""
+    group_sizes = np.asarray(group_sizes, dtype=np.int64)
+    total = group_sizes.sum()
+    if total <= max_points:
+        return group_sizes
+    budget = np.maximum(np.floor(group_sizes * (max_points / total)).astype(np.int64), 1)
+    return np.minimum(budget, group_sizes)
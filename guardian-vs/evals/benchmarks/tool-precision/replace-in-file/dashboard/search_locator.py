@@ -0,0 +1,208 @@
+"""
+Locate the closest region of the original file for each SEARCH block of a failed edit.
+
+When a diff fails with "does not match anything in the file" the interesting question is
+*how* it missed: indentation only, a few changed lines, or code that isn't there at all.
+Running difflib over the whole file for every block is O(n²) per block; instead each
+original file gets a line index once (whitespace-normalized line -> positions, plus
+identifier token -> positions) and every SEARCH line votes for the diagonal (file line -
+block line) it would align on. Only the few best-voted windows are scored line by line.
+"""
+
+import re
+from collections import Counter, defaultdict
+import pandas as pd
+from utils import get_database_connection, extract_diff
+from frame_cache import cached_frame
+
+# Same block markers diff-apply accepts (including the legacy <<<<<<< / >>>>>>> forms)
+SEARCH_START_RE = re.compile(r'^(?:-{3,}|<{3,}) SEARCH>?$')
+SEARCH_END_RE = re.compile(r'^={3,}$')
+REPLACE_END_RE = re.compile(r'^(?:\+{3,}|>{3,}) REPLACE>?$')
+
+TOKEN_RE = re.compile(r'\w+')
+
+# Lines/tokens that occur more often than this (blank lines, `}`, `return`) carry no position signal
+MAX_POSTINGS = 50
+# Candidate windows scored in full per block
+MAX_CANDIDATES = 5
+
+MISMATCH_KINDS = {
+    'exact': "Matches exactly (the edit failed on another block)",
+    'whitespace': "Whitespace/indentation only",
+    'content': "Content differs",
+    'not found': "No similar region in the file",
+}
+
+def normalize_line(line):
+    return ' '.join(line.split())
+
+def parse_search_blocks(diff):
+    """Return the SEARCH sections of a diff as lists of lines"""
+    blocks = []
+    current = None
+    for line in diff.split('\n'):
+        if SEARCH_START_RE.match(line):
+            current = []
+        elif current is not None and (SEARCH_END_RE.match(line) or REPLACE_END_RE.match(line)):
+            blocks.append(current)
+            current = None
+        elif current is not None:
+            current.append(line)
+    return blocks
+
+def bigram_similarity(a, b):
+    """Dice coefficient over character bigrams; linear in the line lengths"""
+    if a == b:
+        return 1.0
+    if len(a) < 2 or len(b) < 2:
+        return 0.0
+    bigrams_a = Counter(a[i:i + 2] for i in range(len(a) - 1))
+    bigrams_b = Counter(b[i:i + 2] for i in range(len(b) - 1))
+    overlap = sum((bigrams_a & bigrams_b).values())
+    return 2 * overlap / (len(a) - 1 + len(b) - 1)
+
+class FileIndex:
+    """Line-level index of one original file"""
+
+    def __init__(self, content):
+        self.lines = content.split('\n')
+        self.normalized = [normalize_line(line) for line in self.lines]
+        self.line_positions = defaultdict(list)
+        self.token_positions = defaultdict(list)
+        for position, line in enumerate(self.normalized):
+            if not line:
+                continue
+            self.line_positions[line].append(position)
+            for token in set(TOKEN_RE.findall(line)):
+                self.token_positions[token].append(position)
+
+    def candidate_starts(self, search_normalized):
+        """Vote for block start lines; exact (normalized) line hits first, shared tokens as fallback"""
+        votes = Counter()
+        for offset, line in enumerate(search_normalized):
+            positions = self.line_positions.get(line) if line else None
+            if positions and len(positions) <= MAX_POSTINGS:
+                for position in positions:
+                    votes[position - offset] += 1.0
+
+        non_empty = sum(1 for line in search_normalized if line)
+        if not votes or max(votes.values()) < non_empty / 2:
+            # Most lines were edited by the model: fall back to identifier overlap
+            for offset, line in enumerate(search_normalized):
+                tokens = set(TOKEN_RE.findall(line))
+                for token in tokens:
+                    positions = self.token_positions.get(token)
+                    if positions and len(positions) <= MAX_POSTINGS:
+                        for position in positions:
+                            votes[position - offset] += 1.0 / len(tokens)
+
+        last_start = max(len(self.lines) - len(search_normalized), 0)
+        starts = []
+        for start, _ in votes.most_common():
+            start = min(max(start, 0), last_start)
+            if start not in starts:
+                starts.append(start)
+            if len(starts) == MAX_CANDIDATES:
+                break
+        return starts
+
+    def locate(self, search_lines):
+        """Return the best-matching window for a SEARCH block as a dict"""
+        search_normalized = [normalize_line(line) for line in search_lines]
+        best = None
+        for start in self.candidate_starts(search_normalized):
+            window = self.lines[start:start + len(search_lines)]
+            similarities = [
+                bigram_similarity(search_line, file_line)
+                for search_line, file_line in zip(search_lines, window)
+            ]
+            similarity = sum(similarities) / len(search_lines)
+            if best is None or similarity > best['similarity']:
+                best = {'start': start, 'window': window, 'similarity': similarity}
+
+        if best is None:
+            return {
+                'mismatch': 'not found', 'similarity': 0.0, 'line_start': None, 'line_end': None,
+                'first_mismatch_line': None, 'search_text': None, 'file_text': None,
+            }
+
+        window = best['window']
+        start = best['start']
+        if window == search_lines:
+            mismatch = 'exact'
+        elif len(window) == len(search_lines) and [normalize_line(line) for line in window] == search_normalized:
+            mismatch = 'whitespace'
+        else:
+            mismatch = 'content'
+
+        first_mismatch = next(
+            (offset for offset, search_line in enumerate(search_lines)
+             if offset >= len(window) or window[offset] != search_line),
+            None
+        )
+        return {
+            'mismatch': mismatch,
+            'similarity': best['similarity'],
+            'line_start': start + 1,
+            'line_end': start + len(window),
+            'first_mismatch_line': None if first_mismatch is None else start + first_mismatch + 1,
+            'search_text': None if first_mismatch is None else search_lines[first_mismatch],
+            'file_text': None if first_mismatch is None or first_mismatch >= len(window) else window[first_mismatch],
+        }
+
+def diagnose_diff(diff, index):
+    """Locate every non-empty SEARCH block of a diff; returns a list of row dicts"""
+    rows = []
+    for block_index, search_lines in enumerate(parse_search_blocks(diff)):
+        if not any(line.strip() for line in search_lines):
+            continue  # empty SEARCH = whole-file replacement, nothing to locate
+        row = index.locate(search_lines)
+        row['block_index'] = block_index
+        row['search_lines'] = len(search_lines)
+        rows.append(row)
+    return rows
+
+@cached_frame
+def load_search_diagnostics(run_id):
+    """Closest-region diagnostics for every SEARCH block of every failed valid attempt in a run.
+
+    Each original file is indexed once and shared by all results on that case.
+    """
+    conn = get_database_connection()
+
+    failed_df = pd.read_sql_query(
+        """
+        SELECT res.result_id, res.model_id, c.task_id, c.file_hash, res.parsed_tool_call_json
+        FROM results res
+        JOIN cases c ON res.case_id = c.case_id
+        WHERE c.run_id = ?
+          AND res.succeeded = 0
+          AND (res.error_enum NOT IN (1, 6, 7) OR res.error_enum IS NULL)
+          AND c.file_hash IS NOT NULL
+        """,
+        conn,
+        params=(run_id,)
+    )
+    contents = dict(conn.execute(
+        "SELECT hash, content FROM files WHERE hash IN (SELECT DISTINCT file_hash FROM cases WHERE run_id = ?)",
+        (run_id,)
+    ).fetchall())
+
+    indexes = {}
+    rows = []
+    for result in failed_df.itertuples(index=False):
+        diff = extract_diff(result.parsed_tool_call_json)
+        if diff is None or contents.get(result.file_hash) is None:
+            continue
+        if result.file_hash not in indexes:
+            indexes[result.file_hash] = FileIndex(contents[result.file_hash])
+        for row in diagnose_diff(diff, indexes[result.file_hash]):
+            row.update(result_id=result.result_id, model_id=result.model_id, task_id=result.task_id)
+            rows.append(row)
+
+    columns = [
+        'result_id', 'model_id', 'task_id', 'block_index', 'search_lines', 'mismatch', 'similarity',
+        'line_start', 'line_end', 'first_mismatch_line', 'search_text', 'file_text',
+    ]
+    return pd.DataFrame(rows, columns=columns)
@@ -0,0 +1,386 @@
+"""
+Static HTML snapshot of the dashboard, for sharing results without a Streamlit server.
+
+Writes one page per run (hero metrics, model leaderboard, the overview charts and case
+health) plus an index of runs into a self-contained directory that can be opened from
+disk or served by any static file host. Charts are the dashboard's own plotly figures
+(components/overview.py), serialized to JSON at export time and drawn in the browser
+by a single local copy of plotly.js, so no page needs network access or Python.
+
+Runs are exported in parallel, one worker process per page with its own read-only
+connection. manifest.json records a fingerprint per run (description, creation time,
+result count and SITE_VERSION); the next export rewrites only the pages of runs whose
+fingerprint changed, removes pages of deleted runs and rebuilds the index.
+
+Usage (from the dashboard directory):
+    python static_site.py --out site                 # export new and changed runs
+    python static_site.py --out site --workers 8 --force
+    python static_site.py --out site --runs <run_id> <run_id>
+"""
+
+import os
+import sys
+import html
+import json
+import shutil
+import sqlite3
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from utils import get_database_path
+from migrations import migrate
+from rollups import refresh_rollups
+
+# Bump when the page layout changes, so the next export rewrites every page
+SITE_VERSION = 1
+
+STYLESHEET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard.css')
+
+# Least healthy cases listed per run
+CASE_LIMIT = 25
+
+# Dark page around the dashboard's white cards, like the Streamlit theme
+SITE_CSS = """
+body { background: #0e1117; color: #fafafa; font-family: 'Azeret Mono', monospace; margin: 0; }
+main { max-width: 1200px; margin: 0 auto; padding: 2rem 1rem; }
+a { color: #8ab4f8; }
+.metrics, .charts { display: grid; gap: 1rem; }
+.metrics { grid-template-columns: repeat(4, 1fr); }
+.charts { grid-template-columns: repeat(2, 1fr); }
+.chart { min-height: 420px; }
+.model-card .metric-row { flex-wrap: wrap; }
+table { border-collapse: collapse; width: 100%; font-size: 0.85rem; }
+th, td { padding: 0.4rem 0.6rem; border-bottom: 1px solid #31333f; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+footer { color: #6b7280; font-size: 0.8rem; margin-top: 3rem; }
+"""
+
+# Draws every <div class="chart"> from the JSON in the script tag that follows it
+CHART_SCRIPT = """
+document.querySelectorAll('.chart').forEach(function (div) {
+    var figure = JSON.parse(document.getElementById(div.id + '-data').textContent);
+    Plotly.newPlot(div, figure.data, figure.layout, {responsive: true, displaylogo: false});
+});
+"""
+
+def log(message):
+    print(message, file=sys.stderr)
+
+def connect_read_only(db_path):
+    return sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+
+def list_runs(conn):
+    """Every run with its result count as recorded by the rollups"""
+    return pd.read_sql_query("""
+    SELECT r.run_id, r.description, r.created_at, COALESCE(ru.num_results, 0) AS num_results
+    FROM runs r
+    LEFT JOIN rollup_runs ru ON r.run_id = ru.run_id
+    ORDER BY r.created_at DESC
+    """, conn)
+
+def fingerprint(run):
+    key = json.dumps([SITE_VERSION, run['description'], run['created_at'], int(run['num_results'])])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def run_page_name(run_id):
+    return f"runs/{run_id}.html"
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, 'manifest.json')) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'runs': {}}
+
+def write_atomic(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def write_assets(out_dir):
+    """plotly.js and the stylesheets, shared by every page"""
+    import plotly
+    from plotly.offline import get_plotlyjs
+
+    assets = os.path.join(out_dir, 'assets')
+    os.makedirs(assets, exist_ok=True)
+    version_path = os.path.join(assets, 'plotly.version')
+    plotly_current = os.path.exists(version_path) and open(version_path).read() == plotly.__version__
+    if not plotly_current:
+        write_atomic(os.path.join(assets, 'plotly.min.js'), get_plotlyjs())
+        write_atomic(version_path, plotly.__version__)
+    shutil.copyfile(STYLESHEET_PATH, os.path.join(assets, 'dashboard.css'))
+    write_atomic(os.path.join(assets, 'site.css'), SITE_CSS)
+
+# --- Page rendering ---
+
+def escape(value):
+    return html.escape('' if value is None or (isinstance(value, float) and pd.isna(value)) else str(value))
+
+def format_value(value, template, missing="N/A"):
+    return missing if value is None or pd.isna(value) else template.format(value)
+
+def page(title, body, depth):
+    """A complete HTML document; depth is how many directories below the site root it lives"""
+    root = '../' * depth
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{escape(title)}</title>
+<link rel="stylesheet" href="{root}assets/dashboard.css">
+<link rel="stylesheet" href="{root}assets/site.css">
+<script src="{root}assets/plotly.min.js"></script>
+</head>
+<body>
+<main class="main">
+{body}
+<footer>Static snapshot exported by static_site.py</footer>
+</main>
+<script>{CHART_SCRIPT}</script>
+</body>
+</html>
+"""
+
+def chart(chart_id, fig):
+    # Pre-serialized figure; "</" is escaped so the JSON can't close the script tag
+    figure_json = fig.to_json().replace('</', '<\\/')
+    return (f'<div class="chart" id="{chart_id}"></div>\n'
+            f'<script type="application/json" id="{chart_id}-data">{figure_json}</script>')
+
+def table(frame, formats):
+    header = ''.join(f"<th>{escape(column)}</th>" for column in frame.columns)
+    rows = []
+    for record in frame.itertuples(index=False):
+        cells = ''.join(
+            f"<td>{escape(format_value(value, formats[column], '–') if column in formats else value)}</td>"
+            for column, value in zip(frame.columns, record)
+        )
+        rows.append(f"<tr>{cells}</tr>")
+    return f"<table><thead><tr>{header}</tr></thead><tbody>{''.join(rows)}</tbody></table>"
+
+def hero_section(run, model_performance):
+    run_title = run['description'] if run['description'] else f"Run {run['run_id'][:8]}..."
+    overall_success = model_performance['success_rate'].mean()
+    success_color = "#10b981" if overall_success > 0.8 else "#f59e0b" if overall_success > 0.6 else "#ef4444"
+    metrics = [
+        (len(model_performance), "Models Tested", None),
+        (model_performance['total_results'].sum(), "Valid Results", None),
+        (f"{overall_success:.1%}", "Avg Success Rate", success_color),
+        (f"${model_performance['total_cost'].sum():.3f}", "Total Cost", None),
+    ]
+    metric_html = ''.join(f"""
+    <div class="custom-metric">
+        <div class="custom-metric-value"{f' style="color: {color}"' if color else ''}>{escape(value)}</div>
+        <div class="custom-metric-label">{label}</div>
+    </div>""" for value, label, color in metrics)
+    return f"""
+<div class="hero-container">
+    <div class="hero-title">Diff Edit Evaluation Results</div>
+    <div class="hero-subtitle" style="font-size: 0.9rem; margin-top: 10px;">
+        <strong>Run:</strong> {escape(run_title)} • {escape(run['created_at'])}
+    </div>
+</div>
+<div class="metrics">{metric_html}</div>
+"""
+
+def model_cards(model_performance):
+    from components.overview import get_performance_grade
+
+    cards = []
+    for position, model in enumerate(model_performance.itertuples(index=False)):
+        grade, grade_class = get_performance_grade(model.success_rate)
+        badge = {'A': 'badge-a', 'B': 'badge-b'}.get(grade[0], 'badge-c')
+        metrics = [
+            ("Avg Latency", format_value(model.avg_round_trip_ms, "{:.0f}ms")),
+            ("Avg Cost", format_value(model.avg_cost, "${:.4f}")),
+            ("Valid Results", model.total_results),
+            ("First Token", format_value(model.avg_first_token_ms, "{:.0f}ms")),
+        ]
+        metric_html = ''.join(
+            f'<span><span class="metric-label">{label}</span> <span class="metric-value">{escape(value)}</span></span>'
+            for label, value in metrics
+        )
+        cards.append(f"""
+<div class="model-card{' best-performer' if position == 0 else ''}">
+    <div class="model-name">{escape(model.model_id)}{' - Best Performer' if position == 0 else ''}
+        <span class="performance-badge {badge}">{grade}</span></div>
+    <div class="success-rate {grade_class}">{model.success_rate:.1%}</div>
+    <div class="metric-row">{metric_html}</div>
+</div>""")
+    return "<h2>Model Leaderboard</h2>" + ''.join(cards)
+
+def case_health_section(conn, run_id):
+    """Least healthy cases of the run (same measures as the Case Health Inspector), with flakiness"""
+    from api import query_case_health
+    from flakiness import query_run_outcomes, flakiness_scores, case_flakiness
+
+    health = pd.DataFrame(query_case_health(conn, run_id, CASE_LIMIT))
+    if health.empty:
+        return "<h2>Case Health</h2><p>No cases recorded for this run.</p>"
+    flakiness = case_flakiness(flakiness_scores(query_run_outcomes(conn, run_id)))
+    health = health.merge(flakiness, on='task_id', how='left')
+    health = health[[
+        'task_id', 'total_attempts', 'total_valid_attempts', 'percent_valid_attempts',
+        'success_rate_on_valid', 'max_entropy', 'flaky_models'
+    ]]
+    return (f"<h2>Case Health</h2><p>The {len(health)} least healthy cases in this run: lowest share of valid "
+            "attempts first, then lowest success rate. Max entropy is the flakiest model's outcome entropy "
+            "in bits (1 = a coin flip).</p>"
+            + table(health, {
+                'percent_valid_attempts': "{:.1f}%",
+                'success_rate_on_valid': "{:.1f}%",
+                'max_entropy': "{:.2f}",
+                'flaky_models': "{:.0f}",
+            }))
+
+def render_run_page(conn, run_id):
+    """(HTML of the run's page, summary for the index), or None if the run has no valid results"""
+    from data import query_run_comparison, query_metric_histogram
+    from components.overview import (
+        success_rate_figure, first_edit_figure, latency_cost_figure, histogram_figure
+    )
+
+    run, model_performance = query_run_comparison(conn, run_id)
+    if run is None or model_performance.empty:
+        return None
+
+    charts = [
+        chart('success-rate', success_rate_figure(model_performance)),
+        chart('first-edit', first_edit_figure(model_performance)),
+        chart('latency-cost', latency_cost_figure(model_performance)),
+    ]
+    for column, title, log_scale in (
+        ('time_round_trip_ms', "Round Trip Latency Distribution", True),
+        ('completion_tokens', "Completion Tokens Distribution", False),
+    ):
+        model_ids, edges, counts = query_metric_histogram(conn, run_id, column, log_scale=log_scale)
+        if model_ids:
+            charts.append(chart(column.replace('_', '-'), histogram_figure(model_ids, edges, counts, column, title, log_scale)))
+
+    body = (
+        '<p><a href="../index.html">&larr; All runs</a></p>'
+        + hero_section(run, model_performance)
+        + model_cards(model_performance)
+        + f'<h2>Performance Analysis</h2><div class="charts">{"".join(charts)}</div>'
+        + case_health_section(conn, run_id)
+    )
+    summary = {
+        'models': len(model_performance),
+        'valid_results': int(model_performance['total_results'].sum()),
+        'success_rate': float(model_performance['success_rate'].mean()),
+        'total_cost': float(model_performance['total_cost'].sum()),
+        'best_model': model_performance.iloc[0]['model_id'],
+    }
+    return page(f"{run['description'] or run_id} – Diff Edit Evals", body, depth=1), summary
+
+def render_index(runs, entries):
+    rows = []
+    for run in runs.itertuples(index=False):
+        entry = entries.get(run.run_id)
+        if entry is None:
+            continue
+        summary = entry['summary']
+        rows.append(f"""<tr>
+    <td><a href="{run_page_name(run.run_id)}">{escape(run.description or run.run_id[:8])}</a></td>
+    <td>{escape(run.created_at)}</td>
+    <td>{summary['models']}</td>
+    <td>{summary['valid_results']:,}</td>
+    <td>{summary['success_rate']:.1%}</td>
+    <td>${summary['total_cost']:.3f}</td>
+    <td>{escape(summary['best_model'])}</td>
+</tr>""")
+    body = f"""
+<div class="hero-container">
+    <div class="hero-title">Diff Edit Evaluation Results</div>
+    <div class="hero-subtitle">{len(rows)} runs, newest first.</div>
+</div>
+<table>
+<thead><tr><th>Run</th><th>Created</th><th>Models</th><th>Valid Results</th><th>Avg Success Rate</th><th>Total Cost</th><th>Best Model</th></tr></thead>
+<tbody>{''.join(rows)}</tbody>
+</table>
+"""
+    return page("Diff Edit Evals", body, depth=0)
+
+# --- Parallel export ---
+
+_worker_conn = None
+
+def _start_worker(db_path):
+    global _worker_conn
+    _worker_conn = connect_read_only(db_path)
+
+def export_run(out_dir, run_id):
+    """Runs in a worker process: write one run's page, return its summary (None if skipped)"""
+    rendered = render_run_page(_worker_conn, run_id)
+    if rendered is None:
+        return None
+    text, summary = rendered
+    write_atomic(os.path.join(out_dir, run_page_name(run_id)), text)
+    return summary
+
+def export_site(db_path, out_dir, workers, force=False, run_ids=None):
+    conn = sqlite3.connect(db_path)
+    # Case health reads the rollups, so bring them (and the schema) up to date first
+    migrate(conn)
+    refresh_rollups(conn)
+    runs = list_runs(conn)
+    conn.close()
+
+    manifest = load_manifest(out_dir)
+    # Pages from another layout version are all rewritten
+    force = force or manifest.get('site_version') != SITE_VERSION
+    entries = manifest['runs']
+    current = {run.run_id: fingerprint(run._asdict()) for run in runs.itertuples(index=False)}
+
+    removed = [run_id for run_id in entries if run_id not in current]
+    for run_id in removed:
+        entries.pop(run_id)
+        page_path = os.path.join(out_dir, run_page_name(run_id))
+        if os.path.exists(page_path):
+            os.remove(page_path)
+
+    stale = [run_id for run_id, key in current.items() if force or entries.get(run_id, {}).get('fingerprint') != key]
+    if run_ids:
+        stale = [run_id for run_id in stale if run_id in run_ids]
+    log(f"{len(stale)} of {len(current)} run(s) to export, {len(removed)} removed")
+
+    write_assets(out_dir)
+    exported = skipped = 0
+    if stale:
+        with ProcessPoolExecutor(max_workers=min(workers, len(stale)), initializer=_start_worker, initargs=(db_path,)) as pool:
+            futures = {pool.submit(export_run, out_dir, run_id): run_id for run_id in stale}
+            for future in as_completed(futures):
+                run_id = futures[future]
+                summary = future.result()
+                if summary is None:
+                    # No valid results yet; keep it out of the manifest so it is tried again next time
+                    entries.pop(run_id, None)
+                    skipped += 1
+                    continue
+                entries[run_id] = {'fingerprint': current[run_id], 'summary': summary}
+                exported += 1
+                log(f"  {run_page_name(run_id)}")
+
+    write_atomic(os.path.join(out_dir, 'index.html'), render_index(runs, entries))
+    write_atomic(os.path.join(out_dir, 'manifest.json'), json.dumps({'site_version': SITE_VERSION, 'runs': entries}, indent=1))
+    log(f"Exported {exported} page(s), {skipped} run(s) without valid results skipped; "
+        f"open {os.path.join(out_dir, 'index.html')}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the dashboard as a static HTML site, one page per run')
+    parser.add_argument('--out', required=True, help='Output directory')
+    parser.add_argument('--db', default=get_database_path(), help='Path to evals.db (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes (default: %(default)s)')
+    parser.add_argument('--force', action='store_true', help='Rewrite every page, not just new and changed runs')
+    parser.add_argument('--runs', nargs='+', help='Only export these runs (if new or changed)')
+    args = parser.parse_args()
+
+    export_site(args.db, args.out, args.workers, args.force, set(args.runs) if args.runs else None)
+
+if __name__ == "__main__":
+    main()
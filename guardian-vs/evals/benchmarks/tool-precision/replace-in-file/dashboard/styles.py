@@ -0,0 +1,32 @@
+import os
+import json
+import streamlit as st
+
+STYLESHEET_PATH = os.path.join(os.path.dirname(__file__), 'dashboard.css')
+
+@st.cache_resource
+def load_stylesheet():
+    with open(STYLESHEET_PATH) as f:
+        return f.read()
+
+def inject_styles():
+    """Add the dashboard stylesheet to the page <head> once per browser session.
+
+    The style element lives in the parent document, so it survives reruns and page
+    switches without the CSS being re-sent on every rerun.
+    """
+    if st.session_state.get('styles_injected'):
+        return
+
+    st.components.v1.html(f"""
+    <script>
+        const doc = window.parent.document;
+        if (!doc.getElementById('diff-evals-dashboard-styles')) {{
+            const style = doc.createElement('style');
+            style.id = 'diff-evals-dashboard-styles';
+            style.textContent = {json.dumps(load_stylesheet())};
+            doc.head.appendChild(style);
+        }}
+    </script>
+    """, height=0)
+    st.session_state.styles_injected = True
@@ -0,0 +1,100 @@
+"""
+Reconstruct when each attempt of a run was in flight.
+
+results.created_at is written when an attempt finishes, so an attempt ran over
+[created_at - time_round_trip_ms, created_at]. Concurrency is a sweep over the sorted
+start (+1) and end (-1) events; everything here is NumPy over whole arrays so runs with
+tens of thousands of attempts stay fast.
+"""
+
+import heapq
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils import get_database_connection
+
+@st.cache_data
+def load_attempt_intervals(run_id):
+    """One row per attempt: model_id, start/end (seconds since the run's first start), validity"""
+    conn = get_database_connection()
+    query = """
+    SELECT
+        res.model_id,
+        CAST(strftime('%s', res.created_at) AS REAL) AS end_s,
+        res.time_round_trip_ms,
+        CASE WHEN res.error_enum NOT IN (1, 6, 7) OR res.error_enum IS NULL THEN 1 ELSE 0 END AS is_valid
+    FROM results res
+    WHERE res.run_id = ? AND res.created_at IS NOT NULL
+    """
+    intervals_df = pd.read_sql_query(query, conn, params=(run_id,))
+    if intervals_df.empty:
+        return intervals_df
+
+    # created_at has one-second resolution; treat it as the end of that second
+    end_s = intervals_df['end_s'].to_numpy() + 1.0
+    start_s = end_s - intervals_df['time_round_trip_ms'].fillna(0).to_numpy() / 1000.0
+    origin = start_s.min()
+    intervals_df['start_s'] = start_s - origin
+    intervals_df['end_s'] = end_s - origin
+    intervals_df['model_id'] = intervals_df['model_id'].astype('category')
+    return intervals_df.drop(columns='time_round_trip_ms').sort_values('start_s', ignore_index=True)
+
+def concurrency_profile(start_s, end_s):
+    """Step function of attempts in flight: returns (times, level after each time)"""
+    times = np.concatenate([start_s, end_s])
+    deltas = np.concatenate([np.ones(len(start_s), dtype=np.int32), -np.ones(len(end_s), dtype=np.int32)])
+    # Ends sort before starts at the same instant, so back-to-back attempts don't count as overlapping
+    order = np.lexsort((deltas, times))
+    times = times[order]
+    levels = np.cumsum(deltas[order])
+    # Collapse simultaneous events to the level after the last one
+    last_of_time = np.r_[times[1:] != times[:-1], True]
+    return times[last_of_time], levels[last_of_time]
+
+def time_weighted_mean(times, levels):
+    if len(times) < 2:
+        return 0.0
+    durations = np.diff(times)
+    return float((levels[:-1] * durations).sum() / durations.sum()) if durations.sum() else 0.0
+
+def idle_gaps(times, levels, min_gap_s=5.0):
+    """Stretches where nothing was in flight: DataFrame of start_s, end_s, duration_s"""
+    durations = np.diff(times)
+    idle = (levels[:-1] == 0) & (durations >= min_gap_s)
+    return pd.DataFrame({
+        'start_s': times[:-1][idle],
+        'end_s': times[1:][idle],
+        'duration_s': durations[idle],
+    })
+
+def completions_per_minute(intervals_df):
+    """Finished attempts per minute and model: (minute bin starts, DataFrame minutes x models)"""
+    num_bins = max(int(np.ceil(intervals_df['end_s'].max() / 60.0)), 1)
+    edges = np.arange(num_bins + 1) * 60.0
+    counts = {
+        model_id: np.histogram(model_df['end_s'].to_numpy(), bins=edges)[0]
+        for model_id, model_df in intervals_df.groupby('model_id', observed=True)
+    }
+    return edges[:-1], pd.DataFrame(counts, index=edges[:-1] / 60.0)
+
+def assign_lanes(start_s, end_s):
+    """Greedy interval packing: the lowest free lane for each attempt (inputs sorted by start)"""
+    lanes = np.empty(len(start_s), dtype=np.int32)
+    busy = []  # heap of (end, lane)
+    free = []  # heap of free lane numbers
+    for i, (start, end) in enumerate(zip(start_s, end_s)):
+        while busy and busy[0][0] <= start:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        lane = heapq.heappop(free) if free else len(busy)
+        lanes[i] = lane
+        heapq.heappush(busy, (end, lane))
+    return lanes
+
+def gantt_segments(start_s, end_s, lanes):
+    """x/y arrays for one line trace per attempt, separated by NaN, for a single WebGL trace"""
+    count = len(start_s)
+    x = np.full(count * 3, np.nan)
+    y = np.full(count * 3, np.nan)
+    x[0::3], x[1::3] = start_s, end_s
+    y[0::3] = y[1::3] = lanes
+    return x, y
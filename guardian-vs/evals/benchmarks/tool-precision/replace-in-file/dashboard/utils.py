@@ -3,19 +3,25 @@ import sqlite3
 import pandas as pd
 import os
 
+def get_database_path():
+    # Same override the benchmark's DatabaseClient honours, so both sides agree on the file.
+    # Otherwise evals.db lives one level up from the dashboard directory:
+    # os.path.dirname(__file__) -> dashboard/
+    # os.path.join(..., '..', 'evals.db') -> replace-in-file/evals.db
+    return os.environ.get('DIFF_EVALS_DB_PATH') or os.path.join(os.path.dirname(__file__), '..', 'evals.db')
+
 @st.cache_resource
 def get_database_connection():
-    # Assuming the script is run from the dashboard directory,
-    # evals.db is two levels up from there.
-    # __file__ is utils.py, its dirname is dashboard.
-    # os.path.dirname(__file__) -> dashboard/
-    # os.path.join(..., '..') -> diff-edits/
-    # os.path.join(..., '..', 'evals.db') -> diff-edits/evals.db
-    db_path = os.path.join(os.path.dirname(__file__), '..', 'evals.db')
+    db_path = get_database_path()
     if not os.path.exists(db_path):
         st.error(f"Database not found. Expected at: {os.path.abspath(db_path)}")
         st.stop()
-    return sqlite3.connect(db_path, check_same_thread=False)
+    from migrations import migrate
+
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    # Older databases lack results.is_valid and its indexes; upgrading is a no-op once done
+    migrate(conn)
+    return conn
 
 def guess_language_from_filepath(filepath):
     """Guess the language for syntax highlighting from filepath."""
@@ -49,3 +55,39 @@ def guess_language_from_filepath(filepath):
     
     _, ext = os.path.splitext(str(filepath)) # Ensure filepath is string
     return extension_map.get(ext.lower(), None)
+
+# String columns whose values repeat across result rows. The file contents are included
+# because every attempt on a case carries its own copy of the same original file.
+CATEGORICAL_COLUMNS = [
+    'run_id', 'model_id', 'task_id', 'case_id', 'processing_functions_hash', 'error_string',
+    'system_prompt_name', 'processing_functions_name', 'original_filepath', 'edited_filepath',
+    'original_file_content', 'edited_file_content',
+]
+
+def compact_dtypes(df):
+    """Shrink a loaded DataFrame in place: repeated strings become categoricals and
+    integer columns are downcast to the smallest type that fits."""
+    for column in CATEGORICAL_COLUMNS:
+        # Only worth it when values actually repeat; all-unique categoricals are bigger than strings
+        if column in df.columns and df[column].dtype == object and df[column].nunique() <= len(df) // 2:
+            df[column] = df[column].astype('category')
+
+    for column in df.select_dtypes(include='integer').columns:
+        df[column] = pd.to_numeric(df[column], downcast='integer')
+
+    return df
+
+def extract_diff(parsed_tool_call_json):
+    """Return the diff argument of a result's stored replace_in_file call, or None"""
+    import json
+
+    if not parsed_tool_call_json:
+        return None
+    try:
+        tool_calls = json.loads(parsed_tool_call_json)
+    except ValueError:
+        return None
+    tool_call = tool_calls[0] if isinstance(tool_calls, list) and tool_calls else tool_calls
+    if not isinstance(tool_call, dict):
+        return None
+    return (tool_call.get('input') or {}).get('diff')
@@ -42,13 +42,14 @@ export class DatabaseClient {
     // Check if tables exist by trying to query one of them
     try {
       this.db.prepare('SELECT COUNT(*) FROM system_prompts LIMIT 1').get();
-      // If we get here, tables exist
-      return;
     } catch (error) {
       // Tables don't exist, create them
       console.log('Initializing database schema...');
       this.createTables();
+      return;
     }
+    // Tables exist; add any columns introduced since they were created
+    this.addMissingColumns();
   }
 
   private createTables(): void {
@@ -63,6 +64,22 @@ export class DatabaseClient {
     console.log('Database schema initialized successfully');
   }
 
+  // Columns added to schema.sql after databases were already in use
+  private static readonly ADDED_COLUMNS: { table: string; column: string; type: string }[] = [
+    { table: 'results', column: 'parse_time_ms', type: 'REAL' },
+    { table: 'results', column: 'apply_time_ms', type: 'REAL' },
+  ];
+
+  private addMissingColumns(): void {
+    for (const { table, column, type } of DatabaseClient.ADDED_COLUMNS) {
+      const columns = this.db.prepare(`PRAGMA table_info(${table})`).all() as { name: string }[];
+      if (!columns.some((existing) => existing.name === column)) {
+        this.db.exec(`ALTER TABLE ${table} ADD COLUMN ${column} ${type}`);
+        console.log(`Added column ${table}.${column}`);
+      }
+    }
+  }
+
   getDatabase(): Database.Database {
     return this.db;
   }
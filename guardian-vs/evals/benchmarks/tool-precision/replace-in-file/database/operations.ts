@@ -161,8 +161,8 @@ export async function insertResult(input: CreateResultInput): Promise<string> {
       succeeded, error_enum, num_edits, num_lines_deleted, num_lines_added,
       time_to_first_token_ms, time_to_first_edit_ms, time_round_trip_ms,
       cost_usd, completion_tokens, raw_model_output, file_edited_hash,
-      parsed_tool_call_json
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+      parsed_tool_call_json, parse_time_ms, apply_time_ms
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
   `);
   
   stmt.run(
@@ -183,7 +183,9 @@ export async function insertResult(input: CreateResultInput): Promise<string> {
     input.completion_tokens || null,
     input.raw_model_output || null,
     input.file_edited_hash || null,
-    input.parsed_tool_call_json || null
+    input.parsed_tool_call_json || null,
+    input.parse_time_ms ?? null,
+    input.apply_time_ms ?? null
   );
   
   return resultId;
@@ -222,8 +224,8 @@ export async function insertResultsBatch(inputs: CreateResultInput[]): Promise<s
       succeeded, error_enum, num_edits, num_lines_deleted, num_lines_added,
       time_to_first_token_ms, time_to_first_edit_ms, time_round_trip_ms,
       cost_usd, completion_tokens, raw_model_output, file_edited_hash,
-      parsed_tool_call_json
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+      parsed_tool_call_json, parse_time_ms, apply_time_ms
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
   `);
   
   return db.transaction(() => {
@@ -250,7 +252,9 @@ export async function insertResultsBatch(inputs: CreateResultInput[]): Promise<s
         input.completion_tokens || null,
         input.raw_model_output || null,
         input.file_edited_hash || null,
-        input.parsed_tool_call_json || null
+        input.parsed_tool_call_json || null,
+        input.parse_time_ms ?? null,
+        input.apply_time_ms ?? null
       );
       
       resultIds.push(resultId);
@@ -64,15 +64,91 @@ CREATE TABLE results (
     raw_model_output TEXT,
     file_edited_hash TEXT,
     parsed_tool_call_json TEXT,
+    parse_time_ms REAL,
+    apply_time_ms REAL,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    -- Excludes no_tool_calls, wrong_tool_call and wrong_file_edited (error_enum 1, 6, 7)
+    is_valid INTEGER GENERATED ALWAYS AS (error_enum IS NULL OR error_enum NOT IN (1, 6, 7)) VIRTUAL,
+    -- Uniform random key for stratified sampling; set by the results_sample_key trigger
+    sample_key REAL,
     FOREIGN KEY (run_id) REFERENCES runs(run_id),
     FOREIGN KEY (case_id) REFERENCES cases(case_id),
     FOREIGN KEY (processing_functions_hash) REFERENCES processing_functions(hash)
 );
 
-CREATE INDEX idx_results_run_model ON results(run_id, model_id);
-CREATE INDEX idx_results_case_model ON results(case_id, model_id);
+-- Written by dashboard/maintenance.py when runs are moved to an archive database
+CREATE TABLE archived_runs (
+    run_id TEXT PRIMARY KEY,
+    created_at DATETIME,
+    description TEXT,
+    system_prompt_hash TEXT,
+    num_cases INTEGER,
+    num_results INTEGER,
+    archive_path TEXT NOT NULL,
+    archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Written by dashboard/failure_clusters.py: MinHash signature of each failed result's text
+CREATE TABLE failure_signatures (
+    result_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (result_id, source),
+    FOREIGN KEY (result_id) REFERENCES results(result_id)
+);
+
+-- Written by dashboard/rollups.py: per-run totals per (task, model, processing functions, validity)
+-- and a bucketed histogram of valid round-trip times per (model, system prompt, processing functions)
+CREATE TABLE result_rollups (
+    run_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    model_id TEXT NOT NULL,
+    system_prompt_hash TEXT,
+    processing_functions_hash TEXT NOT NULL,
+    is_valid INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    successes INTEGER NOT NULL,
+    total_cost_usd REAL,
+    total_input_tokens INTEGER,
+    total_completion_tokens INTEGER,
+    total_round_trip_ms REAL,
+    PRIMARY KEY (run_id, task_id, model_id, processing_functions_hash, is_valid)
+);
+
+CREATE TABLE latency_rollups (
+    run_id TEXT NOT NULL,
+    model_id TEXT NOT NULL,
+    system_prompt_hash TEXT NOT NULL,
+    processing_functions_hash TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    PRIMARY KEY (run_id, model_id, system_prompt_hash, processing_functions_hash, bucket)
+);
+
+CREATE TABLE rollup_runs (
+    run_id TEXT PRIMARY KEY,
+    num_results INTEGER NOT NULL,
+    refreshed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_results_run_outcome ON results(run_id, model_id, error_enum, succeeded, time_round_trip_ms, cost_usd);
+CREATE INDEX idx_results_case_outcome ON results(case_id, model_id, error_enum, succeeded, time_round_trip_ms, cost_usd);
+CREATE INDEX idx_results_valid_run_model ON results(run_id, model_id) WHERE is_valid;
+CREATE INDEX idx_results_case_sample ON results(case_id, model_id, sample_key);
+CREATE INDEX idx_results_model_created ON results(model_id, created_at);
+CREATE INDEX idx_result_rollups_model ON result_rollups(model_id, run_id);
+CREATE INDEX idx_latency_rollups_model ON latency_rollups(model_id, run_id);
 CREATE INDEX idx_results_success ON results(succeeded);
 CREATE INDEX idx_cases_run ON cases(run_id);
 CREATE INDEX idx_results_created_at ON results(created_at);
 CREATE INDEX idx_runs_created_at ON runs(created_at);
+
+CREATE TRIGGER results_sample_key AFTER INSERT ON results
+WHEN NEW.sample_key IS NULL
+BEGIN
+    UPDATE results SET sample_key = (random() / 18446744073709551616.0 + 0.5) WHERE rowid = NEW.rowid;
+END;
+
+-- Latest migration in dashboard/migrations.py; older files are upgraded in place from there
+PRAGMA user_version = 3;
@@ -60,7 +60,11 @@ export interface Result {
   raw_model_output?: string;
   file_edited_hash?: string;
   parsed_tool_call_json?: string;
+  parse_time_ms?: number;
+  apply_time_ms?: number;
   created_at: string;
+  is_valid?: number; // generated column (dashboard/migrations.py): 0 for error_enum 1, 6, 7
+  sample_key?: number; // uniform in [0, 1), set by the results_sample_key trigger
 }
 
 // Input types for creating records
@@ -113,6 +117,8 @@ export interface CreateResultInput {
   raw_model_output?: string;
   file_edited_hash?: string;
   parsed_tool_call_json?: string;
+  parse_time_ms?: number;
+  apply_time_ms?: number;
 }
 
 // Analysis result types
@@ -0,0 +1,53 @@
+import * as readline from "readline"
+import { performance } from "perf_hooks"
+import { constructNewFileContent as constructNewFileContent_06_06_25 } from "./diff-apply/diff-06-06-25"
+import { constructNewFileContent as constructNewFileContent_06_23_25 } from "./diff-apply/diff-06-23-25"
+import { constructNewFileContent as constructNewFileContent_06_25_25 } from "./diff-apply/diff-06-25-25"
+import { constructNewFileContent as constructNewFileContent_06_26_25 } from "./diff-apply/diff-06-26-25"
+
+/**
+ * Long-lived diff-apply worker for dashboard/replay.py.
+ *
+ * Reads one JSON request per line on stdin: { id, diff, original }
+ * Writes one JSON response per line on stdout: { id, ok, apply_ms, error? }
+ *
+ * Usage: npx ts-node --transpile-only replay-worker.ts <diff-apply function>
+ */
+
+const diffEditingFunctions: Record<string, any> = {
+	"diff-06-06-25": constructNewFileContent_06_06_25,
+	"diff-06-23-25": constructNewFileContent_06_23_25,
+	"diff-06-25-25": constructNewFileContent_06_25_25,
+	"diff-06-26-25": constructNewFileContent_06_26_25,
+}
+
+const MAX_ERROR_LENGTH = 500
+
+async function main() {
+	const diffApplyFile = process.argv[2]
+	const constructNewFileContent = diffEditingFunctions[diffApplyFile]
+	if (!constructNewFileContent) {
+		console.error(`Could not find diff apply function for: ${diffApplyFile}`)
+		process.exit(2)
+	}
+
+	const lines = readline.createInterface({ input: process.stdin, crlfDelay: Infinity })
+	for await (const line of lines) {
+		if (!line.trim()) {
+			continue
+		}
+		const request = JSON.parse(line)
+		let response: { id: number; ok: boolean; apply_ms: number; error?: string }
+		const applyStart = performance.now()
+		try {
+			await constructNewFileContent(request.diff, request.original, true)
+			response = { id: request.id, ok: true, apply_ms: performance.now() - applyStart }
+		} catch (e) {
+			const applyMs = performance.now() - applyStart
+			response = { id: request.id, ok: false, apply_ms: applyMs, error: String(e instanceof Error ? e.message : e).slice(0, MAX_ERROR_LENGTH) }
+		}
+		process.stdout.write(JSON.stringify(response) + "\n")
+	}
+}
+
+main()
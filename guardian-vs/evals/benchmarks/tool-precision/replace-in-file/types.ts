@@ -84,6 +84,8 @@ export interface TestResult {
 	toolCalls?: ExtractedToolCall[]
 	diffEditSuccess?: boolean
 	replacementData?: any
+	parseTimeMs?: number
+	applyTimeMs?: number
 	error?: string
 	errorString?: string
 }